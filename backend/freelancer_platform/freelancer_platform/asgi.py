@@ -2,6 +2,8 @@
 ASGI config for freelancer_platform project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests are handled by Django, WebSocket connections by the real-time
+chat endpoint in ``freelancer_platform_app.realtime``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -13,4 +15,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "freelancer_platform.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up, it relies on the app registry
+from freelancer_platform_app.realtime import chat_socket  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        await chat_socket(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -30,6 +31,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "freelancer_platform_app.metrics.metrics_middleware",  # Query counts and timings
     "corsheaders.middleware.CorsMiddleware",  # CORS middleware
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -59,6 +61,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "freelancer_platform.wsgi.application"
+ASGI_APPLICATION = "freelancer_platform.asgi.application"
 
 # Database configuration from environment
 DATABASES = {
@@ -91,7 +94,117 @@ STATIC_URL = "/static/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 MEDIA_URL = "/media/"
 
+# Uploads (see freelancer_platform_app/uploads.py)
+FILE_UPLOAD_HANDLERS = ["freelancer_platform_app.uploads.HashingUploadHandler"]
+UPLOAD_MAX_SIZE = int(os.environ.get("UPLOAD_MAX_SIZE", str(20 * 1024 * 1024)))
+UPLOAD_RESUMABLE_MAX_SIZE = int(os.environ.get("UPLOAD_RESUMABLE_MAX_SIZE", str(1024 * 1024 * 1024)))
+# Chunks are read through request.body, keep below DATA_UPLOAD_MAX_MEMORY_SIZE
+UPLOAD_CHUNK_MAX_SIZE = int(os.environ.get("UPLOAD_CHUNK_MAX_SIZE", str(2 * 1024 * 1024)))
+UPLOAD_ALLOWED_CONTENT_TYPES = os.environ.get(
+    "UPLOAD_ALLOWED_CONTENT_TYPES",
+    "image/png,image/jpeg,image/gif,image/webp,application/pdf,application/zip,text/plain",
+).split(",")
+UPLOAD_SESSION_DIR = os.path.join(MEDIA_ROOT, ".partial")
+# Resumable uploads not finished this many seconds after they started are
+# rejected; run manage.py clear_upload_sessions periodically to delete them
+UPLOAD_SESSION_TTL = int(os.environ.get("UPLOAD_SESSION_TTL", str(24 * 60 * 60)))
+
+# Resized WebP variants of uploaded images served by /read-file?size=
+IMAGE_VARIANT_SIZES = [int(size) for size in os.environ.get("IMAGE_VARIANT_SIZES", "150,600").split(",")]
+IMAGE_VARIANT_QUALITY = int(os.environ.get("IMAGE_VARIANT_QUALITY", "80"))
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", "2"))
+
+# Let nginx send uploaded files (see devops/nginx), Python only sets headers
+FILE_SERVE_X_ACCEL = os.environ.get("FILE_SERVE_X_ACCEL", "False").lower() == "true"
+FILE_X_ACCEL_PREFIX = os.environ.get("FILE_X_ACCEL_PREFIX", "/protected-media/")
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Shared cache for rendered responses, per process unless REDIS_URL is set
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # CORS Configuration
 CORS_ALLOW_ALL_ORIGINS = os.environ.get("CORS_ALLOW_ALL_ORIGINS", "True").lower() == "true"
+CORS_EXPOSE_HEADERS = ["X-Next-Cursor", "X-Prev-Cursor"]
+
+# Job ids (see freelancer_platform_app/ids.py). Every machine creating jobs
+# needs its own JOB_ID_HOST (0-15); processes on it share JOB_ID_LOCK_DIR.
+JOB_ID_HOST = int(os.environ.get("JOB_ID_HOST", "0"))
+JOB_ID_LOCK_DIR = os.environ.get("JOB_ID_LOCK_DIR", os.path.join(tempfile.gettempdir(), "king-job-ids"))
+
+# POST /api/jobs/bulk: jobs accepted per request and rows per INSERT
+JOB_BULK_MAX_SIZE = int(os.environ.get("JOB_BULK_MAX_SIZE", "500"))
+JOB_BULK_BATCH_SIZE = int(os.environ.get("JOB_BULK_BATCH_SIZE", "100"))
+
+# Pagination
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", "20"))
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", "100"))
+
+# Render job lists from .values() rows instead of validating every model
+# instance with pydantic (see freelancer_platform_app/serializers.py)
+API_FAST_SERIALIZER = os.environ.get("API_FAST_SERIALIZER", "True").lower() == "true"
+
+# Authenticated users cached per process (see freelancer_platform_app/auth.py)
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", "60"))
+
+# Seconds a process serves its copy of /api/top-freelancers
+# (see freelancer_platform_app/leaderboard.py)
+LEADERBOARD_CACHE_TTL = int(os.environ.get("LEADERBOARD_CACHE_TTL", "30"))
+
+# PlatformSettings rows are read from a per-process snapshot (see
+# freelancer_platform_app/platform_settings.py). Saves reach other processes
+# through the notifier, or once their snapshot is older than the TTL.
+PLATFORM_SETTINGS_TTL = int(os.environ.get("PLATFORM_SETTINGS_TTL", "300"))
+PLATFORM_SETTINGS_NOTIFIER = os.environ.get(
+    "PLATFORM_SETTINGS_NOTIFIER", "freelancer_platform_app.platform_settings.LocalSettingsNotifier")
+
+# Seconds a rendered public resume is kept (see freelancer_platform_app/resume.py)
+RESUME_CACHE_TTL = int(os.environ.get("RESUME_CACHE_TTL", "300"))
+
+# Rendered public GET responses (see freelancer_platform_app/response_cache.py).
+# DjangoResponseCache shares them through CACHES between processes.
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "True").lower() == "true"
+RESPONSE_CACHE_BACKEND = os.environ.get(
+    "RESPONSE_CACHE_BACKEND", "freelancer_platform_app.response_cache.LocalResponseCache")
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "1000"))
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", "30"))
+
+# On-chain event ingestion (see freelancer_platform_app/chain.py): dotted path
+# of the EventSource used by manage.py ingest_chain_events, blocks per commit
+CHAIN_EVENT_SOURCE = os.environ.get("CHAIN_EVENT_SOURCE", "")
+CHAIN_CRAWL_WINDOW = int(os.environ.get("CHAIN_CRAWL_WINDOW", "1000"))
+
+# Per-route query counts and timings, served at /metrics for Prometheus
+# (see freelancer_platform_app/metrics.py). The scraper must send
+# METRICS_TOKEN as a bearer token; while it is unset /metrics is refused.
+# QUERY_BUDGET_STRICT turns requests over their endpoint's query budget into
+# errors, e.g. in tests.
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "True").lower() == "true"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+QUERY_BUDGET_STRICT = os.environ.get("QUERY_BUDGET_STRICT", "False").lower() == "true"
+
+# Seconds a wallet has to sign the nonce of GET /api/login/nonce
+LOGIN_NONCE_TTL = int(os.environ.get("LOGIN_NONCE_TTL", "300"))
+
+# Comma separated wallets allowed to resolve disputes, i.e. the contract owner
+# (see freelancer_platform_app/disputes.py). They must log in with a signature.
+DISPUTE_RESOLVERS = [
+    wallet.strip().lower() for wallet in os.environ.get("DISPUTE_RESOLVERS", "").split(",") if wallet.strip()
+]
+
+# Real-time chat fan-out backend (see freelancer_platform_app/realtime.py),
+# PostgresBroker on PostgreSQL and the single-process LocalBroker otherwise
+CHAT_BROKER = os.environ.get("CHAT_BROKER")
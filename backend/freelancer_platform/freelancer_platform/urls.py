@@ -19,9 +19,11 @@ from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from freelancer_platform_app.api import api
+from freelancer_platform_app.metrics import metrics_view
 from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api.urls),
+    path('metrics', metrics_view),
 ]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -35,6 +35,10 @@ class DisputeAdmin(admin.ModelAdmin):
     list_filter = ('resolved', 'resolved_in_favor_of_freelancer', 'created_at',)
     readonly_fields = ('created_at', 'updated_at',)
     ordering = ('-created_at',)
+    # Job.__str__ shows the client
+    list_select_related = ('job__client', 'initiator',)
+    # Skips counting every dispute on each filtered page
+    show_full_result_count = False
 
 
 @admin.register(PlatformSettings)
@@ -1,82 +1,98 @@
-import os
 import uuid
-from django.http import FileResponse
-from ninja import NinjaAPI
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
 from ninja.errors import HttpError
 from django.conf import settings
-from datetime import datetime, timedelta
-import jwt
-from .models import ChatMessage, WebThreeUser, Job, JobPick, JobType
+from .models import ChatMessage, WebThreeUser, Job, JobPick, JobType, UploadSession
 from .schemas import (
+    LoginNonceSchema,
     LoginResponseSchema,
     LoginSchema,
     UserInfoSchema,
     UserUpdateSchema,
     JobSchema,
+    FreelancerJobSchema,
     JobTypeSchema,
     CreateJobSchema,
+    BulkCreateJobSchema,
+    BulkCreateJobResponseSchema,
     TopFreelancerSchema,
-    UserInfoProfileSchema,
+    JobPickerSchema,
     ChatMessagePayloadSchema,
-    PublicUserResumeSchema
+    JobPickStatusSchema,
+    PublicUserResumeSchema,
+    UploadSessionCreateSchema,
+    UploadSessionSchema,
+    DisputeSchema,
+    ResolveDisputeSchema,
+    DisputeStatsSchema,
 )
 from typing import Optional
-from django.core.files.storage import default_storage
 from ninja import File
 from ninja.files import UploadedFile as NinjaUploadedFile
-from django.db.models import Count
+from django.core.files.storage import default_storage
 from ninja import Query
 from django.db.models import Q
-from django.db.models import Sum
-
-api = NinjaAPI()
-SECRET_KEY = settings.SECRET_KEY
-
-# Utility Functions
-
-
-def generate_jwt_token(user):
-    payload = {
-        'user_id': user.id,
-        'username': user.username,
-        'wallet_address': user.wallet_address,
-        'exp': datetime.utcnow() + timedelta(days=1),  # Token valid for 1 day
-    }
-    token = jwt.encode(payload, SECRET_KEY, algorithm='HS256')
-    return token
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from .auth import (
+    dispute_resolver_auth, generate_jwt_token, issue_login_nonce, jwt_auth, jwt_claims_auth,
+    login_message, verify_login_signature,
+)
+from .chat import ahas_chat_access, job_channel, serialize_message
+from .disputes import adispute_stats, dispute_queue, open_dispute, resolve_dispute
+from .files import serve_file
+from .ids import next_job_id
+from .images import check_variant_size, generate_variant, schedule_variants
+from .leaderboard import aget_top_freelancers
+from .metrics import InstrumentedNinjaAPI, query_budget
+from .pagination import apaginate_keyset, clamp_page_size
+from .picks import (
+    ALREADY_PICKED, ASSIGNED, freelancer_jobs, pick_job as record_pick, with_picks_count,
+)
+from .realtime import get_broker
+from .response_cache import cache_response, invalidate_model
+from .resume import aget_resume, aresume_version
+from .search import filter_jobs, rank_jobs
+from .serializers import alist_jobs, apaginate_jobs, freelancer_job_serializer
+from .uploads import (
+    append_chunk, check_session, content_hash, create_session, file_url, session_expires_at,
+    store_file,
+)
 
+api = InstrumentedNinjaAPI()
 
-def jwt_authentication(request):
-    auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
-        raise HttpError(401, "Authorization header missing or invalid")
+# Authentication Endpoints
 
-    token = auth_header.split(' ')[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        user = WebThreeUser.objects.get(id=payload['user_id'])
-        request.user = user
-        return user
-    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, WebThreeUser.DoesNotExist):
-        raise HttpError(401, "Invalid or expired token")
 
-# Authentication Endpoints
+@api.get("/login/nonce", tags=["Authentication"], response=LoginNonceSchema)
+async def login_nonce(request, wallet_address: str):
+    """
+    A message for the wallet to sign (personal_sign) and send back to
+    ``/login`` with the nonce, proving the login comes from its owner.
+    """
+    nonce = issue_login_nonce(wallet_address)
+    return {"nonce": nonce, "message": login_message(wallet_address, nonce)}
 
 
 @api.post("/login", tags=["Authentication"], response=LoginResponseSchema)
-def login(request, payload: LoginSchema):
+async def login(request, payload: LoginSchema):
+    wallet_verified = payload.signature is not None
+    if wallet_verified:
+        await sync_to_async(verify_login_signature)(
+            payload.wallet_address, payload.nonce or "", payload.signature)
     try:
-        user, created = WebThreeUser.objects.get_or_create(
+        user, created = await WebThreeUser.objects.aget_or_create(
             wallet_address=payload.wallet_address
         )
         if created:
             # Assign a default username if not provided
             user.username = f"User_{payload.wallet_address}"
             user.is_active = True
-            user.save()
+            await user.asave()
         if not user.is_active:
             raise HttpError(403, "User account is disabled")
-        token = generate_jwt_token(user)
+        token = generate_jwt_token(user, wallet_verified)
         return LoginResponseSchema(
             token=token, username=user.username, wallet_address=user.wallet_address, image=user.image, name=user.name
         )
@@ -86,9 +102,10 @@ def login(request, payload: LoginSchema):
 # User Management APIs
 
 
-@api.get("/user/info", tags=["User Info"], response=UserInfoSchema)
-def get_user_info(request):
-    user = jwt_authentication(request)
+@api.get("/user/info", tags=["User Info"], response=UserInfoSchema, auth=jwt_auth)
+@query_budget(1)
+async def get_user_info(request):
+    user = request.auth
     user_data = {
         "id": user.id,
         "username": user.username,
@@ -106,9 +123,9 @@ def get_user_info(request):
     return UserInfoSchema(**user_data)
 
 
-@api.put("/user/update", tags=["User Info"], response={200: str, 400: str})
-def update_user(request, payload: UserUpdateSchema):
-    user = jwt_authentication(request)
+@api.put("/user/update", tags=["User Info"], response={200: str, 400: str}, auth=jwt_auth)
+async def update_user(request, payload: UserUpdateSchema):
+    user = request.auth
     try:
         if payload.name is not None:
             user.name = payload.name
@@ -126,7 +143,7 @@ def update_user(request, payload: UserUpdateSchema):
             user.github = payload.github
         if payload.instagram is not None:
             user.instagram = payload.instagram
-        user.save()
+        await user.asave()
 
         return 200, "User information updated successfully."
     except Exception as e:
@@ -136,53 +153,105 @@ def update_user(request, payload: UserUpdateSchema):
 
 
 @api.post("/upload-file", tags=["File Management"])
-def upload_file(request, file: NinjaUploadedFile = File(...)):
-    DOMAIN_ROOT = "http://localhost:8000/api/read-file"
-    DOMAIN_ROOT = "/api/read-file"
+async def upload_file(request, file: NinjaUploadedFile = File(...)):
+    """
+    Stores an uploaded file. Content that was uploaded before is not stored
+    again, its existing name is returned instead.
+    """
     try:
-        # Generate a unique file name
-        file_extension = os.path.splitext(file.name)[1]
-        unique_file_name = f"{uuid.uuid4().hex}{file_extension}"
-
-        file_name = default_storage.save(unique_file_name, file)
-        file_url = f"{DOMAIN_ROOT}/{file_name}"
+        sha256 = await sync_to_async(content_hash)(file)
+        file_name = await sync_to_async(store_file)(
+            file, file.name, sha256, file.size, file.content_type)
+        schedule_variants(file_name, file.content_type)
 
-        return {"message": "File uploaded successfully", "file_name": file_name, "file_url": file_url}
+        return {"message": "File uploaded successfully", "file_name": file_name, "file_url": file_url(file_name)}
     except Exception as e:
         raise HttpError(400, f"Error uploading file: {str(e)}")
 
 
+@api.post("/uploads", tags=["File Management"], response=UploadSessionSchema, auth=jwt_auth)
+async def start_upload(request, payload: UploadSessionCreateSchema):
+    """
+    Starts a resumable upload. Send the content with ``PUT /uploads/{id}``
+    in chunks of at most ``chunk_size`` bytes, before ``expires_at``.
+    """
+    session = await sync_to_async(create_session)(
+        payload.file_name, payload.size, payload.content_type)
+    return upload_session_response(session)
+
+
+@api.get("/uploads/{upload_id}", tags=["File Management"], response=UploadSessionSchema)
+async def get_upload(request, upload_id: uuid.UUID):
+    """
+    Returns how many bytes were received, i.e. the offset to resume from.
+    """
+    session = await UploadSession.objects.filter(id=upload_id).afirst()
+    check_session(session)
+    return upload_session_response(session)
+
+
+@api.put("/uploads/{upload_id}", tags=["File Management"], response=UploadSessionSchema)
+async def upload_chunk(request, upload_id: uuid.UUID, offset: int = Query(...)):
+    """
+    Appends the raw request body at ``offset``. The response of the last
+    chunk carries the stored ``file_name`` and ``file_url``.
+    """
+    session, file_name = await sync_to_async(append_chunk)(
+        upload_id, offset, request.body)
+    if file_name:
+        schedule_variants(file_name, session.content_type)
+    return upload_session_response(session, file_name)
+
+
 @api.get("/read-file/{file_name}", tags=["File Management"])
-def read_file(request, file_name: str):
+async def read_file(request, file_name: str, size: Optional[int] = Query(None)):
     """
     Returns the actual file content by its name.
+    Supports conditional (ETag / Last-Modified) and Range requests.
+    With ``size`` an image is returned as a WebP resized to fit that many px.
     """
-    file_path = os.path.join(settings.MEDIA_ROOT, file_name)
-    if not default_storage.exists(file_path):
-        raise HttpError(404, "File not found")
-
     try:
-        file = default_storage.open(file_name, "rb")
-        return FileResponse(file, as_attachment=True, filename=file_name)
+        if size is not None:
+            check_variant_size(size)
+            if not await sync_to_async(default_storage.exists)(file_name):
+                raise HttpError(404, "File not found")
+            file_name = await sync_to_async(generate_variant)(file_name, size)
+        return await serve_file(request, file_name)
+    except HttpError:
+        raise
     except Exception as e:
         raise HttpError(500, f"Error reading file: {str(e)}")
 
 
+def upload_session_response(session, file_name=None):
+    return {
+        "id": session.id,
+        "size": session.size,
+        "received": session.received,
+        "chunk_size": settings.UPLOAD_CHUNK_MAX_SIZE,
+        "expires_at": session_expires_at(session),
+        "file_name": file_name,
+        "file_url": file_url(file_name) if file_name else None,
+    }
+
+
 @api.get("/job-types", tags=["Jobs"], response=list[JobTypeSchema])
-def list_job_types(request):
+@query_budget(1)
+@cache_response(settings.RESPONSE_CACHE_TTL, models=[JobType])
+async def list_job_types(request):
     job_types = JobType.objects.all().order_by('-created_at')
-    return job_types
+    return [job_type async for job_type in job_types]
 
 
-@api.post("/jobs", tags=["Jobs"], response=JobSchema)
-def create_job(request, payload: CreateJobSchema):
-    user = jwt_authentication(request)
+@api.post("/jobs", tags=["Jobs"], response=JobSchema, auth=jwt_auth)
+async def create_job(request, payload: CreateJobSchema):
+    user = request.auth
     try:
-        job_type = JobType.objects.get(id=payload.job_type)
+        job_type = await JobType.objects.aget(id=payload.job_type)
     except JobType.DoesNotExist:
         raise HttpError(400, "Invalid job type provided")
 
-    job = Job.objects.create(
+    job = await Job.objects.acreate(
         title=payload.title,
         info=payload.info,
         description=payload.description,
@@ -194,17 +263,56 @@ def create_job(request, payload: CreateJobSchema):
     return job
 
 
-@api.get("/jobs", tags=["Jobs"], response=list[JobSchema])
-def get_jobs(
-    request,
-    job_type_id: Optional[int] = Query(None),
-    min_amount: Optional[int] = Query(None),
-    max_amount: Optional[int] = Query(None),
-    search: Optional[str] = Query(None),
-    status: Optional[str] = Query(None)
-):
-    jobs = Job.objects.select_related('job_type', 'client', 'freelancer')\
-        .order_by("-created_at")
+@api.post("/jobs/bulk", tags=["Jobs"], response=BulkCreateJobResponseSchema, auth=jwt_auth)
+async def bulk_create_jobs(request, payload: BulkCreateJobSchema):
+    """
+    Creates up to ``settings.JOB_BULK_MAX_SIZE`` jobs at once. Items with an
+    unknown job type are reported in ``results`` and skipped, the others
+    are inserted together in one transaction.
+    """
+    if not payload.jobs:
+        raise HttpError(400, "No jobs provided")
+    if len(payload.jobs) > settings.JOB_BULK_MAX_SIZE:
+        raise HttpError(400, f"At most {settings.JOB_BULK_MAX_SIZE} jobs can be created at once")
+    results = await sync_to_async(create_jobs)(request.auth, payload.jobs)
+    created = sum(1 for result in results if result["job"] is not None)
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+
+def create_jobs(user, items):
+    job_types = JobType.objects.in_bulk({item.job_type for item in items})
+
+    results = []
+    jobs = []
+    for index, item in enumerate(items):
+        job_type = job_types.get(item.job_type)
+        if job_type is None:
+            results.append({"index": index, "job": None, "error": "Invalid job type provided"})
+            continue
+        job = Job(
+            # bulk_create skips Job.save, which would assign the id
+            id=next_job_id(),
+            title=item.title,
+            info=item.info,
+            description=item.description,
+            image=item.image or "https://placehold.co/150x150",
+            amount=item.amount,
+            client=user,
+            job_type=job_type,
+        )
+        jobs.append(job)
+        results.append({"index": index, "job": job, "error": None})
+
+    with transaction.atomic():
+        Job.objects.bulk_create(jobs, batch_size=settings.JOB_BULK_BATCH_SIZE)
+    if jobs:
+        # No post_save signals are sent for bulk inserts
+        invalidate_model(Job)
+    return results
+
+
+def jobs_query(job_type_id=None, min_amount=None, max_amount=None, search=None, status=None):
+    jobs = Job.objects.select_related('job_type', 'client', 'freelancer')
 
     # Apply filters only if they are provided
     filters = Q()
@@ -221,119 +329,192 @@ def get_jobs(
     if status:
         filters &= Q(status=status)
 
-    if search:
-        search_filters = Q(title__icontains=search) | Q(
-            description__icontains=search)
-        filters &= search_filters
-
     if filters:
         jobs = jobs.filter(filters)
 
+    if search:
+        jobs = filter_jobs(jobs, search)
     return jobs
 
 
-@api.get("/jobs/by-client", tags=["Jobs"], response=list[JobSchema])
-def jobs_by_client(request):
-    user = jwt_authentication(request)
-    jobs = Job.objects.filter(client=user).order_by('-created_at')
-    return jobs
+@api.get("/jobs", tags=["Jobs"], response=list[JobSchema])
+@query_budget(1)
+async def get_jobs(
+    request,
+    response: HttpResponse,
+    job_type_id: Optional[int] = Query(None),
+    min_amount: Optional[int] = Query(None),
+    max_amount: Optional[int] = Query(None),
+    search: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
+):
+    jobs = jobs_query(job_type_id, min_amount, max_amount, search, status)
+    return await apaginate_jobs(jobs, response, cursor, limit)
+
+
+def client_jobs_query(user_id):
+    return Job.objects.select_related('job_type', 'client', 'freelancer')\
+        .filter(client_id=user_id)
+
+
+@api.get("/jobs/by-client", tags=["Jobs"], response=list[JobSchema], auth=jwt_claims_auth)
+@query_budget(2)
+async def jobs_by_client(
+    request,
+    response: HttpResponse,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
+):
+    jobs = client_jobs_query(request.auth['user_id'])
+    return await apaginate_jobs(jobs, response, cursor, limit)
+
 
+def freelancer_jobs_query(user_id, cursor=None, limit=None):
+    return freelancer_jobs(user_id, cursor, limit)\
+        .select_related('job_type', 'client', 'freelancer')
 
-@api.get("/jobs/by-freelancer", tags=["Jobs"], response=list[JobSchema])
-def jobs_by_freelancer(request):
-    user = jwt_authentication(request)
+
+@api.get("/jobs/by-freelancer", tags=["Jobs"], response=list[FreelancerJobSchema], auth=jwt_claims_auth)
+@query_budget(2)
+async def jobs_by_freelancer(
+    request,
+    response: HttpResponse,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
+):
+    user_id = request.auth['user_id']
     try:
-        assigned_jobs = Job.objects.filter(
-            freelancer=user).order_by('-created_at')
-        picked_jobs = Job.objects.filter(
-            picks__freelancer=user).order_by('-created_at')
-        jobs = assigned_jobs.union(picked_jobs).order_by('-created_at')
-        return jobs
+        jobs = freelancer_jobs_query(user_id, cursor, limit)
+        return await apaginate_jobs(
+            jobs, response, cursor, limit, serializer=freelancer_job_serializer)
+    except HttpError:
+        raise
     except Exception as e:
         raise HttpError(500, f"Error fetching jobs: {str(e)}")
 
 
+def newest_jobs_query():
+    return with_picks_count(Job.objects.select_related('job_type', 'client', 'freelancer'))\
+        .exclude(status="NEW").order_by('-created_at')[:6]
+
+
 @api.get("/jobs/newest", tags=["Jobs"], response=list[JobSchema])
-def newest_jobs(request):
-    jobs = Job.objects.exclude(status="NEW").order_by('-created_at')[:6]
-    return list(jobs)
+@query_budget(1)
+@cache_response(settings.RESPONSE_CACHE_TTL, models=[Job, JobType, WebThreeUser, JobPick])
+async def newest_jobs(request):
+    return await alist_jobs(newest_jobs_query())
+
+
+@api.get("/jobs/search", tags=["Jobs"], response=list[JobSchema])
+@query_budget(1)
+async def search_jobs(
+    request,
+    q: str = Query(...),
+    limit: Optional[int] = Query(None),
+):
+    """
+    Ranked full-text search over job title, info and description.
+    The last word is matched as a prefix so it can back a typeahead.
+    """
+    jobs = with_picks_count(Job.objects.select_related('job_type', 'client', 'freelancer'))
+    return await sync_to_async(rank_jobs)(jobs, q, clamp_page_size(limit))
 
 
 @api.get("/top-freelancers", tags=["Jobs"], response=list[TopFreelancerSchema])
-def top_freelancers(request):
-    freelancers = (
-        WebThreeUser.objects.filter(freelancer_jobs__status="COMPLETED")
-        .annotate(completed_jobs_count=Count('freelancer_jobs'))
-        .order_by('-completed_jobs_count')[:6]
-    )
+@query_budget(1)
+@cache_response(settings.RESPONSE_CACHE_TTL, models=[Job, WebThreeUser])
+async def top_freelancers(request):
+    return await aget_top_freelancers()
+
+
+@api.get("/jobs/pick-status", tags=["Jobs"], response=list[JobPickStatusSchema], auth=jwt_claims_auth)
+@query_budget(2)
+async def pick_status(request, job_ids: list[int] = Query(...)):
+    """
+    Whether the current user picked each of ``job_ids`` (repeat the
+    parameter, at most ``API_MAX_PAGE_SIZE`` of them), in the order given.
+    """
+    if len(job_ids) > settings.API_MAX_PAGE_SIZE:
+        raise HttpError(400, f"At most {settings.API_MAX_PAGE_SIZE} job ids are allowed")
+    picked = {
+        job_id async for job_id in JobPick.objects.filter(
+            freelancer_id=request.auth['user_id'], job_id__in=job_ids).values_list('job_id', flat=True)
+    }
+    return [{"job_id": job_id, "picked": job_id in picked} for job_id in job_ids]
+
 
-    result = []
-    for f in freelancers:
-        result.append({
-            "id": f.id,
-            "username": f.username,
-            "name": f.name,
-            "image": f.image,
-            "wallet_address": f.wallet_address,
-            "completed_jobs_count": f.completed_jobs_count
-        })
-    return result
-
-
-@api.get("/jobs/{job_id}/chat", tags=["Chat"], response=list[dict])
-def fetch_chat_messages(
+@api.get("/jobs/{job_id}/chat", tags=["Chat"], response=list[dict], auth=jwt_claims_auth)
+@query_budget(5)
+async def fetch_chat_messages(
     request,
     job_id: int,
     user_A: Optional[str] = Query(None),
     user_B: Optional[str] = Query(None),
+    since_id: Optional[int] = Query(None),
+    before_id: Optional[int] = Query(None),
+    limit: Optional[int] = Query(None),
 ):
-    user = jwt_authentication(request)
+    """
+    Returns up to ``limit`` messages in chronological order: the newest ones
+    by default, the ones following ``since_id`` for polling, or the ones
+    preceding ``before_id`` to load older history.
+    """
+    if since_id is not None and before_id is not None:
+        raise HttpError(400, "Pass either since_id or before_id, not both")
+    user_id = request.auth['user_id']
     try:
-        job = Job.objects.get(id=job_id)
-        if job.client != user and not job.picks.filter(freelancer=user).exists():
+        job = await Job.objects.aget(id=job_id)
+        if not await ahas_chat_access(job, user_id):
             raise HttpError(403, "You do not have access to this chat")
 
-        messages = ChatMessage.objects.filter(job=job).order_by("timestamp")
+        messages = ChatMessage.objects.filter(job=job)\
+            .select_related('sender', 'receiver')
 
         if user_A and user_B:
+            user_ids = dict([pair async for pair in WebThreeUser.objects.filter(
+                wallet_address__in=[user_A, user_B]).values_list('wallet_address', 'id')])
+            if user_A not in user_ids or user_B not in user_ids:
+                return []
             messages = messages.filter(
-                Q(sender__wallet_address=user_A, receiver__wallet_address=user_B) |
-                Q(sender__wallet_address=user_B, receiver__wallet_address=user_A)
+                Q(sender_id=user_ids[user_A], receiver_id=user_ids[user_B]) |
+                Q(sender_id=user_ids[user_B], receiver_id=user_ids[user_A])
             )
 
-        return [
-            {
-                "id": message.id,
-                "sender_address": message.sender.wallet_address,
-                "sender_name": message.sender.name,
-                "receiver_address": message.receiver.wallet_address,
-                "receiver_name": message.receiver.name,
-                "content": message.content,
-                "timestamp": message.timestamp.isoformat(),
-            }
-            for message in messages
-        ]
+        limit = clamp_page_size(limit)
+        if since_id is not None:
+            messages = messages.filter(id__gt=since_id).order_by("id")[:limit]
+            messages = [message async for message in messages]
+        else:
+            if before_id is not None:
+                messages = messages.filter(id__lt=before_id)
+            messages = messages.order_by("-id")[:limit]
+            messages = [message async for message in messages][::-1]
+
+        return [serialize_message(message) for message in messages]
     except Job.DoesNotExist:
         raise HttpError(404, "Job not found")
     except Exception as e:
         raise HttpError(500, f"Error fetching chat messages: {str(e)}")
 
 
-@api.post("/jobs/{job_id}/chat", tags=["Chat"], response={200: str, 403: str, 404: str})
-def send_chat_message(request, job_id: int, payload: ChatMessagePayloadSchema):
-    user = jwt_authentication(request)
+@api.post("/jobs/{job_id}/chat", tags=["Chat"], response={200: str, 403: str, 404: str}, auth=jwt_auth)
+async def send_chat_message(request, job_id: int, payload: ChatMessagePayloadSchema):
+    user = request.auth
     try:
         content = payload.content
         receiver_address = payload.receiver_address
 
-        receiver_user = WebThreeUser.objects.get(
+        receiver_user = await WebThreeUser.objects.aget(
             wallet_address=receiver_address)
-        job = Job.objects.get(id=job_id)
-        if job.client != user and not job.picks.filter(freelancer=user).exists():
+        job = await Job.objects.aget(id=job_id)
+        if not await ahas_chat_access(job, user.id):
             raise HttpError(403, "You do not have access to this chat")
 
-        ChatMessage.objects.create(
+        message = await ChatMessage.objects.acreate(
             sender=user, receiver=receiver_user, job=job, content=content)
+        await sync_to_async(get_broker().publish)(job_channel(job.id), serialize_message(message))
         return 200, "Message sent successfully"
     except WebThreeUser.DoesNotExist:
         raise HttpError(404, "Receiver not found")
@@ -344,107 +525,174 @@ def send_chat_message(request, job_id: int, payload: ChatMessagePayloadSchema):
 
 
 @api.get("/jobs/{job_id}", tags=["Jobs"], response=JobSchema)
-def get_job_by_id(request, job_id: int):
+@query_budget(1)
+@cache_response(settings.RESPONSE_CACHE_TTL, models=[Job, JobType, WebThreeUser, JobPick])
+async def get_job_by_id(request, job_id: int):
     try:
-        job = Job.objects.get(id=job_id)
+        job = await with_picks_count(Job.objects.select_related('job_type', 'client', 'freelancer'))\
+            .aget(id=job_id)
         return job
     except Job.DoesNotExist:
         raise HttpError(404, "Job not found")
 
 
-@api.get("/jobs/{job_id}/picks", tags=["Jobs"], response=list[UserInfoProfileSchema])
-def get_freelancers_by_job_id(request, job_id: int):
-    user = jwt_authentication(request)
+@api.get("/jobs/{job_id}/picks", tags=["Jobs"], response=list[JobPickerSchema], auth=jwt_claims_auth)
+@query_budget(3)
+async def get_freelancers_by_job_id(
+    request,
+    job_id: int,
+    response: HttpResponse,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
+):
+    """
+    Freelancers who picked the job, latest first, paginated like ``/jobs``.
+    """
+    user_id = request.auth['user_id']
 
     try:
-        job = Job.objects.get(id=job_id, client=user)
-        picks = job.picks.all()
+        if not await Job.objects.filter(id=job_id, client_id=user_id).aexists():
+            raise Job.DoesNotExist
+        picks = JobPick.objects.filter(job_id=job_id).values(
+            'id', 'picked_at', 'freelancer__id', 'freelancer__username', 'freelancer__wallet_address',
+            'freelancer__name', 'freelancer__bio', 'freelancer__image')
+        picks = await apaginate_keyset(picks, response, cursor, limit, field='picked_at')
 
-        freelancers = [
+        return [
             {
-                "id": pick.freelancer.id,
-                "username": pick.freelancer.username,
-                "wallet_address": pick.freelancer.wallet_address,
-                "name": pick.freelancer.name,
-                "bio": pick.freelancer.bio,
-                "image": pick.freelancer.image,
+                "id": pick["freelancer__id"],
+                "username": pick["freelancer__username"],
+                "wallet_address": pick["freelancer__wallet_address"],
+                "name": pick["freelancer__name"],
+                "bio": pick["freelancer__bio"],
+                "image": pick["freelancer__image"],
+                "picked_at": pick["picked_at"],
             }
             for pick in picks
         ]
-        return freelancers
 
     except Job.DoesNotExist:
         raise HttpError(
             404, "Job not found or you do not have access to this job")
+    except HttpError:
+        raise
     except Exception as e:
         raise HttpError(500, f"Error fetching freelancers: {str(e)}")
 
 
-@api.post("/jobs/{job_id}/pick", tags=["Jobs"], response={200: str, 400: str, 404: str})
-def pick_job(request, job_id: int):
-    user = jwt_authentication(request)
+@api.post("/jobs/{job_id}/pick", tags=["Jobs"], response={200: str, 400: str, 404: str, 409: str}, auth=jwt_auth)
+@query_budget(3)
+async def pick_job(request, job_id: int):
+    user = request.auth
     try:
-        job = Job.objects.get(id=job_id)
-        if job.freelancer == user:
-            raise HttpError(400, "You are already assigned to this job")
-        existing_pick = JobPick.objects.filter(
-            job=job, freelancer=user).first()
-        if existing_pick:
-            raise HttpError(400, "You have already picked this job")
-        JobPick.objects.create(job=job, freelancer=user)
-        return 200, f"You have successfully picked the job: {job.title}"
+        title, outcome = await sync_to_async(record_pick)(job_id, user.id)
     except Job.DoesNotExist:
         raise HttpError(404, "Job not found")
     except Exception as e:
         raise HttpError(500, f"Error picking job: {str(e)}")
+    if outcome == ASSIGNED:
+        raise HttpError(400, "You are already assigned to this job")
+    if outcome == ALREADY_PICKED:
+        raise HttpError(409, "You have already picked this job")
+    return 200, f"You have successfully picked the job: {title}"
 
 
-@api.get("/users/{user_wallet}/resume", tags=["Public Resume"], response=PublicUserResumeSchema)
-def get_public_user_resume(request, user_wallet: str):
+# Dispute Endpoints
+
+
+@api.post("/jobs/{job_id}/dispute", tags=["Disputes"], response=DisputeSchema, auth=jwt_claims_auth)
+@query_budget(4)
+async def open_job_dispute(request, job_id: int):
+    """
+    Opens a dispute on an accepted (or pushed) job, for its client or
+    freelancer. The job moves to DISPUTED.
+    """
     try:
-        user = WebThreeUser.objects.get(wallet_address=user_wallet)
+        return await sync_to_async(open_dispute)(job_id, request.auth['user_id'])
+    except HttpError:
+        raise
+    except Exception as e:
+        raise HttpError(500, f"Error opening dispute: {str(e)}")
 
-        completed_projects = Job.objects.filter(
-            freelancer=user,
-            status="COMPLETED"
-        ).order_by('-created_at')
 
-        total_income = completed_projects.aggregate(
-            total=Sum('amount'))['total'] or 0.0
+@api.get("/disputes", tags=["Disputes"], response=list[DisputeSchema], auth=dispute_resolver_auth)
+@query_budget(2)
+async def list_disputes(
+    request,
+    response: HttpResponse,
+    resolved: bool = False,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
+):
+    """
+    The resolver queue: open disputes oldest first (resolved ones with
+    ``resolved=true``), paginated like ``/jobs``.
+    """
+    try:
+        return await apaginate_keyset(
+            dispute_queue(resolved), response, cursor, limit, oldest_first=True)
+    except HttpError:
+        raise
+    except Exception as e:
+        raise HttpError(500, f"Error fetching disputes: {str(e)}")
 
-        completed_projects_data = [
-            {
-                "id": project.id,
-                "title": project.title,
-                "amount": float(project.amount),
-                "description": project.description,
-                "completed_at": project.updated_at.isoformat(),
-            }
-            for project in completed_projects
-        ]
 
-        social_links = {
-            "facebook": user.facebook,
-            "twitter": user.twitter,
-            "linkedin": user.linkedin,
-            "github": user.github,
-            "instagram": user.instagram,
-        }
-
-        return PublicUserResumeSchema(
-            id=user.id,
-            username=user.username,
-            name=user.name,
-            email=user.email,
-            bio=user.bio,
-            image=user.image,
-            wallet_address=user.wallet_address,
-            date_joined=user.date_joined.isoformat(),
-            social_links=social_links,
-            completed_projects=completed_projects_data,
-            total_income=total_income
-        )
+@api.get("/disputes/stats", tags=["Disputes"], response=DisputeStatsSchema, auth=dispute_resolver_auth)
+@query_budget(2)
+async def get_dispute_stats(request):
+    return await adispute_stats()
+
+
+@api.post("/disputes/{dispute_id}/resolve", tags=["Disputes"], response=DisputeSchema,
+          auth=dispute_resolver_auth)
+@query_budget(4)
+async def resolve_job_dispute(request, dispute_id: int, payload: ResolveDisputeSchema):
+    """
+    Records the decision taken on chain by ``resolveDispute``. The job
+    moves to RESOLVED.
+    """
+    try:
+        return await sync_to_async(resolve_dispute)(dispute_id, payload.in_favor_of_freelancer)
+    except HttpError:
+        raise
+    except Exception as e:
+        raise HttpError(500, f"Error resolving dispute: {str(e)}")
+
+
+@api.get("/users/{user_wallet}/resume", tags=["Public Resume"], response=PublicUserResumeSchema)
+@query_budget(2)
+async def get_public_user_resume(
+    request,
+    response: HttpResponse,
+    user_wallet: str,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
+):
+    """
+    ``completed_projects`` is paginated like ``/jobs``, newest first, with
+    the neighbouring pages in the ``X-Next-Cursor`` / ``X-Prev-Cursor``
+    headers. Answers ``If-None-Match`` with 304 while nothing changed.
+    """
+    try:
+        user = await WebThreeUser.objects.select_related("stats").aget(wallet_address=user_wallet)
+        limit = clamp_page_size(limit)
+        version = await aresume_version(user, cursor, limit)
+        etag = f'"{version}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            not_modified = HttpResponseNotModified()
+            not_modified["ETag"] = etag
+            return not_modified
+
+        body, headers = await aget_resume(user, version, cursor, limit)
+        for key, value in headers.items():
+            response[key] = value
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return body
     except WebThreeUser.DoesNotExist:
         raise HttpError(404, "User not found")
+    except HttpError:
+        raise
     except Exception as e:
         raise HttpError(500, f"Error fetching user resume: {str(e)}")
+
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class FreelancerPlatformAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "freelancer_platform_app"
+
+    def ready(self):
+        # Connects the signal receivers that invalidate cached users, the
+        # cached leaderboard, rendered resumes and the settings snapshot
+        from . import auth, leaderboard, resume  # noqa: F401
+        from .metrics import install_query_recorders
+        from .platform_settings import get_notifier
+        install_query_recorders()
+        # Subscribes this process to settings changes made by the others
+        get_notifier()
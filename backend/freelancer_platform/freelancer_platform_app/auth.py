@@ -0,0 +1,216 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import jwt
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils.crypto import get_random_string
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from eth_utils.exceptions import ValidationError as SignatureValidationError
+from ninja.errors import HttpError
+from ninja.security import HttpBearer
+
+from .models import WebThreeUser
+
+SECRET_KEY = settings.SECRET_KEY
+
+
+def generate_jwt_token(user, wallet_verified=False):
+    payload = {
+        'user_id': user.id,
+        'username': user.username,
+        'wallet_address': user.wallet_address,
+        # Whether the login proved control of the wallet, see verify_login_signature
+        'wallet_verified': wallet_verified,
+        'exp': datetime.utcnow() + timedelta(days=1),  # Token valid for 1 day
+    }
+    token = jwt.encode(payload, SECRET_KEY, algorithm='HS256')
+    return token
+
+
+def decode_jwt_token(token):
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
+        raise HttpError(401, "Invalid or expired token")
+
+
+LOGIN_NONCE_SALT = "freelancer_platform_app.login_nonce"
+
+
+def login_message(wallet_address, nonce):
+    return f"Sign in to King Job\n\nWallet: {wallet_address}\nNonce: {nonce}"
+
+
+def issue_login_nonce(wallet_address):
+    """
+    A nonce for ``wallet_address`` to sign (as ``login_message``), valid
+    for ``settings.LOGIN_NONCE_TTL`` seconds. Signed, so nothing is stored
+    until it is used.
+    """
+    return signing.dumps(
+        [wallet_address.lower(), get_random_string(16)], salt=LOGIN_NONCE_SALT)
+
+
+def verify_login_signature(wallet_address, nonce, signature):
+    """
+    Checks that ``signature`` is the wallet's personal_sign of the login
+    message of a nonce issued to it, and uses the nonce up.
+    """
+    try:
+        nonce_wallet, _ = signing.loads(
+            nonce, salt=LOGIN_NONCE_SALT, max_age=settings.LOGIN_NONCE_TTL)
+        signer = Account.recover_message(
+            encode_defunct(text=login_message(wallet_address, nonce)), signature=signature)
+    except (signing.BadSignature, SignatureValidationError, ValueError, TypeError):
+        raise HttpError(401, "Invalid wallet signature")
+    if not nonce_wallet == signer.lower() == wallet_address.lower():
+        raise HttpError(401, "Invalid wallet signature")
+    # A signature overheard in transit cannot be replayed
+    if not cache.add(f"login-nonce:{nonce}", True, settings.LOGIN_NONCE_TTL):
+        raise HttpError(401, "Nonce already used")
+
+
+class UserCache:
+    """
+    Per-process LRU cache of ``WebThreeUser`` rows with a TTL.
+
+    Entries are dropped when the user is saved or deleted in this process;
+    the TTL bounds how long other processes may serve a stale copy.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                # Views may modify and save the user, so never hand out the
+                # shared instance
+                return copy.copy(entry[1])
+            self.misses += 1
+            return None
+
+    def _store(self, user_id, user):
+        if user is None:
+            return None
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return copy.copy(user)
+
+    def get(self, user_id):
+        user = self._lookup(user_id)
+        if user is None:
+            user = self._store(
+                user_id, WebThreeUser.objects.filter(id=user_id).first())
+        return user
+
+    async def aget(self, user_id):
+        user = self._lookup(user_id)
+        if user is None:
+            user = self._store(
+                user_id, await WebThreeUser.objects.filter(id=user_id).afirst())
+        return user
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+user_cache = UserCache(
+    maxsize=settings.AUTH_USER_CACHE_SIZE,
+    ttl=settings.AUTH_USER_CACHE_TTL,
+)
+
+
+@receiver(post_save, sender=WebThreeUser)
+@receiver(post_delete, sender=WebThreeUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.id)
+
+
+class JWTAuth(HttpBearer):
+    """
+    Resolves the bearer token to an active ``WebThreeUser``, available as
+    ``request.auth``. Users are served from ``user_cache``.
+    """
+
+    async def authenticate(self, request, token):
+        payload = decode_jwt_token(token)
+        user = await user_cache.aget(payload['user_id'])
+        if user is None or not user.is_active:
+            raise HttpError(401, "Invalid or expired token")
+        request.user = user
+        return user
+
+
+class JWTClaimsAuth(HttpBearer):
+    """
+    Validates the bearer token and checks through ``user_cache`` that its user
+    is still active, so usually without touching the database.
+    ``request.auth`` is the token payload, so only its claims (``user_id``,
+    ``wallet_address``) are available to the view.
+    """
+
+    async def authenticate(self, request, token):
+        claims = decode_jwt_token(token)
+        user = await user_cache.aget(claims['user_id'])
+        if user is None or not user.is_active:
+            raise HttpError(401, "Invalid or expired token")
+        return claims
+
+
+class DisputeResolverAuth(JWTClaimsAuth):
+    """
+    ``JWTClaimsAuth`` for the wallets in ``settings.DISPUTE_RESOLVERS``, the
+    ones allowed to resolve disputes (the contract owner). The token must
+    come from a login signed by the wallet: anyone can log in with a bare
+    wallet address.
+    """
+
+    async def authenticate(self, request, token):
+        claims = await super().authenticate(request, token)
+        if claims.get('wallet_address', '').lower() not in settings.DISPUTE_RESOLVERS:
+            raise HttpError(403, "Not allowed to resolve disputes")
+        if not claims.get('wallet_verified'):
+            raise HttpError(403, "Log in with a wallet signature to resolve disputes")
+        return claims
+
+
+jwt_auth = JWTAuth()
+jwt_claims_auth = JWTClaimsAuth()
+dispute_resolver_auth = DisputeResolverAuth()
@@ -0,0 +1,422 @@
+import bisect
+import json
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from psycopg2.extras import execute_values
+
+from .leaderboard import lock_freelancer_stats
+from .models import Job, LastIndexCrawl, ProcessedEvent, WebThreeUser
+from .response_cache import invalidate_model
+
+JOB_CREATED = "JobCreated"
+JOB_ACCEPTED = "JobAccepted"
+JOB_COMPLETED = "JobCompleted"
+
+# Contract event -> (argument holding the wallet, status it moves the job to,
+# Job field recording the transaction)
+EVENT_EFFECTS = {
+    JOB_CREATED: ("client", "PUSHED", "transaction_create"),
+    JOB_ACCEPTED: ("freelancer", "ACCEPTED", "transaction_accept_job"),
+    JOB_COMPLETED: ("freelancer", "COMPLETED", "transaction_complete_job"),
+}
+
+UPDATED_FIELDS = [
+    "transaction_create", "transaction_accept_job", "transaction_complete_job",
+    "freelancer", "status", "updated_at",
+]
+
+UPDATE_JOBS_SQL = """
+UPDATE freelancer_platform_app_job AS job SET
+    transaction_create = v.transaction_create,
+    transaction_accept_job = v.transaction_accept_job,
+    transaction_complete_job = v.transaction_complete_job,
+    freelancer_id = v.freelancer_id::bigint,
+    status = v.status,
+    updated_at = v.updated_at::timestamptz
+FROM (VALUES %s) AS v (id, transaction_create, transaction_accept_job,
+                       transaction_complete_job, freelancer_id, status, updated_at)
+WHERE job.id = v.id
+"""
+
+
+# Log indexes are below 2**20 in any realistic block
+LOG_INDEX_BITS = 20
+
+
+def parse_event(raw, log_index=0):
+    """
+    Normalizes a decoded log as produced by the chain worker's
+    ``decodeLogs`` (which carries the block number in ``timestamp``), or
+    with explicit ``blockNumber`` / ``logIndex`` keys. ``log_index`` is used
+    when the log has none.
+    """
+    block = int(raw.get("blockNumber", raw.get("timestamp")))
+    log_index = int(raw.get("logIndex", log_index))
+    return {
+        "name": raw["eventName"],
+        "block": block,
+        "log_index": log_index,
+        "position": block << LOG_INDEX_BITS | log_index,
+        "transaction_hash": raw["transactionHash"],
+        "args": raw.get("args", {}),
+    }
+
+
+class CrawlPositionMoved(Exception):
+    """
+    The stored crawl position changed under a running ``ingest``, e.g.
+    because of a rollback or another ingest of the same key.
+    """
+
+
+def event_order(event):
+    return event["position"]
+
+
+def event_key(event):
+    return event["block"], event["transaction_hash"], event["log_index"]
+
+
+class EventSource:
+    """
+    Where decoded contract events come from. Subclass this to read them
+    from a node or an indexer.
+    """
+
+    def current_block(self):
+        raise NotImplementedError
+
+    def events(self, from_block, to_block):
+        """
+        Events of blocks ``from_block`` to ``to_block`` (inclusive), in chain
+        order.
+        """
+        raise NotImplementedError
+
+
+class StaticEventSource(EventSource):
+    """
+    A fixed list of events, e.g. for local runs.
+    """
+
+    def __init__(self, events):
+        # Logs without a ``logIndex`` are numbered in the order given, which
+        # keeps replays of the same file stable
+        counters = {}
+        parsed = []
+        for raw in events:
+            block = raw.get("blockNumber", raw.get("timestamp"))
+            index = counters[block] = counters.get(block, -1) + 1
+            parsed.append(parse_event(raw, index))
+        self._events = sorted(parsed, key=event_order)
+        self._blocks = [e["block"] for e in self._events]
+
+    def current_block(self):
+        return self._blocks[-1] if self._blocks else 0
+
+    def events(self, from_block, to_block):
+        start = bisect.bisect_left(self._blocks, from_block)
+        end = bisect.bisect_right(self._blocks, to_block)
+        return self._events[start:end]
+
+
+class JsonlEventSource(StaticEventSource):
+    """
+    Events read from a file with one decoded log per line.
+    """
+
+    def __init__(self, path):
+        with open(path) as f:
+            super().__init__(json.loads(line) for line in f if line.strip())
+
+
+def apply_events(events, key):
+    """
+    Applies job status transitions for ``events`` and records them as
+    ``ProcessedEvent`` rows, with one query each for the wallets, the jobs,
+    the events already recorded and the latest event per job, one update
+    and one insert. Returns the number of jobs updated.
+
+    Events applied before are skipped, so replaying a range is harmless.
+    Windows may be applied out of chain order: each event still sets its own
+    transaction field, but only moves the status when it is the latest event
+    applied to the job. Events for unknown jobs or wallets are recorded as
+    not applied and applied when seen again, see ``retry_events``.
+    """
+    events = sorted((e for e in events if e["name"] in EVENT_EFFECTS), key=event_order)
+    if not events:
+        return 0
+    wallets = {e["args"].get(EVENT_EFFECTS[e["name"]][0]) for e in events}
+    users = {
+        user.wallet_address: user
+        for user in WebThreeUser.objects.filter(wallet_address__in=wallets)
+    }
+    # Lock the jobs first, so a concurrent replay of these events sees them
+    # as processed once it gets its turn
+    job_ids = {int(e["args"]["jobId"]) for e in events}
+    jobs = {
+        job.id: job
+        for job in Job.objects.select_for_update().filter(id__in=job_ids).order_by("id")
+    }
+    pending = {}
+    processed = set()
+    for record in ProcessedEvent.objects.filter(block__in={e["block"] for e in events}):
+        record_key = record.block, record.transaction_hash, record.log_index
+        if record.applied:
+            processed.add(record_key)
+        else:
+            pending[record_key] = record
+    events = [e for e in events if event_key(e) not in processed]
+    latest = dict(
+        ProcessedEvent.objects.filter(job_id__in=jobs, applied=True)
+        .values("job_id").annotate(position=Max("position"))
+        .values_list("job_id", "position"))
+
+    freelancer_ids = {job.freelancer_id for job in jobs.values()}
+    freelancer_ids.update(user.id for user in users.values())
+    lock_freelancer_stats(freelancer_ids)
+
+    now = timezone.now()
+    changed = {}
+    records = []
+    retried = []
+    for event in events:
+        wallet_arg, status, transaction_field = EVENT_EFFECTS[event["name"]]
+        user = users.get(event["args"].get(wallet_arg))
+        job = jobs.get(int(event["args"]["jobId"]))
+        record = pending.get(event_key(event))
+        if record is None:
+            record = ProcessedEvent(
+                key=key, block=event["block"], transaction_hash=event["transaction_hash"],
+                log_index=event["log_index"], position=event["position"],
+                event_name=event["name"], job=job, args=event["args"])
+            records.append(record)
+        if user is None or job is None:
+            continue
+        if record.pk is not None:
+            record.job = job
+            retried.append(record)
+
+        previous = {transaction_field: getattr(job, transaction_field)}
+        setattr(job, transaction_field, event["transaction_hash"])
+        if event["name"] == JOB_ACCEPTED:
+            previous["freelancer_id"] = job.freelancer_id
+            job.freelancer = user
+        if event["position"] > latest.get(job.id, -1):
+            previous["status"] = job.status
+            job.status = status
+            latest[job.id] = event["position"]
+        job.updated_at = now
+        record.applied = True
+        record.previous = previous
+        changed[job.id] = job
+
+    update_jobs(list(changed.values()))
+    ProcessedEvent.objects.bulk_create(records)
+    if retried:
+        ProcessedEvent.objects.bulk_update(retried, ["job", "applied", "previous"])
+    return len(changed)
+
+
+def retry_events(key):
+    """
+    Applies the recorded events of ``key`` that found no job or wallet, e.g.
+    a JobAccepted of a freelancer who had not signed in yet. Returns the
+    number of jobs updated.
+    """
+    with transaction.atomic():
+        events = [
+            {"name": record.event_name, "block": record.block, "log_index": record.log_index,
+             "position": record.position, "transaction_hash": record.transaction_hash,
+             "args": record.args}
+            for record in ProcessedEvent.objects.filter(key=key, applied=False)
+            .exclude(args={}).order_by("position")
+        ]
+        return apply_events(events, key)
+
+
+def update_jobs(jobs):
+    """
+    Writes ``UPDATED_FIELDS`` of ``jobs`` in one statement. On PostgreSQL
+    this joins against a VALUES list; Django's ``bulk_update`` builds a
+    CASE expression per field that grows with the batch and costs more to
+    compile and run than the update itself.
+    """
+    if not jobs:
+        return
+    if connection.vendor != "postgresql":
+        Job.objects.bulk_update(jobs, UPDATED_FIELDS)
+        return
+    rows = [
+        (job.id, job.transaction_create, job.transaction_accept_job,
+         job.transaction_complete_job, job.freelancer_id, job.status, job.updated_at)
+        for job in jobs
+    ]
+    with connection.cursor() as cursor:
+        execute_values(cursor, UPDATE_JOBS_SQL, rows, page_size=len(rows))
+
+
+def next_block(crawl):
+    # ``value`` is the last block crawled, ``start_at`` the first to crawl
+    return int(crawl.value) + 1 if crawl.value else int(crawl.start_at)
+
+
+def apply_window(source, key, from_block, to_block):
+    """
+    Applies the events of one block window in its own transaction. Returns
+    ``(events, jobs_updated)``.
+    """
+    try:
+        events = source.events(from_block, to_block)
+        with transaction.atomic():
+            updated = apply_events(events, key)
+        return len(events), updated
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            # Worker threads get their own connection, do not leak it
+            connection.close()
+
+
+def ingest(source, key, to_block=None, window=1000, workers=1):
+    """
+    Crawls ``source`` from the position stored in ``LastIndexCrawl`` up to
+    ``to_block`` (the source's current block by default) in windows of
+    ``window`` blocks, ``workers`` of them applied in parallel.
+
+    Every window commits on its own; the stored position only advances past
+    a window once all windows before it have committed, and only from where
+    this crawl found it. After a crash the crawl resumes from there and
+    windows committed meanwhile are skipped as already processed. Events
+    that found no job or wallet before are retried first. Raises
+    ``CrawlPositionMoved`` if the position was changed by someone else.
+
+    Returns ``(events, jobs_updated, last_block)``.
+    """
+    crawl = LastIndexCrawl.objects.filter(key=key).first()
+    if crawl is None:
+        raise LastIndexCrawl.DoesNotExist(f"No crawl position stored for {key!r}")
+    from_block = next_block(crawl)
+    if to_block is None:
+        to_block = source.current_block()
+
+    windows = [
+        (start, min(start + window - 1, to_block))
+        for start in range(from_block, to_block + 1, window)
+    ]
+    total_events = 0
+    total_updated = retry_events(key)
+    last_block = from_block - 1
+    position = crawl.value
+    moved = False
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        run = executor.map if workers > 1 else map
+        results = run(lambda w: apply_window(source, key, *w), windows)
+        # Results arrive in window order, i.e. only contiguous prefixes
+        for (start, end), (events, updated) in zip(windows, results):
+            total_events += events
+            total_updated += updated
+            if not advance(crawl.id, position, end):
+                moved = True
+                break
+            position, last_block = str(end), end
+
+    if total_updated or moved:
+        # Job rows were updated without post_save signals
+        invalidate_model(Job)
+    if moved:
+        raise CrawlPositionMoved(
+            f"Crawl position of {key!r} moved while ingesting, stopped after block {last_block}")
+    return total_events, total_updated, last_block
+
+
+def advance(crawl_id, position, block):
+    """
+    Moves the crawl position from ``position`` to ``block``. Returns False,
+    leaving it alone, if it is no longer at ``position``.
+    """
+    with transaction.atomic():
+        crawl = LastIndexCrawl.objects.select_for_update().get(id=crawl_id)
+        if crawl.value != position:
+            return False
+        crawl.value = str(block)
+        crawl.save(update_fields=["value", "updated_at"])
+    return True
+
+
+def restore_job(job, history, removed):
+    """
+    Sets ``job`` to the state the events of ``history`` (its applied
+    ``ProcessedEvent`` rows, in the order they were applied) leave it in
+    without the rows whose ids are in ``removed``.
+
+    The remaining events are replayed in chain order on top of the values
+    the job had before any of them, which is right even when windows were
+    applied out of order. A freelancer is not recorded with its event, it
+    is what the next row overwriting it recorded as previous, or the job's
+    current one.
+    """
+    values = {}
+    written = {}
+    for record in reversed(history):
+        for field, value in record.previous.items():
+            written[record.id, field] = values.get(field, getattr(job, field))
+            values[field] = value
+
+    kept = sorted((r for r in history if r.id not in removed), key=lambda r: r.position)
+    for record in kept:
+        _, status, transaction_field = EVENT_EFFECTS[record.event_name]
+        values[transaction_field] = record.transaction_hash
+        values["status"] = status
+        if "freelancer_id" in record.previous:
+            values["freelancer_id"] = written[record.id, "freelancer_id"]
+    for field, value in values.items():
+        setattr(job, field, value)
+
+
+def rollback(key, blocks):
+    """
+    Undoes the events of the last ``blocks`` crawled blocks and moves the
+    crawl position back so they are crawled again, e.g. after a chain
+    reorganization. Jobs they touched are recomputed from the events that
+    remain. Returns ``(events, last_block)``.
+    """
+    with transaction.atomic():
+        crawl = LastIndexCrawl.objects.select_for_update().filter(key=key).first()
+        if crawl is None:
+            raise LastIndexCrawl.DoesNotExist(f"No crawl position stored for {key!r}")
+        last_block = next_block(crawl) - 1 - blocks
+        records = list(ProcessedEvent.objects.filter(key=key, block__gt=last_block))
+        jobs = {
+            job.id: job
+            for job in Job.objects.select_for_update()
+            .filter(id__in={r.job_id for r in records if r.applied}).order_by("id")
+        }
+        history = defaultdict(list)
+        for record in ProcessedEvent.objects.filter(job_id__in=jobs, applied=True).order_by("id"):
+            history[record.job_id].append(record)
+        freelancer_ids = {job.freelancer_id for job in jobs.values()}
+        freelancer_ids.update(
+            r.previous["freelancer_id"]
+            for job_history in history.values() for r in job_history
+            if "freelancer_id" in r.previous)
+        lock_freelancer_stats(freelancer_ids)
+
+        now = timezone.now()
+        removed = {r.id for r in records}
+        for job in jobs.values():
+            restore_job(job, history[job.id], removed)
+            job.updated_at = now
+
+        update_jobs(list(jobs.values()))
+        ProcessedEvent.objects.filter(id__in=removed).delete()
+        crawl.value = str(last_block)
+        crawl.save(update_fields=["value", "updated_at"])
+
+    if jobs:
+        invalidate_model(Job)
+    return len(records), last_block
@@ -0,0 +1,29 @@
+def has_chat_access(job, user_id):
+    """
+    Only the client and freelancers who picked the job may read or write its chat.
+    """
+    return job.client_id == user_id or job.picks.filter(freelancer_id=user_id).exists()
+
+
+async def ahas_chat_access(job, user_id):
+    return job.client_id == user_id or await job.picks.filter(freelancer_id=user_id).aexists()
+
+
+def serialize_message(message):
+    return {
+        "id": message.id,
+        "sender_address": message.sender.wallet_address,
+        "sender_name": message.sender.name,
+        "receiver_address": message.receiver.wallet_address,
+        "receiver_name": message.receiver.name,
+        "content": message.content,
+        "timestamp": message.timestamp.isoformat(),
+    }
+
+
+def in_conversation(payload, user_A, user_B):
+    return {payload["sender_address"], payload["receiver_address"]} == {user_A, user_B}
+
+
+def job_channel(job_id):
+    return f"chat.job.{job_id}"
@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+from ninja.errors import HttpError
+
+from .models import Dispute, Job
+
+# Mirrors FreelancePlatform.disputeJob: jobs on chain and not completed yet
+DISPUTABLE_STATUSES = {"PUSHED", "ACCEPTED"}
+
+# Everything DisputeSchema renders, in the query loading the dispute
+DISPUTE_RELATED = ("initiator", "job__client", "job__freelancer", "job__job_type")
+
+
+def open_dispute(job_id, user_id):
+    """
+    Opens a dispute on the job by its client or freelancer and moves the
+    job to DISPUTED in the same transaction.
+    """
+    with transaction.atomic():
+        # Locked, so of two parties disputing at once the second one sees
+        # the job DISPUTED already
+        job = Job.objects.select_for_update(of=("self",))\
+            .select_related("client", "freelancer", "job_type").filter(id=job_id).first()
+        if job is None:
+            raise HttpError(404, "Job not found")
+        if user_id not in (job.client_id, job.freelancer_id):
+            raise HttpError(403, "Only the job's client or freelancer can open a dispute")
+        if job.status not in DISPUTABLE_STATUSES:
+            raise HttpError(400, f"A {job.status} job cannot be disputed")
+
+        job.status = "DISPUTED"
+        job.save(update_fields=["status", "updated_at"])
+        initiator = job.client if user_id == job.client_id else job.freelancer
+        return Dispute.objects.create(job=job, initiator=initiator)
+
+
+def resolve_dispute(dispute_id, in_favor_of_freelancer):
+    """
+    Records the resolver's decision and moves the job to RESOLVED in the
+    same transaction.
+    """
+    with transaction.atomic():
+        dispute = Dispute.objects.select_for_update(of=("self", "job"))\
+            .select_related(*DISPUTE_RELATED).filter(id=dispute_id).first()
+        if dispute is None:
+            raise HttpError(404, "Dispute not found")
+        if dispute.resolved:
+            raise HttpError(400, "Dispute already resolved")
+
+        dispute.resolved = True
+        dispute.resolved_in_favor_of_freelancer = in_favor_of_freelancer
+        dispute.resolution_date = timezone.now()
+        dispute.save(update_fields=[
+            "resolved", "resolved_in_favor_of_freelancer", "resolution_date", "updated_at"])
+        dispute.job.status = "RESOLVED"
+        dispute.job.save(update_fields=["status", "updated_at"])
+        return dispute
+
+
+def dispute_queue(resolved=False):
+    """
+    Disputes for ``apaginate_keyset(..., oldest_first=True)``, read in
+    ``dispute_resolved_created_idx`` order.
+    """
+    return Dispute.objects.select_related(*DISPUTE_RELATED).filter(resolved=resolved)
+
+
+async def adispute_stats():
+    return await Dispute.objects.aaggregate(
+        open_count=Count("id", filter=Q(resolved=False)),
+        resolved_count=Count("id", filter=Q(resolved=True)),
+        resolved_for_freelancer=Count(
+            "id", filter=Q(resolved=True, resolved_in_favor_of_freelancer=True)),
+        resolved_for_client=Count(
+            "id", filter=Q(resolved=True, resolved_in_favor_of_freelancer=False)),
+        oldest_open_at=Min("created_at", filter=Q(resolved=False)),
+    )
@@ -0,0 +1,153 @@
+import hashlib
+import mimetypes
+import os
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from ninja.errors import HttpError
+
+CHUNK_SIZE = 64 * 1024
+
+# Uploaded files get a random, never reused name, so their content never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def stat_file(file_name):
+    """
+    Returns ``(size, modified_time)`` of a stored file, or None if missing.
+    """
+    try:
+        if not default_storage.exists(file_name):
+            return None
+        return default_storage.size(file_name), default_storage.get_modified_time(file_name)
+    except SuspiciousFileOperation:
+        return None
+
+
+def make_etag(file_name, size, modified):
+    digest = hashlib.sha1(
+        f"{file_name}:{size}:{modified.timestamp()}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def parse_range(header, size):
+    """
+    Parses a single ``bytes=`` range into inclusive ``(start, end)`` offsets.
+
+    Returns None when the header should be ignored (absent, malformed or
+    multiple ranges) and raises ``RangeNotSatisfiable`` when it cannot be
+    satisfied.
+    """
+    match = RANGE_RE.match(header or "")
+    if match is None:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range, the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    if start > end or start >= size:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+def is_not_modified(request, etag, modified):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return "*" in etags or etag in etags
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since"))
+    return if_modified_since is not None and int(modified.timestamp()) <= if_modified_since
+
+
+async def stream_file(file_name, start, length):
+    file = await sync_to_async(default_storage.open)(file_name, "rb")
+    try:
+        await sync_to_async(file.seek)(start)
+        while length > 0:
+            chunk = await sync_to_async(file.read)(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        await sync_to_async(file.close)()
+
+
+async def serve_file(request, file_name):
+    """
+    Serves a stored upload with long-lived cache validators.
+
+    Answers conditional requests with 304 and single ``Range`` requests
+    with 206. The body is streamed in chunks, or, when
+    ``settings.FILE_SERVE_X_ACCEL`` is on, handed to nginx through an
+    ``X-Accel-Redirect`` header so no bytes pass through Python.
+    """
+    stat = await sync_to_async(stat_file)(file_name)
+    if stat is None:
+        raise HttpError(404, "File not found")
+    size, modified = stat
+
+    etag = make_etag(file_name, size, modified)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(modified.timestamp()),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+    }
+    if is_not_modified(request, etag, modified):
+        response = HttpResponseNotModified()
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    content_type = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+    headers["Content-Disposition"] = f'attachment; filename="{os.path.basename(file_name)}"'
+
+    if settings.FILE_SERVE_X_ACCEL:
+        # nginx takes care of ranges and the body itself
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = f"{settings.FILE_X_ACCEL_PREFIX}{file_name}"
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if if_range is None or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        start, end, status = 0, size - 1, 200
+    else:
+        (start, end), status = byte_range, 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    length = end - start + 1 if size else 0
+    response = StreamingHttpResponse(
+        stream_file(file_name, start, length), status=status, content_type=content_type)
+    response["Content-Length"] = str(length)
+    response["Accept-Ranges"] = "bytes"
+    for key, value in headers.items():
+        response[key] = value
+    return response
@@ -0,0 +1,146 @@
+import fcntl
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+# Job ids are passed to the contract's ``jobId`` and handled as JavaScript
+# numbers by the frontend and the chain worker, so they must stay below
+# 2**53. Layout, from the most significant bit:
+#
+#   1 bit   marker, keeps every id above the old "<unix time><5 random
+#           digits>" ids (< 2**48 until 2058)
+#   31 bits seconds since EPOCH
+#   4 bits  host, settings.JOB_ID_HOST
+#   5 bits  process slot on the host, claimed with a file lock
+#   12 bits sequence within the second
+EPOCH = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+
+TIME_BITS = 31
+HOST_BITS = 4
+SLOT_BITS = 5
+SEQUENCE_BITS = 12
+
+MARKER = 1 << (TIME_BITS + HOST_BITS + SLOT_BITS + SEQUENCE_BITS)
+MAX_HOST = (1 << HOST_BITS) - 1
+MAX_SLOT = (1 << SLOT_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+class IdSpaceExhausted(Exception):
+    pass
+
+
+def claim_slot(lock_dir):
+    """
+    Returns ``(slot, file)`` for the first free process slot on this host.
+    The slot is held as long as the file stays open, i.e. for the life of
+    the process. The file records the last second the slot issued ids in,
+    see ``SnowflakeGenerator``.
+    """
+    os.makedirs(lock_dir, exist_ok=True)
+    for slot in range(MAX_SLOT + 1):
+        path = os.path.join(lock_dir, f"job-id-slot-{slot}.lock")
+        file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT), "r+")
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            continue
+        return slot, file
+    raise IdSpaceExhausted(f"All {MAX_SLOT + 1} job id slots in {lock_dir} are taken")
+
+
+class SnowflakeGenerator:
+    """
+    Time ordered, collision free ids without a database round-trip.
+
+    Uniqueness across machines relies on each one having its own
+    ``settings.JOB_ID_HOST``; processes on one machine claim distinct slots
+    by themselves. When more than 4096 ids are needed within a second, or
+    the clock steps back, ids are taken from the following seconds, so they
+    never repeat or decrease. A process taking over a slot continues after
+    the last second its previous holder used.
+    """
+
+    def __init__(self, host, lock_dir):
+        if not 0 <= host <= MAX_HOST:
+            raise ValueError(f"JOB_ID_HOST must be between 0 and {MAX_HOST}")
+        self.host = host
+        self.lock_dir = lock_dir
+        self._slot = None
+        self._slot_file = None
+        self._last_second = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def _claim(self):
+        if self._slot is None:
+            self._slot, self._slot_file = claim_slot(self.lock_dir)
+            # A process that held the slot before may have issued ids up to
+            # the recorded second, continue after it
+            recorded = self._slot_file.read().strip()
+            self._last_second = int(recorded) if recorded.isdigit() else -1
+            self._sequence = MAX_SEQUENCE
+
+    def _record(self):
+        # Once per second at most, the OS keeps it even if the process dies
+        self._slot_file.seek(0)
+        self._slot_file.write(f"{self._last_second:010d}")
+        self._slot_file.flush()
+
+    def reset(self):
+        # A forked child shares the parent's slot and clock state; it must
+        # claim a slot of its own
+        self._lock = threading.Lock()
+        if self._slot_file is not None:
+            self._slot_file.close()
+        self._slot = self._slot_file = None
+        self._last_second = -1
+        self._sequence = 0
+
+    def next_id(self):
+        with self._lock:
+            self._claim()
+            second = int(time.time()) - EPOCH
+            if second > self._last_second:
+                self._last_second = second
+                self._sequence = 0
+                self._record()
+            elif self._sequence < MAX_SEQUENCE:
+                self._sequence += 1
+            else:
+                self._last_second += 1
+                self._sequence = 0
+                self._record()
+            return (
+                MARKER
+                | self._last_second << (HOST_BITS + SLOT_BITS + SEQUENCE_BITS)
+                | self.host << (SLOT_BITS + SEQUENCE_BITS)
+                | self._slot << SEQUENCE_BITS
+                | self._sequence
+            )
+
+
+_generator = None
+
+
+def get_generator():
+    global _generator
+    if _generator is None:
+        _generator = SnowflakeGenerator(settings.JOB_ID_HOST, settings.JOB_ID_LOCK_DIR)
+    return _generator
+
+
+def next_job_id():
+    return get_generator().next_id()
+
+
+def _after_fork():
+    if _generator is not None:
+        _generator.reset()
+
+
+os.register_at_fork(after_in_child=_after_fork)
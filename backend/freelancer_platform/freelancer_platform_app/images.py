@@ -0,0 +1,91 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from ninja.errors import HttpError
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = "variants"
+
+_executor = None
+_executor_lock = threading.Lock()
+# Striped locks so concurrent requests for one variant render it only once
+_variant_locks = [threading.Lock() for _ in range(64)]
+
+
+def variant_name(file_name, size):
+    stem = os.path.splitext(file_name)[0]
+    return f"{VARIANT_DIR}/{stem}_{size}.webp"
+
+
+def check_variant_size(size):
+    if size not in settings.IMAGE_VARIANT_SIZES:
+        allowed = ", ".join(str(s) for s in settings.IMAGE_VARIANT_SIZES)
+        raise HttpError(400, f"Unsupported image size, use one of: {allowed}")
+
+
+def _render(file_name, size):
+    with default_storage.open(file_name, "rb") as original:
+        image = Image.open(original)
+        # Apply the EXIF orientation before dropping the metadata
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        output = io.BytesIO()
+        image.save(output, "WEBP", quality=settings.IMAGE_VARIANT_QUALITY)
+    return output.getvalue()
+
+
+def generate_variant(file_name, size):
+    """
+    Returns the storage name of the ``size`` px WebP variant of an uploaded
+    image, rendering and storing it first if needed.
+    """
+    name = variant_name(file_name, size)
+    with _variant_locks[hash(name) % len(_variant_locks)]:
+        if default_storage.exists(name):
+            return name
+        try:
+            content = _render(file_name, size)
+        except (UnidentifiedImageError, OSError):
+            raise HttpError(400, "File is not a supported image")
+        except Image.DecompressionBombError:
+            # Decoding it would take more memory than any image we resize
+            raise HttpError(400, "Image is too large to resize")
+        saved = default_storage.save(name, ContentFile(content))
+        if saved != name:
+            # Another process stored the same variant meanwhile
+            default_storage.delete(saved)
+    return name
+
+
+def _generate_all(file_name):
+    for size in settings.IMAGE_VARIANT_SIZES:
+        try:
+            generate_variant(file_name, size)
+        except Exception:
+            logger.exception("Could not generate %spx variant of %s", size, file_name)
+            return
+
+
+def schedule_variants(file_name, content_type):
+    """
+    Renders all variants of a freshly uploaded image in the background.
+    Variants that are requested before they are ready get rendered on demand.
+    """
+    global _executor
+    if not (content_type or "").startswith("image/"):
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_WORKERS, thread_name_prefix="image-variants")
+    _executor.submit(_generate_all, file_name)
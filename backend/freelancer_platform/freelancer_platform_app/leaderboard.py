@@ -0,0 +1,119 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import FreelancerStats, Job
+
+TOP_FREELANCERS_LIMIT = 6
+
+
+class LeaderboardCache:
+    """
+    Per-process copy of the top freelancers.
+
+    ``FreelancerStats`` is maintained by database triggers, including for
+    status changes written by the chain worker, which Django never sees, so
+    the TTL is what bounds staleness. Jobs saved in this process drop the
+    copy right away.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entry = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._entry is not None and self._entry[0] > time.monotonic():
+                return self._entry[1]
+        return None
+
+    def set(self, value):
+        with self._lock:
+            self._entry = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entry = None
+
+
+leaderboard_cache = LeaderboardCache(settings.LEADERBOARD_CACHE_TTL)
+
+
+def serialize_stats(stats):
+    freelancer = stats.freelancer
+    return {
+        "id": freelancer.id,
+        "username": freelancer.username,
+        "name": freelancer.name,
+        "image": freelancer.image,
+        "wallet_address": freelancer.wallet_address,
+        "completed_jobs_count": stats.completed_jobs_count,
+    }
+
+
+def top_freelancers_query():
+    return (
+        FreelancerStats.objects.select_related("freelancer")
+        .filter(completed_jobs_count__gt=0)
+        .order_by("-completed_jobs_count", "freelancer_id")[:TOP_FREELANCERS_LIMIT]
+    )
+
+
+async def aget_top_freelancers():
+    result = leaderboard_cache.get()
+    if result is None:
+        result = [serialize_stats(s) async for s in top_freelancers_query()]
+        leaderboard_cache.set(result)
+    return result
+
+
+def rebuild_freelancer_stats():
+    """
+    Recomputes every ``FreelancerStats`` row from the job table. Returns the
+    number of freelancers with completed jobs.
+    """
+    rows = (
+        Job.objects.filter(status="COMPLETED", freelancer__isnull=False)
+        .values("freelancer_id")
+        .annotate(count=Count("id"), earned=Sum("amount"), last=Max("updated_at"))
+    )
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # Hold off job writes, and so the triggers, until the swap is done
+            with connection.cursor() as cursor:
+                cursor.execute("LOCK TABLE freelancer_platform_app_job IN SHARE MODE")
+        FreelancerStats.objects.all().delete()
+        created = FreelancerStats.objects.bulk_create([
+            FreelancerStats(freelancer_id=row["freelancer_id"], completed_jobs_count=row["count"],
+                            total_earned=row["earned"] or 0, last_completed_at=row["last"])
+            for row in rows
+        ])
+    leaderboard_cache.clear()
+    return len(created)
+
+
+def lock_freelancer_stats(freelancer_ids):
+    """
+    Locks the stats rows of ``freelancer_ids``, creating missing ones, in id
+    order. Transactions updating many jobs at once call this first: the
+    triggers would otherwise lock these rows in whatever order the jobs are
+    updated, and two such transactions can deadlock.
+    """
+    freelancer_ids = sorted(i for i in set(freelancer_ids) if i is not None)
+    FreelancerStats.objects.bulk_create(
+        [FreelancerStats(freelancer_id=i) for i in freelancer_ids], ignore_conflicts=True)
+    list(FreelancerStats.objects.select_for_update()
+         .filter(freelancer_id__in=freelancer_ids).order_by("freelancer_id")
+         .values_list("freelancer_id", flat=True))
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_leaderboard(sender, instance, **kwargs):
+    leaderboard_cache.clear()
@@ -0,0 +1,435 @@
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from freelancer_platform_app.auth import generate_jwt_token
+from freelancer_platform_app.management.commands.seed_benchmark_data import WORDS
+from freelancer_platform_app.models import (
+    ChatMessage, FreelancerStats, Job, JobPick, JobType, WebThreeUser)
+
+# The query count reported by metrics_middleware, see metrics.py
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+Call = namedtuple("Call", "method path body token content_type", defaults=(None, None, None))
+Sample = namedtuple("Sample", "status elapsed queries")
+
+
+def queries_from(server_timing):
+    match = QUERIES_RE.search(server_timing or "")
+    return int(match.group(1)) if match else None
+
+
+def encode(body, content_type):
+    if body is None or isinstance(body, bytes):
+        return body, content_type
+    return json.dumps(body).encode(), content_type or "application/json"
+
+
+class HttpDriver:
+    """
+    Sends requests to a running server.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, call):
+        data, content_type = encode(call.body, call.content_type)
+        headers = {}
+        if content_type:
+            headers["Content-Type"] = content_type
+        if call.token:
+            headers["Authorization"] = f"Bearer {call.token}"
+        request = urllib.request.Request(
+            self.base_url + call.path, data=data, headers=headers, method=call.method)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                content = response.read()
+                status, timing = response.status, response.headers.get("Server-Timing")
+        except urllib.error.HTTPError as e:
+            content = e.read()
+            status, timing = e.code, e.headers.get("Server-Timing")
+        except (urllib.error.URLError, OSError):
+            content, status, timing = b"", 0, None
+        return Sample(status, time.perf_counter() - start, queries_from(timing)), content
+
+
+class InProcessDriver:
+    """
+    Calls the API through Django's test client in this process, no server
+    needed. Measures the application only, without HTTP and server overhead.
+    """
+
+    def __init__(self, prefix="/api"):
+        self.prefix = prefix
+        self._local = threading.local()
+
+    def send(self, call):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = Client()
+        data, content_type = encode(call.body, call.content_type)
+        headers = {"Authorization": f"Bearer {call.token}"} if call.token else {}
+        start = time.perf_counter()
+        response = client.generic(
+            call.method, self.prefix + call.path, data or b"",
+            content_type or "application/octet-stream", headers=headers)
+        # File responses are streamed
+        content = b"".join(response)
+        response.close()
+        sample = Sample(response.status_code, time.perf_counter() - start,
+                        queries_from(response.get("Server-Timing")))
+        return sample, content
+
+
+class Dataset:
+    """
+    Users, jobs and conversations sampled from the database once, for the
+    requests to pick from.
+    """
+
+    def __init__(self, size):
+        self._tokens = {}
+        self.users = list(WebThreeUser.objects.filter(is_active=True).order_by("?")[:size])
+        self.job_ids = list(Job.objects.order_by("?").values_list("id", flat=True)[:size])
+        # (job id, client, picking freelancer)
+        self.conversations = [
+            (pick.job_id, pick.job.client, pick.freelancer)
+            for pick in JobPick.objects.select_related("job__client", "freelancer")
+            .order_by("?")[:size]
+        ]
+        if not self.users or not self.job_ids or not self.conversations:
+            raise CommandError("Not enough data, run manage.py seed_benchmark_data first")
+        self.resume_wallets = list(
+            FreelancerStats.objects.filter(completed_jobs_count__gt=0).order_by("?")
+            .values_list("freelancer__wallet_address", flat=True)[:size]
+        ) or [user.wallet_address for user in self.users]
+        self.job_type_ids = list(JobType.objects.values_list("id", flat=True))
+        self.upload_id = None
+        self.file_name = None
+
+    def token(self, user):
+        token = self._tokens.get(user.id)
+        if token is None:
+            token = self._tokens[user.id] = generate_jwt_token(user)
+        return token
+
+    def upload(self, driver):
+        # A finished upload for the read endpoints
+        _, content = driver.send(start_upload(self, random.Random(0), driver))
+        self.upload_id = json.loads(content)["id"]
+        sample, content = driver.send(
+            Call("PUT", f"/uploads/{self.upload_id}?offset=0", b"benchmark",
+                 content_type="application/octet-stream"))
+        if sample.status != 200:
+            raise CommandError(f"Could not upload a file for the benchmark: {content!r}")
+        self.file_name = json.loads(content)["file_name"]
+
+
+def new_job(data, rng):
+    return {
+        "title": " ".join(rng.sample(WORDS, 3)).capitalize(),
+        "description": " ".join(rng.choices(WORDS, k=40)),
+        "amount": rng.randint(1, 10 ** 4) * 10 ** 15,
+        "job_type": rng.choice(data.job_type_ids),
+    }
+
+
+def start_upload(data, rng, driver):
+    return Call("POST", "/uploads",
+                {"file_name": "benchmark.txt", "size": 9, "content_type": "text/plain"},
+                data.token(rng.choice(data.users)))
+
+
+def upload_chunk(data, rng, driver):
+    _, content = driver.send(start_upload(data, rng, driver))
+    return Call("PUT", f"/uploads/{json.loads(content)['id']}?offset=0", b"benchmark",
+                content_type="application/octet-stream")
+
+
+def upload_file(data, rng, driver):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="benchmark.txt"\r\n'
+        f"Content-Type: text/plain\r\n\r\n{rng.choice(WORDS)}\r\n--{boundary}--\r\n"
+    ).encode()
+    return Call("POST", "/upload-file", body, content_type=f"multipart/form-data; boundary={boundary}")
+
+
+def list_jobs(data, rng, driver):
+    params = rng.choice([
+        "", f"&status={rng.choice(['PUSHED', 'COMPLETED'])}",
+        f"&job_type_id={rng.choice(data.job_type_ids)}" if data.job_type_ids else "",
+        f"&search={rng.choice(WORDS)}", f"&min_amount={10 ** 18}",
+    ])
+    return Call("GET", f"/jobs?limit=20{params}")
+
+
+def as_client(data, rng):
+    job_id, client, freelancer = rng.choice(data.conversations)
+    return job_id, data.token(client), freelancer
+
+
+def as_freelancer(data, rng):
+    job_id, client, freelancer = rng.choice(data.conversations)
+    return job_id, data.token(freelancer), client
+
+
+def fetch_chat(data, rng, driver):
+    job_id, token, _ = as_client(data, rng)
+    return Call("GET", f"/jobs/{job_id}/chat?limit=50", token=token)
+
+
+def send_chat(data, rng, driver):
+    job_id, token, freelancer = as_client(data, rng)
+    return Call("POST", f"/jobs/{job_id}/chat", {
+        "receiver_address": freelancer.wallet_address,
+        "content": " ".join(rng.choices(WORDS, k=8)),
+    }, token)
+
+
+def list_picks(data, rng, driver):
+    job_id, token, _ = as_client(data, rng)
+    return Call("GET", f"/jobs/{job_id}/picks", token=token)
+
+
+def pick_status(data, rng, driver):
+    # What a job list page asks for its cards
+    job_ids = rng.sample(data.job_ids, min(20, len(data.job_ids)))
+    query = "&".join(f"job_ids={job_id}" for job_id in job_ids)
+    return Call("GET", f"/jobs/pick-status?{query}", token=as_freelancer(data, rng)[1])
+
+
+# Route -> builds one request against a sampled dataset
+ENDPOINTS = {
+    "POST /login": lambda data, rng, driver: Call(
+        "POST", "/login", {"wallet_address": rng.choice(data.users).wallet_address}),
+    "GET /user/info": lambda data, rng, driver: Call(
+        "GET", "/user/info", token=data.token(rng.choice(data.users))),
+    "PUT /user/update": lambda data, rng, driver: Call(
+        "PUT", "/user/update", {"bio": " ".join(rng.choices(WORDS, k=12))},
+        data.token(rng.choice(data.users))),
+    "POST /upload-file": upload_file,
+    "POST /uploads": start_upload,
+    "GET /uploads/{upload_id}": lambda data, rng, driver: Call(
+        "GET", f"/uploads/{data.upload_id}"),
+    "PUT /uploads/{upload_id}": upload_chunk,
+    "GET /read-file/{file_name}": lambda data, rng, driver: Call(
+        "GET", f"/read-file/{data.file_name}"),
+    "GET /job-types": lambda data, rng, driver: Call("GET", "/job-types"),
+    "POST /jobs": lambda data, rng, driver: Call(
+        "POST", "/jobs", new_job(data, rng), data.token(rng.choice(data.users))),
+    "POST /jobs/bulk": lambda data, rng, driver: Call(
+        "POST", "/jobs/bulk", {"jobs": [new_job(data, rng) for _ in range(20)]},
+        data.token(rng.choice(data.users))),
+    "GET /jobs": list_jobs,
+    "GET /jobs/by-client": lambda data, rng, driver: Call(
+        "GET", "/jobs/by-client?limit=20", token=as_client(data, rng)[1]),
+    "GET /jobs/by-freelancer": lambda data, rng, driver: Call(
+        "GET", "/jobs/by-freelancer?limit=20", token=as_freelancer(data, rng)[1]),
+    "GET /jobs/newest": lambda data, rng, driver: Call("GET", "/jobs/newest"),
+    "GET /jobs/search": lambda data, rng, driver: Call(
+        "GET", f"/jobs/search?q={rng.choice(WORDS)}+{rng.choice(WORDS)[:3]}"),
+    "GET /top-freelancers": lambda data, rng, driver: Call("GET", "/top-freelancers"),
+    "GET /jobs/{job_id}": lambda data, rng, driver: Call(
+        "GET", f"/jobs/{rng.choice(data.job_ids)}"),
+    "GET /jobs/{job_id}/chat": fetch_chat,
+    "POST /jobs/{job_id}/chat": send_chat,
+    "GET /jobs/{job_id}/picks": list_picks,
+    "GET /jobs/pick-status": pick_status,
+    "POST /jobs/{job_id}/pick": lambda data, rng, driver: Call(
+        "POST", f"/jobs/{rng.choice(data.job_ids)}/pick", token=data.token(rng.choice(data.users))),
+    "GET /users/{user_wallet}/resume": lambda data, rng, driver: Call(
+        "GET", f"/users/{rng.choice(data.resume_wallets)}/resume"),
+}
+
+# Mix -> route -> relative weight
+MIXES = {
+    # Visitors browsing the marketplace
+    "browse": {
+        "GET /jobs": 30, "GET /jobs/search": 10, "GET /jobs/newest": 10, "GET /job-types": 5,
+        "GET /top-freelancers": 5, "GET /jobs/{job_id}": 25, "GET /users/{user_wallet}/resume": 10,
+        "GET /read-file/{file_name}": 5,
+    },
+    # Signed in clients and freelancers working on their jobs
+    "users": {
+        "GET /user/info": 15, "GET /jobs/by-client": 15, "GET /jobs/by-freelancer": 15,
+        "GET /jobs/{job_id}/chat": 25, "POST /jobs/{job_id}/chat": 10,
+        "GET /jobs/{job_id}/picks": 10, "POST /jobs/{job_id}/pick": 5, "PUT /user/update": 5,
+        "GET /jobs/pick-status": 10,
+    },
+    # Everything that writes
+    "write": {
+        "POST /login": 15, "PUT /user/update": 10, "POST /jobs": 15, "POST /jobs/bulk": 5,
+        "POST /jobs/{job_id}/chat": 25, "POST /jobs/{job_id}/pick": 15, "POST /upload-file": 5,
+        "POST /uploads": 3, "GET /uploads/{upload_id}": 3, "PUT /uploads/{upload_id}": 4,
+    },
+}
+
+
+def blend(shares):
+    """
+    Combines mixes, ``shares`` maps mix name -> share of the requests.
+    """
+    weights = {}
+    for mix, share in shares.items():
+        total = sum(MIXES[mix].values())
+        for name, weight in MIXES[mix].items():
+            weights[name] = weights.get(name, 0) + weight * share / total
+    return weights
+
+
+MIXES["all"] = {name: 1 for name in ENDPOINTS}
+MIXES["realistic"] = blend({"browse": 70, "users": 25, "write": 5})
+
+
+def percentile(values, fraction):
+    # Nearest rank, ``values`` sorted
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(sample.elapsed * 1000 for sample in samples)
+    queries = [sample.queries for sample in samples if sample.queries is not None]
+    statuses = {}
+    for sample in samples:
+        statuses[str(sample.status)] = statuses.get(str(sample.status), 0) + 1
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if not 0 < sample.status < 500),
+        "statuses": statuses,
+        "throughput": len(samples) / elapsed,
+        "mean_ms": sum(latencies) / len(latencies),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": latencies[-1],
+        "queries_per_request": sum(queries) / len(queries) if queries else None,
+        "max_queries": max(queries) if queries else None,
+    }
+
+
+def dataset_size():
+    return {
+        "users": WebThreeUser.objects.count(),
+        "jobs": Job.objects.count(),
+        "picks": JobPick.objects.count(),
+        "messages": ChatMessage.objects.count(),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives the API with a weighted mix of requests against the data in "
+        "the database (see manage.py seed_benchmark_data) and reports "
+        "p50/p95/p99 latency, throughput and queries per request, overall and "
+        "per endpoint. Runs in process by default; --url targets a running "
+        "server instead. Keep --concurrency at 1 for write mixes on SQLite."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", help="API root of a running server, e.g. http://127.0.0.1:8000/api")
+        parser.add_argument("--mix", choices=sorted(MIXES), default="realistic")
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--warmup", type=int, default=100,
+                            help="Requests sent before measuring")
+        parser.add_argument("--sample-size", type=int, default=1000,
+                            help="Users, jobs and conversations sampled to build requests from")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--label", default="", help="Stored with the results, e.g. a branch name")
+        parser.add_argument("--output", help="Write the results as JSON to this file")
+        parser.add_argument("--compare", help="Results JSON of an earlier run to compare against")
+
+    def handle(self, *args, **options):
+        driver = HttpDriver(options["url"]) if options["url"] else InProcessDriver()
+        data = Dataset(options["sample_size"])
+        mix = MIXES[options["mix"]]
+        if any(name.startswith(("GET /uploads", "GET /read-file")) for name in mix):
+            data.upload(driver)
+
+        names = list(mix)
+        weights = [mix[name] for name in names]
+
+        def request(seed):
+            rng = random.Random(seed)
+            name = rng.choices(names, weights)[0]
+            sample, _ = driver.send(ENDPOINTS[name](data, rng, driver))
+            return name, sample
+
+        seed = options["seed"] * 1_000_003
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            list(pool.map(request, range(seed - options["warmup"], seed)))
+            start = time.perf_counter()
+            results = list(pool.map(request, range(seed, seed + options["requests"])))
+            elapsed = time.perf_counter() - start
+
+        by_endpoint = {}
+        for name, sample in results:
+            by_endpoint.setdefault(name, []).append(sample)
+        report = {
+            "label": options["label"],
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "target": options["url"] or "in-process",
+            "database": connection.vendor,
+            "dataset": dataset_size(),
+            "mix": options["mix"],
+            "concurrency": options["concurrency"],
+            "elapsed_s": elapsed,
+            "overall": summarize([sample for _, sample in results], elapsed),
+            "endpoints": {
+                name: summarize(samples, elapsed) for name, samples in sorted(by_endpoint.items())
+            },
+        }
+        self.print_report(report)
+
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                self.print_comparison(json.load(f), report)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+
+    def print_report(self, report):
+        self.stdout.write(
+            "{database}, {dataset[users]} users / {dataset[jobs]} jobs / {dataset[picks]} picks / "
+            "{dataset[messages]} messages, mix={mix}, concurrency={concurrency}".format(**report))
+        self.stdout.write(
+            f"{'endpoint':<34} {'reqs':>6} {'err':>4} {'req/s':>8} {'p50':>8} {'p95':>8} "
+            f"{'p99':>8} {'queries':>8}")
+        rows = [*report["endpoints"].items(), ("overall", report["overall"])]
+        for name, result in rows:
+            queries = result["queries_per_request"]
+            self.stdout.write(
+                f"{name:<34} {result['requests']:>6} {result['errors']:>4} "
+                f"{result['throughput']:>8.1f} {result['p50_ms']:>6.1f}ms {result['p95_ms']:>6.1f}ms "
+                f"{result['p99_ms']:>6.1f}ms {'-' if queries is None else f'{queries:.1f}':>8}")
+
+    def print_comparison(self, before, after):
+        self.stdout.write(f"Compared with {before.get('label') or before['started_at']}:")
+        rows = [
+            *((name, before["endpoints"].get(name), result)
+              for name, result in after["endpoints"].items()),
+            ("overall", before["overall"], after["overall"]),
+        ]
+        for name, old, new in rows:
+            if old is None:
+                continue
+            self.stdout.write(
+                f"{name:<34} p95 {old['p95_ms']:>7.1f} -> {new['p95_ms']:>7.1f}ms "
+                f"({(new['p95_ms'] / old['p95_ms'] - 1) * 100:+6.1f}%)  "
+                f"req/s {old['throughput']:>8.1f} -> {new['throughput']:>8.1f}")
@@ -0,0 +1,69 @@
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+
+def timed_request(url, headers):
+    request = urllib.request.Request(url, headers=headers)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            ok = response.status < 400
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures throughput of a running API server at increasing concurrency. "
+        "Run it once against the WSGI server (manage.py runserver) and once "
+        "against the ASGI one (gunicorn -c gunicorn.conf.py) to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000/api/jobs")
+        parser.add_argument("--token", help="JWT sent as a bearer token")
+        parser.add_argument("--concurrency", default="1,8,32,128",
+                            help="Comma separated numbers of in-flight requests")
+        parser.add_argument("--requests", type=int, default=500,
+                            help="Requests per concurrency level")
+        parser.add_argument("--output", help="Write the results as JSON to this file")
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+
+        results = []
+        for concurrency in (int(c) for c in options["concurrency"].split(",")):
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                start = time.perf_counter()
+                samples = list(pool.map(
+                    lambda _: timed_request(options["url"], headers),
+                    range(options["requests"])))
+                elapsed = time.perf_counter() - start
+
+            latencies = sorted(latency for latency, _ in samples)
+            result = {
+                "concurrency": concurrency,
+                "requests": len(samples),
+                "errors": sum(1 for _, ok in samples if not ok),
+                "throughput": len(samples) / elapsed,
+                "p50_ms": statistics.median(latencies) * 1000,
+                "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+            }
+            results.append(result)
+            self.stdout.write(
+                "concurrency={concurrency:<4} {throughput:8.1f} req/s  "
+                "p50={p50_ms:7.1f}ms  p95={p95_ms:7.1f}ms  errors={errors}".format(**result))
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump({"url": options["url"], "results": results}, f, indent=2)
@@ -0,0 +1,82 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from ninja.responses import NinjaJSONEncoder
+
+from freelancer_platform_app.models import Job
+from freelancer_platform_app.picks import with_picks_count
+from freelancer_platform_app.schemas import JobSchema
+from freelancer_platform_app.serializers import job_serializer
+
+
+def render_pydantic(queryset):
+    # What Ninja does for ``response=list[JobSchema]``
+    jobs = list(queryset.select_related("job_type", "client", "freelancer"))
+    return json.dumps([JobSchema.model_validate(job).model_dump() for job in jobs],
+                      cls=NinjaJSONEncoder)
+
+
+def render_fast(queryset):
+    return job_serializer.render(list(job_serializer.values(queryset)))
+
+
+def timed(render, queryset, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(queryset)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks that the .values() job serializer renders exactly what the "
+        "pydantic JobSchema path renders for the jobs in the database, then "
+        "times both."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500,
+                            help="Jobs rendered per run")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--skip-benchmark", action="store_true",
+                            help="Only check that both paths agree")
+        parser.add_argument("--output", help="Write the results as JSON to this file")
+
+    def handle(self, *args, **options):
+        jobs = with_picks_count(Job.objects.order_by("-created_at", "-id"))
+        total = jobs.count()
+        if not total:
+            raise CommandError("No jobs to render, create or seed some first")
+
+        # Every job, a page at a time, must come out identical
+        for offset in range(0, total, options["rows"]):
+            page = jobs[offset:offset + options["rows"]]
+            expected, actual = render_pydantic(page), render_fast(page)
+            if expected != actual:
+                for want, got in zip(json.loads(expected), json.loads(actual)):
+                    if want != got:
+                        raise CommandError(f"Job {want['id']} differs:\n{want}\n{got}")
+                raise CommandError("Output differs in encoding")
+        self.stdout.write(self.style.SUCCESS(f"Identical output for {total} jobs"))
+
+        if options["skip_benchmark"]:
+            return
+
+        page = jobs[:options["rows"]]
+        result = {
+            "rows": len(page),
+            "pydantic_ms": timed(render_pydantic, page, options["repeat"]),
+            "fast_ms": timed(render_fast, page, options["repeat"]),
+        }
+        result["speedup"] = result["pydantic_ms"] / result["fast_ms"]
+        self.stdout.write(
+            "rows={rows}  pydantic={pydantic_ms:.1f}ms  fast={fast_ms:.1f}ms  "
+            "speedup={speedup:.1f}x".format(**result))
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(result, f, indent=2)
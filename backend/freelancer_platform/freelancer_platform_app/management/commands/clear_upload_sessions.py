@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from freelancer_platform_app.uploads import clear_expired_sessions
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes resumable uploads older than UPLOAD_SESSION_TTL with their "
+        "partial files under UPLOAD_SESSION_DIR, and partial files no upload "
+        "owns any more. Run it periodically, e.g. hourly from cron."
+    )
+
+    def handle(self, *args, **options):
+        sessions, orphans = clear_expired_sessions()
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {sessions} expired uploads and {orphans} orphaned partial files"))
@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from freelancer_platform_app.chain import CrawlPositionMoved, JsonlEventSource, ingest
+from freelancer_platform_app.models import LastIndexCrawl
+
+
+class Command(BaseCommand):
+    help = (
+        "Applies decoded JobCreated/JobAccepted/JobCompleted contract events to "
+        "jobs and advances the LastIndexCrawl position, one block window per "
+        "transaction. Events already processed are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="Read events from this JSONL file")
+        parser.add_argument("--source", default=settings.CHAIN_EVENT_SOURCE,
+                            help="Dotted path of the EventSource class used without --file")
+        parser.add_argument("--key", default="crawl_onchain")
+        parser.add_argument("--to-block", type=int, help="Stop at this block instead of the latest")
+        parser.add_argument("--window", type=int, default=settings.CHAIN_CRAWL_WINDOW,
+                            help="Blocks applied per transaction")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Windows applied in parallel, e.g. to catch up after downtime")
+        parser.add_argument("--follow", action="store_true",
+                            help="Keep polling the source for new blocks")
+        parser.add_argument("--interval", type=float, default=3.0,
+                            help="Seconds between polls with --follow")
+
+    def handle(self, *args, **options):
+        if options["file"]:
+            source = JsonlEventSource(options["file"])
+        elif options["source"]:
+            source = import_string(options["source"])()
+        else:
+            raise CommandError("Pass --file or --source, or set CHAIN_EVENT_SOURCE")
+
+        while True:
+            start = time.perf_counter()
+            try:
+                events, updated, last_block = ingest(
+                    source, options["key"], options["to_block"], options["window"],
+                    options["workers"])
+            except (LastIndexCrawl.DoesNotExist, CrawlPositionMoved) as e:
+                raise CommandError(str(e))
+            elapsed = time.perf_counter() - start
+            if events or not options["follow"]:
+                self.stdout.write(
+                    f"Applied {events} events to {updated} jobs up to block {last_block} "
+                    f"in {elapsed:.2f}s ({events / elapsed if elapsed else 0:.0f} events/s)")
+            if not options["follow"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from freelancer_platform_app.leaderboard import rebuild_freelancer_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the per-freelancer completed job stats behind "
+        "/api/top-freelancers from the job table, repairing any drift."
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_freelancer_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {count} freelancers"))
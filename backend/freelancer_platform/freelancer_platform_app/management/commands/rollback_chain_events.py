@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from freelancer_platform_app.chain import rollback
+from freelancer_platform_app.models import LastIndexCrawl
+
+
+class Command(BaseCommand):
+    help = (
+        "Undoes the job changes of the last N crawled blocks and moves the crawl "
+        "position back, so they are crawled again after a chain reorganization."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("blocks", type=int, help="Number of most recent blocks to undo")
+        parser.add_argument("--key", default="crawl_onchain")
+
+    def handle(self, *args, **options):
+        if options["blocks"] < 1:
+            raise CommandError("blocks must be positive")
+        try:
+            events, last_block = rollback(options["key"], options["blocks"])
+        except LastIndexCrawl.DoesNotExist as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Undid {events} events, crawl resumes after block {last_block}"))
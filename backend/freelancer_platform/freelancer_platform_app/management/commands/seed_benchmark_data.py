@@ -0,0 +1,186 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from freelancer_platform_app.ids import next_job_id
+from freelancer_platform_app.models import ChatMessage, Dispute, Job, JobPick, JobType, WebThreeUser
+
+# Seeded users are recognised by their wallet, so --reset only removes them
+# and everything hanging off them
+WALLET_PREFIX = "0xbench"
+
+WORDS = [
+    "solidity", "audit", "smart", "contract", "react", "frontend", "backend",
+    "django", "python", "rust", "nft", "defi", "token", "wallet", "dashboard",
+    "landing", "page", "logo", "design", "mobile", "app", "discord", "telegram",
+    "bot", "data", "analysis", "marketing", "writer", "translation", "video",
+]
+
+JOB_TYPES = ["Development", "Design", "Marketing", "Writing", "Audit"]
+
+# Job status -> share of the seeded jobs
+STATUS_WEIGHTS = {
+    "NEW": 15, "PUSHED": 40, "ACCEPTED": 15, "COMPLETED": 25, "DISPUTED": 3, "RESOLVED": 2,
+}
+ASSIGNED = {"ACCEPTED", "COMPLETED", "DISPUTED", "RESOLVED"}
+
+
+def title(rng):
+    return " ".join(rng.sample(WORDS, rng.randint(2, 5))).capitalize()
+
+
+def around(rng, average):
+    # Uniform in [0, 2 * average], so the totals land near the requested ones
+    return int(rng.random() * 2 * average + 0.5)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the database with generated users, jobs, picks, disputes and "
+        "chat messages for manage.py benchmark_api, e.g. --users 10000 --jobs "
+        "1000000 --messages 5000000. Works on SQLite and PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--jobs", type=int, default=10000)
+        parser.add_argument("--picks", type=int, default=30000,
+                            help="Approximate number of picks, spread over jobs past NEW")
+        parser.add_argument("--messages", type=int, default=50000,
+                            help="Approximate number of chat messages, on jobs with picks")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for repeatable datasets")
+        parser.add_argument("--reset", action="store_true",
+                            help="Remove previously seeded users and their jobs first")
+
+    def handle(self, *args, **options):
+        if options["users"] < 2:
+            raise CommandError("At least 2 users are needed")
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+
+        if options["reset"]:
+            self.reset(batch_size)
+        elif WebThreeUser.objects.filter(wallet_address__startswith=WALLET_PREFIX).exists():
+            raise CommandError("Seeded data exists already, pass --reset to replace it")
+
+        start = time.perf_counter()
+        job_types = [JobType.objects.get_or_create(name=name)[0].id for name in JOB_TYPES]
+        WebThreeUser.objects.bulk_create(
+            [
+                WebThreeUser(
+                    username=f"bench_{i}",
+                    wallet_address=f"{WALLET_PREFIX}{i:033x}",
+                    name=f"Bench User {i}" if i % 4 else None,
+                    bio=" ".join(rng.choices(WORDS, k=12)) if i % 3 else None,
+                )
+                for i in range(options["users"])
+            ],
+            batch_size=batch_size,
+        )
+        user_ids = list(
+            WebThreeUser.objects.filter(wallet_address__startswith=WALLET_PREFIX)
+            .values_list("id", flat=True))
+        self.stdout.write(f"{len(user_ids)} users")
+
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        pickable = options["jobs"] * (1 - STATUS_WEIGHTS["NEW"] / sum(weights))
+        picks_per_job = options["picks"] / pickable if pickable else 0
+        messages_per_job = options["messages"] / pickable if pickable else 0
+        # Picks are distinct freelancers other than the client
+        picks_per_job = min(picks_per_job, (len(user_ids) - 1) / 2)
+
+        jobs, picks, disputes, messages = [], [], [], []
+        totals = {"jobs": 0, "picks": 0, "disputes": 0, "messages": 0}
+
+        def flush():
+            # Picks and messages reference the jobs, insert those first
+            with transaction.atomic():
+                Job.objects.bulk_create(jobs)
+                # created_at is only set once the jobs are saved
+                created_at = {job.id: job.created_at for job in jobs}
+                for pick in picks:
+                    pick.job_created_at = created_at[pick.job_id]
+                JobPick.objects.bulk_create(picks)
+                Dispute.objects.bulk_create(disputes)
+                ChatMessage.objects.bulk_create(messages)
+            totals["jobs"] += len(jobs)
+            totals["picks"] += len(picks)
+            totals["disputes"] += len(disputes)
+            totals["messages"] += len(messages)
+            jobs.clear()
+            picks.clear()
+            disputes.clear()
+            messages.clear()
+            self.stdout.write(
+                "{jobs} jobs, {picks} picks, {disputes} disputes, {messages} messages".format(**totals))
+
+        for _ in range(options["jobs"]):
+            client_id, freelancer_id = rng.sample(user_ids, 2)
+            status = rng.choices(statuses, weights)[0]
+            job = Job(
+                id=next_job_id(),
+                title=title(rng),
+                description=" ".join(rng.choices(WORDS, k=40)),
+                info=" ".join(rng.choices(WORDS, k=8)) if rng.random() < 0.5 else None,
+                client_id=client_id,
+                freelancer_id=freelancer_id if status in ASSIGNED else None,
+                amount=rng.randint(1, 10 ** 4) * 10 ** 15,
+                status=status,
+                job_type_id=rng.choice(job_types),
+            )
+            jobs.append(job)
+            if status in ("DISPUTED", "RESOLVED"):
+                resolved = status == "RESOLVED"
+                disputes.append(Dispute(
+                    job_id=job.id,
+                    initiator_id=rng.choice([client_id, freelancer_id]),
+                    resolved=resolved,
+                    resolved_in_favor_of_freelancer=rng.random() < 0.5 if resolved else None,
+                    resolution_date=timezone.now() if resolved else None,
+                ))
+
+            if status != "NEW":
+                pickers = rng.sample(user_ids, min(around(rng, picks_per_job), len(user_ids)))
+                pickers = [user_id for user_id in pickers if user_id != client_id]
+                if job.freelancer_id is not None and job.freelancer_id not in pickers:
+                    pickers[-1:] = [job.freelancer_id]
+                picks.extend(JobPick(job_id=job.id, freelancer_id=user_id) for user_id in pickers)
+                for _ in range(around(rng, messages_per_job) if pickers else 0):
+                    other = rng.choice(pickers)
+                    sender, receiver = (client_id, other) if rng.random() < 0.5 else (other, client_id)
+                    messages.append(ChatMessage(
+                        job_id=job.id, sender_id=sender, receiver_id=receiver,
+                        content=" ".join(rng.choices(WORDS, k=rng.randint(3, 20)))))
+
+            if len(jobs) + len(picks) + len(messages) >= batch_size:
+                flush()
+        flush()
+
+        self.stdout.write(self.style.SUCCESS(
+            "Seeded {users} users, {jobs} jobs, {picks} picks, {disputes} disputes and "
+            "{messages} messages in {elapsed:.1f}s".format(
+                users=len(user_ids), elapsed=time.perf_counter() - start, **totals)))
+
+    def reset(self, batch_size):
+        users = WebThreeUser.objects.filter(wallet_address__startswith=WALLET_PREFIX)
+        # Remove a batch of jobs at a time, deleting them all at once makes
+        # Django collect every row in memory for the delete signals
+        while True:
+            job_ids = list(
+                Job.objects.filter(client__in=users).values_list("id", flat=True)[:batch_size])
+            if not job_ids:
+                break
+            with transaction.atomic():
+                ChatMessage.objects.filter(job_id__in=job_ids).delete()
+                JobPick.objects.filter(job_id__in=job_ids).delete()
+                Dispute.objects.filter(job_id__in=job_ids).delete()
+                Job.objects.filter(id__in=job_ids).delete()
+        ChatMessage.objects.filter(sender__in=users).delete()
+        JobPick.objects.filter(freelancer__in=users).delete()
+        deleted, _ = users.delete()
+        self.stdout.write(f"Removed previously seeded data ({deleted} users and related rows)")
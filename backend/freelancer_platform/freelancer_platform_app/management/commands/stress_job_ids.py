@@ -0,0 +1,67 @@
+import multiprocessing
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from freelancer_platform_app.ids import MARKER, next_job_id
+
+# Largest integer JavaScript numbers represent exactly
+MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+
+def generate(count, threads):
+    """
+    Runs in a worker process; returns the ids each thread generated, in order.
+    """
+    results = [[] for _ in range(threads)]
+
+    def run(ids):
+        for _ in range(count):
+            ids.append(next_job_id())
+
+    workers = [threading.Thread(target=run, args=(ids,)) for ids in results]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates job ids from many processes and threads at once and checks "
+        "that they are unique, increasing per thread and within the range the "
+        "contract and JavaScript clients accept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=8)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--ids", type=int, default=5000, help="Ids per thread")
+
+    def handle(self, *args, **options):
+        # Take a slot in this process first, so forked workers must claim
+        # their own rather than reuse it
+        next_job_id()
+
+        context = multiprocessing.get_context("fork")
+        with context.Pool(options["processes"]) as pool:
+            per_process = pool.starmap(
+                generate, [(options["ids"], options["threads"])] * options["processes"])
+
+        seen = set()
+        total = 0
+        for sequences in per_process:
+            for ids in sequences:
+                if any(a >= b for a, b in zip(ids, ids[1:])):
+                    raise CommandError("Ids generated by one thread are not increasing")
+                seen.update(ids)
+                total += len(ids)
+
+        if len(seen) != total:
+            raise CommandError(f"{total - len(seen)} duplicate ids out of {total}")
+        if min(seen) < MARKER or max(seen) > MAX_SAFE_INTEGER:
+            raise CommandError(f"Ids out of range: {min(seen)} - {max(seen)}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} unique ids from {options['processes']} processes x "
+            f"{options['threads']} threads, {min(seen)} - {max(seen)}"))
@@ -0,0 +1,367 @@
+import bisect
+import hmac
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.decorators import sync_and_async_middleware
+from ninja import NinjaAPI, Router
+from ninja.decorators import decorate_view
+
+from .auth import user_cache
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the request latency histogram, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class RequestMetrics:
+    """
+    What one request spent. Queries run by ``sync_to_async`` threads are
+    counted too, since they inherit the request's context.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.total_time = 0.0
+        self.route = None
+        self.budget = None
+        self.view_returned = None
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.queries > self.budget
+
+    def server_timing(self):
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f"serialize;dur={self.serialize_time * 1000:.1f}",
+            f"total;dur={self.total_time * 1000:.1f}",
+        ])
+
+
+_current = ContextVar("request_metrics", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def install_query_recorder(connection, **kwargs):
+    # The wrapper object of a thread is reused across reconnects
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_query_recorders():
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
+    connection_created.connect(
+        install_query_recorder, dispatch_uid="metrics:install_query_recorder")
+
+
+@contextmanager
+def timed_serialization():
+    metrics = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.serialize_time += time.perf_counter() - started
+
+
+class MetricsRegistry:
+    """
+    Per-process request totals by route, rendered in the Prometheus text
+    format. Each worker process reports its own; scrape them all or sum
+    them in the query.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._requests = {}
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method, route, status, metrics):
+        with self._lock:
+            self._requests[(method, route, status)] = \
+                self._requests.get((method, route, status), 0) + 1
+            totals = self._routes.get((method, route))
+            if totals is None:
+                totals = self._routes[(method, route)] = {
+                    "buckets": [0] * len(self.buckets),
+                    "count": 0,
+                    "latency": 0.0,
+                    "queries": 0,
+                    "db": 0.0,
+                    "serialize": 0.0,
+                    "over_budget": 0,
+                }
+            index = bisect.bisect_left(self.buckets, metrics.total_time)
+            if index < len(self.buckets):
+                totals["buckets"][index] += 1
+            totals["count"] += 1
+            totals["latency"] += metrics.total_time
+            totals["queries"] += metrics.queries
+            totals["db"] += metrics.db_time
+            totals["serialize"] += metrics.serialize_time
+            totals["over_budget"] += metrics.over_budget
+
+    def clear(self):
+        with self._lock:
+            self._requests.clear()
+            self._routes.clear()
+
+    def render(self):
+        with self._lock:
+            requests = sorted(self._requests.items())
+            routes = sorted((key, dict(totals, buckets=list(totals["buckets"])))
+                            for key, totals in self._routes.items())
+
+        lines = [
+            "# HELP http_requests_total Requests handled, by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in requests:
+            lines.append(
+                f'http_requests_total{{{_labels(method, route)},status="{status}"}} {count}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Time from the first middleware to the response.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), totals in routes:
+            labels = _labels(method, route)
+            cumulative = 0
+            for bound, count in zip(self.buckets, totals["buckets"]):
+                cumulative += count
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {totals["count"]}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {totals["latency"]:.6f}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {totals["count"]}')
+
+        for name, key, kind, help_text in [
+            ("http_request_db_queries_total", "queries", "counter",
+             "SQL queries run by requests."),
+            ("http_request_db_seconds_total", "db", "counter",
+             "Time requests spent in SQL queries."),
+            ("http_request_serialize_seconds_total", "serialize", "counter",
+             "Time requests spent validating and rendering responses."),
+            ("http_request_query_budget_exceeded_total", "over_budget", "counter",
+             "Requests that ran more queries than their endpoint's budget."),
+        ]:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for (method, route), totals in routes:
+                value = totals[key]
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f"{name}{{{_labels(method, route)}}} {value}")
+
+        stats = user_cache.stats()
+        lines += [
+            "# HELP auth_user_cache_hits_total Authenticated requests served from the user cache.",
+            "# TYPE auth_user_cache_hits_total counter",
+            f"auth_user_cache_hits_total {stats['hits']}",
+            "# HELP auth_user_cache_misses_total Authenticated requests that loaded the user.",
+            "# TYPE auth_user_cache_misses_total counter",
+            f"auth_user_cache_misses_total {stats['misses']}",
+            "# HELP auth_user_cache_size Users currently cached.",
+            "# TYPE auth_user_cache_size gauge",
+            f"auth_user_cache_size {stats['size']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method, route):
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+registry = MetricsRegistry()
+
+
+def request_route(request):
+    # The URL pattern rather than the path, so ids do not explode the labels
+    match = request.resolver_match
+    if match is None:
+        return "unmatched"
+    return "/" + match.route
+
+
+def finish_request(request, response, metrics):
+    metrics.total_time = time.perf_counter() - metrics.started
+    metrics.route = request_route(request)
+    registry.observe(request.method, metrics.route, response.status_code, metrics)
+    response["Server-Timing"] = metrics.server_timing()
+    response.request_metrics = metrics
+    if metrics.over_budget:
+        message = (f"{request.method} {metrics.route} ran {metrics.queries} queries, "
+                   f"its budget is {metrics.budget}")
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+    return response
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    Records the query count, DB time, serialization time and latency of
+    every request into ``registry`` and reports them in a ``Server-Timing``
+    header. Goes first in ``MIDDLEWARE`` so the total covers the others.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if not settings.METRICS_ENABLED:
+                return await get_response(request)
+            metrics = RequestMetrics()
+            token = _current.set(metrics)
+            try:
+                response = await get_response(request)
+            finally:
+                _current.reset(token)
+            return finish_request(request, response, metrics)
+    else:
+        def middleware(request):
+            if not settings.METRICS_ENABLED:
+                return get_response(request)
+            metrics = RequestMetrics()
+            token = _current.set(metrics)
+            try:
+                response = get_response(request)
+            finally:
+                _current.reset(token)
+            return finish_request(request, response, metrics)
+
+    return middleware
+
+
+def metrics_view(request):
+    # Route names and timings are not public, without a token nobody may read them
+    if not settings.METRICS_TOKEN or not hmac.compare_digest(
+            request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def query_budget(queries):
+    """
+    Declares the most queries one call of the operation may run, counting
+    authentication. Requests over budget are logged and counted, and fail
+    when ``settings.QUERY_BUDGET_STRICT`` is on. Goes below ``@api.get``::
+
+        @api.get("/jobs/{job_id}", response=JobSchema)
+        @query_budget(1)
+        async def get_job_by_id(request, job_id: int):
+            ...
+    """
+    def decorator(run):
+        @wraps(run)
+        async def budgeted_run(request, **kwargs):
+            metrics = _current.get()
+            if metrics is not None:
+                metrics.budget = queries
+            return await run(request, **kwargs)
+
+        return budgeted_run
+
+    return decorate_view(decorator)
+
+
+def mark_view_returned(view_func):
+    # Ninja validates and renders what the view returns right after it
+    # returns; the API's ``create_response`` closes that window
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def marked(*args, **kwargs):
+            try:
+                return await view_func(*args, **kwargs)
+            finally:
+                _mark_view_returned()
+    else:
+        @wraps(view_func)
+        def marked(*args, **kwargs):
+            try:
+                return view_func(*args, **kwargs)
+            finally:
+                _mark_view_returned()
+
+    return marked
+
+
+def _mark_view_returned():
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.view_returned = time.perf_counter()
+
+
+class InstrumentedRouter(Router):
+    def add_api_operation(self, path, methods, view_func, **kwargs):
+        return super().add_api_operation(path, methods, mark_view_returned(view_func), **kwargs)
+
+
+class InstrumentedNinjaAPI(NinjaAPI):
+    """
+    ``NinjaAPI`` timing the validation and rendering of every operation's
+    result as serialization, from the view returning to the response.
+    Views returning an ``HttpResponse`` time their own, see serializers.py.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("default_router", InstrumentedRouter())
+        super().__init__(**kwargs)
+
+    def create_response(self, request, data, **kwargs):
+        response = super().create_response(request, data, **kwargs)
+        metrics = _current.get()
+        if metrics is not None and metrics.view_returned is not None:
+            metrics.serialize_time += time.perf_counter() - metrics.view_returned
+            metrics.view_returned = None
+        return response
+
+
+def assert_query_budget(response, queries=None):
+    """
+    Test helper: fails when the request behind ``response`` (from Django's
+    test client) ran more queries than ``queries``, or than the budget its
+    endpoint declares with ``@query_budget``.
+    """
+    metrics = getattr(response, "request_metrics", None)
+    if metrics is None:
+        raise AssertionError("The response was not recorded, is metrics_middleware installed?")
+    budget = metrics.budget if queries is None else queries
+    if budget is None:
+        raise AssertionError(f"No query budget declared for {metrics.route}")
+    if metrics.queries > budget:
+        raise QueryBudgetExceeded(
+            f"{metrics.route} ran {metrics.queries} queries, its budget is {budget}")
+    return metrics
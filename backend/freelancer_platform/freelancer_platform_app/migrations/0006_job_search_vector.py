@@ -0,0 +1,60 @@
+# Generated by Django 4.2.17 on 2026-10-18 12:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Keep in sync with the weights in freelancer_platform_app/search.py
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION freelancer_platform_app_job_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.info, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER job_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, info, description, search_vector
+    ON freelancer_platform_app_job
+    FOR EACH ROW EXECUTE FUNCTION freelancer_platform_app_job_search_vector();
+
+UPDATE freelancer_platform_app_job SET search_vector = NULL;
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS job_search_vector_update ON freelancer_platform_app_job;
+DROP FUNCTION IF EXISTS freelancer_platform_app_job_search_vector();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_TRIGGER_SQL)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0005_job_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+        ),
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.17 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0007_job_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['job', 'id'], name='chat_job_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['job', 'sender', 'receiver', 'id'], name='chat_conversation_idx'),
+        ),
+    ]
@@ -0,0 +1,151 @@
+# Generated by Django 4.2.17 on 2026-10-18 12:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Keeps freelancer_platform_app_freelancerstats in step with completed jobs,
+# whichever process changes the job row (the chain worker writes raw SQL).
+CREATE_POSTGRES_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION freelancer_platform_app_job_freelancer_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'COMPLETED' AND OLD.freelancer_id IS NOT NULL THEN
+        UPDATE freelancer_platform_app_freelancerstats
+        SET completed_jobs_count = completed_jobs_count - 1,
+            total_earned = total_earned - OLD.amount
+        WHERE freelancer_id = OLD.freelancer_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'COMPLETED' AND NEW.freelancer_id IS NOT NULL THEN
+        INSERT INTO freelancer_platform_app_freelancerstats
+            (freelancer_id, completed_jobs_count, total_earned, last_completed_at)
+        VALUES (NEW.freelancer_id, 1, NEW.amount, NEW.updated_at)
+        ON CONFLICT (freelancer_id) DO UPDATE SET
+            completed_jobs_count = freelancer_platform_app_freelancerstats.completed_jobs_count + 1,
+            total_earned = freelancer_platform_app_freelancerstats.total_earned + EXCLUDED.total_earned,
+            last_completed_at = GREATEST(freelancer_platform_app_freelancerstats.last_completed_at,
+                                         EXCLUDED.last_completed_at);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER job_freelancer_stats_insert_delete
+    AFTER INSERT OR DELETE ON freelancer_platform_app_job
+    FOR EACH ROW EXECUTE FUNCTION freelancer_platform_app_job_freelancer_stats();
+
+CREATE TRIGGER job_freelancer_stats_update
+    AFTER UPDATE OF status, freelancer_id, amount ON freelancer_platform_app_job
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status
+          OR OLD.freelancer_id IS DISTINCT FROM NEW.freelancer_id
+          OR OLD.amount IS DISTINCT FROM NEW.amount)
+    EXECUTE FUNCTION freelancer_platform_app_job_freelancer_stats();
+"""
+
+DROP_POSTGRES_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS job_freelancer_stats_insert_delete ON freelancer_platform_app_job;
+DROP TRIGGER IF EXISTS job_freelancer_stats_update ON freelancer_platform_app_job;
+DROP FUNCTION IF EXISTS freelancer_platform_app_job_freelancer_stats();
+"""
+
+# SQLite (local development) has no procedural triggers, one statement each
+SQLITE_DECREMENT_SQL = """
+UPDATE freelancer_platform_app_freelancerstats
+SET completed_jobs_count = completed_jobs_count - 1,
+    total_earned = total_earned - OLD.amount
+WHERE freelancer_id = OLD.freelancer_id AND OLD.status = 'COMPLETED';
+"""
+
+SQLITE_INCREMENT_SQL = """
+INSERT INTO freelancer_platform_app_freelancerstats
+    (freelancer_id, completed_jobs_count, total_earned, last_completed_at)
+SELECT NEW.freelancer_id, 1, NEW.amount, NEW.updated_at
+WHERE NEW.status = 'COMPLETED' AND NEW.freelancer_id IS NOT NULL
+ON CONFLICT (freelancer_id) DO UPDATE SET
+    completed_jobs_count = completed_jobs_count + 1,
+    total_earned = total_earned + excluded.total_earned,
+    last_completed_at = max(coalesce(last_completed_at, excluded.last_completed_at),
+                            excluded.last_completed_at);
+"""
+
+SQLITE_TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER job_freelancer_stats_insert AFTER INSERT ON freelancer_platform_app_job
+    BEGIN {SQLITE_INCREMENT_SQL} END;
+    """,
+    f"""
+    CREATE TRIGGER job_freelancer_stats_delete AFTER DELETE ON freelancer_platform_app_job
+    BEGIN {SQLITE_DECREMENT_SQL} END;
+    """,
+    f"""
+    CREATE TRIGGER job_freelancer_stats_update
+    AFTER UPDATE OF status, freelancer_id, amount ON freelancer_platform_app_job
+    WHEN OLD.status IS NOT NEW.status
+        OR OLD.freelancer_id IS NOT NEW.freelancer_id
+        OR OLD.amount IS NOT NEW.amount
+    BEGIN {SQLITE_DECREMENT_SQL} {SQLITE_INCREMENT_SQL} END;
+    """,
+]
+
+SQLITE_DROP_TRIGGER_SQL = [
+    "DROP TRIGGER IF EXISTS job_freelancer_stats_insert;",
+    "DROP TRIGGER IF EXISTS job_freelancer_stats_delete;",
+    "DROP TRIGGER IF EXISTS job_freelancer_stats_update;",
+]
+
+
+def create_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(CREATE_POSTGRES_TRIGGER_SQL)
+    elif vendor == "sqlite":
+        for sql in SQLITE_TRIGGER_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(DROP_POSTGRES_TRIGGER_SQL)
+    elif vendor == "sqlite":
+        for sql in SQLITE_DROP_TRIGGER_SQL:
+            schema_editor.execute(sql)
+
+
+def backfill_stats(apps, schema_editor):
+    Job = apps.get_model("freelancer_platform_app", "Job")
+    FreelancerStats = apps.get_model("freelancer_platform_app", "FreelancerStats")
+    rows = (
+        Job.objects.filter(status="COMPLETED", freelancer__isnull=False)
+        .values("freelancer_id")
+        .annotate(count=models.Count("id"), earned=models.Sum("amount"),
+                  last=models.Max("updated_at"))
+    )
+    FreelancerStats.objects.bulk_create([
+        FreelancerStats(freelancer_id=row["freelancer_id"], completed_jobs_count=row["count"],
+                        total_earned=row["earned"] or 0, last_completed_at=row["last"])
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0009_stored_file_upload_session'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FreelancerStats',
+            fields=[
+                ('freelancer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='freelancer_platform_app.webthreeuser')),
+                ('completed_jobs_count', models.IntegerField(default=0)),
+                ('total_earned', models.DecimalField(decimal_places=0, default=0, max_digits=40)),
+                ('last_completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-completed_jobs_count', 'freelancer'], name='stats_completed_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.17 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0010_freelancer_stats'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_completed_freelancer_idx',
+        ),
+        migrations.AddField(
+            model_name='webthreeuser',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'COMPLETED')), fields=['freelancer', '-created_at', '-id'], name='job_completed_freelancer_idx'),
+        ),
+    ]
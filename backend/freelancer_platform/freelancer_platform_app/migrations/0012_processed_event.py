@@ -0,0 +1,37 @@
+# Generated by Django 4.2.17 on 2026-10-18 12:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0011_resume_versioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessedEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(default='crawl_onchain', max_length=255)),
+                ('block', models.BigIntegerField()),
+                ('transaction_hash', models.CharField(max_length=66)),
+                ('log_index', models.IntegerField()),
+                ('position', models.BigIntegerField()),
+                ('event_name', models.CharField(max_length=50)),
+                ('applied', models.BooleanField(default=False)),
+                ('previous', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='processed_events', to='freelancer_platform_app.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key', '-block'], name='processed_event_block_idx'), models.Index(fields=['job', '-position'], name='processed_event_job_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='processedevent',
+            constraint=models.UniqueConstraint(fields=('block', 'transaction_hash', 'log_index'), name='processed_event_unique'),
+        ),
+    ]
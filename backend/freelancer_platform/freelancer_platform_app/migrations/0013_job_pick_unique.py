@@ -0,0 +1,26 @@
+# Generated by Django 4.2.17 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+# Keeps the first pick of every duplicated (job, freelancer) pair
+DELETE_DUPLICATE_PICKS = """
+DELETE FROM freelancer_platform_app_jobpick
+WHERE id NOT IN (
+    SELECT MIN(id) FROM freelancer_platform_app_jobpick GROUP BY job_id, freelancer_id
+)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0012_processed_event'),
+    ]
+
+    operations = [
+        migrations.RunSQL(DELETE_DUPLICATE_PICKS, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='jobpick',
+            constraint=models.UniqueConstraint(fields=('job', 'freelancer'), name='job_pick_unique'),
+        ),
+    ]
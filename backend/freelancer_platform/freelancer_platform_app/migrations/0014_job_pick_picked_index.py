@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-18 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0013_job_pick_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobpick',
+            index=models.Index(fields=['job', '-picked_at', '-id'], name='job_pick_job_picked_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-18 12:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0014_job_pick_picked_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dispute',
+            index=models.Index(fields=['resolved', 'created_at', 'id'], name='dispute_resolved_created_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.17 on 2026-10-18 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0015_dispute_resolved_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processedevent',
+            name='args',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddIndex(
+            model_name='processedevent',
+            index=models.Index(condition=models.Q(('applied', False)), fields=['key', 'position'], name='processed_event_pending_idx'),
+        ),
+    ]
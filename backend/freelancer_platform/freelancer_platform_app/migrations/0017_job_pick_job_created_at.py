@@ -0,0 +1,36 @@
+# Generated by Django 4.2.17 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0016_processed_event_args'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpick',
+            name='job_created_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE freelancer_platform_app_jobpick SET job_created_at = (
+                SELECT created_at FROM freelancer_platform_app_job
+                WHERE freelancer_platform_app_job.id = freelancer_platform_app_jobpick.job_id
+            )
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='jobpick',
+            name='job_created_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='jobpick',
+            index=models.Index(fields=['freelancer', '-job_created_at', '-job'], name='job_pick_freelancer_job_idx'),
+        ),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.17 on 2026-10-18 13:55
+
+from importlib import import_module
+
+from django.db import migrations
+
+# 0010 kept last_completed_at when a job left COMPLETED or was reassigned,
+# so it could point at a job the freelancer no longer has. It is now
+# recomputed from the completed jobs that remain.
+freelancer_stats = import_module("freelancer_platform_app.migrations.0010_freelancer_stats")
+
+LAST_COMPLETED_SQL = """(
+    SELECT max(updated_at) FROM freelancer_platform_app_job
+    WHERE freelancer_id = OLD.freelancer_id AND status = 'COMPLETED'
+)"""
+
+CREATE_POSTGRES_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION freelancer_platform_app_job_freelancer_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'COMPLETED' AND OLD.freelancer_id IS NOT NULL THEN
+        UPDATE freelancer_platform_app_freelancerstats
+        SET completed_jobs_count = completed_jobs_count - 1,
+            total_earned = total_earned - OLD.amount,
+            last_completed_at = {LAST_COMPLETED_SQL}
+        WHERE freelancer_id = OLD.freelancer_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'COMPLETED' AND NEW.freelancer_id IS NOT NULL THEN
+        INSERT INTO freelancer_platform_app_freelancerstats
+            (freelancer_id, completed_jobs_count, total_earned, last_completed_at)
+        VALUES (NEW.freelancer_id, 1, NEW.amount, NEW.updated_at)
+        ON CONFLICT (freelancer_id) DO UPDATE SET
+            completed_jobs_count = freelancer_platform_app_freelancerstats.completed_jobs_count + 1,
+            total_earned = freelancer_platform_app_freelancerstats.total_earned + EXCLUDED.total_earned,
+            last_completed_at = GREATEST(freelancer_platform_app_freelancerstats.last_completed_at,
+                                         EXCLUDED.last_completed_at);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+SQLITE_DECREMENT_SQL = f"""
+UPDATE freelancer_platform_app_freelancerstats
+SET completed_jobs_count = completed_jobs_count - 1,
+    total_earned = total_earned - OLD.amount,
+    last_completed_at = {LAST_COMPLETED_SQL}
+WHERE freelancer_id = OLD.freelancer_id AND OLD.status = 'COMPLETED';
+"""
+
+SQLITE_TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER job_freelancer_stats_insert AFTER INSERT ON freelancer_platform_app_job
+    BEGIN {freelancer_stats.SQLITE_INCREMENT_SQL} END;
+    """,
+    f"""
+    CREATE TRIGGER job_freelancer_stats_delete AFTER DELETE ON freelancer_platform_app_job
+    BEGIN {SQLITE_DECREMENT_SQL} END;
+    """,
+    f"""
+    CREATE TRIGGER job_freelancer_stats_update
+    AFTER UPDATE OF status, freelancer_id, amount ON freelancer_platform_app_job
+    WHEN OLD.status IS NOT NEW.status
+        OR OLD.freelancer_id IS NOT NEW.freelancer_id
+        OR OLD.amount IS NOT NEW.amount
+    BEGIN {SQLITE_DECREMENT_SQL} {freelancer_stats.SQLITE_INCREMENT_SQL} END;
+    """,
+]
+
+
+# Rows left stale by the old triggers
+RECOMPUTE_LAST_COMPLETED_SQL = """
+UPDATE freelancer_platform_app_freelancerstats SET last_completed_at = (
+    SELECT max(updated_at) FROM freelancer_platform_app_job
+    WHERE freelancer_id = freelancer_platform_app_freelancerstats.freelancer_id
+        AND status = 'COMPLETED'
+)
+"""
+
+
+def replace_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        # The triggers call the function by name and pick up the new body
+        schema_editor.execute(CREATE_POSTGRES_FUNCTION_SQL)
+    elif vendor == "sqlite":
+        freelancer_stats.drop_triggers(apps, schema_editor)
+        for sql in SQLITE_TRIGGER_SQL:
+            schema_editor.execute(sql)
+    schema_editor.execute(RECOMPUTE_LAST_COMPLETED_SQL)
+
+
+def restore_triggers(apps, schema_editor):
+    freelancer_stats.drop_triggers(apps, schema_editor)
+    freelancer_stats.create_triggers(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer_platform_app', '0017_job_pick_job_created_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(replace_triggers, restore_triggers),
+    ]
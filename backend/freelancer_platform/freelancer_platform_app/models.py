@@ -1,7 +1,10 @@
-import random
-import time
+import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
+from .ids import next_job_id
+
 
 class WebThreeUser(models.Model):
     username = models.CharField(
@@ -9,6 +12,7 @@ class WebThreeUser(models.Model):
     email = models.EmailField(unique=True, blank=True, null=True)
     is_active = models.BooleanField(default=True)
     date_joined = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     wallet_address = models.CharField(max_length=255, unique=True)
     name = models.CharField(max_length=255, blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
@@ -81,12 +85,37 @@ class Job(models.Model):
         related_name="jobs"
     )
 
+    # Maintained by a database trigger on PostgreSQL, see search.py
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order used by every job list endpoint
+            models.Index(fields=["-created_at", "-id"],
+                         name="job_created_id_idx"),
+            GinIndex(fields=["search_vector"], name="job_search_vector_idx"),
+            # Filtered job lists, same order as above
+            models.Index(fields=["status", "-created_at", "-id"],
+                         name="job_status_created_idx"),
+            models.Index(fields=["job_type", "-created_at", "-id"],
+                         name="job_type_created_idx"),
+            models.Index(fields=["client", "-created_at", "-id"],
+                         name="job_client_created_idx"),
+            models.Index(fields=["freelancer", "-created_at", "-id"],
+                         name="job_freelancer_created_idx"),
+            # /jobs/newest
+            models.Index(fields=["-created_at"],
+                         condition=~models.Q(status="NEW"),
+                         name="job_not_new_created_idx"),
+            # Completed projects listed on public resumes
+            models.Index(fields=["freelancer", "-created_at", "-id"],
+                         condition=models.Q(status="COMPLETED"),
+                         name="job_completed_freelancer_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.id:
-            timestamp = int(time.time())
-            random_number = random.randint(
-                10000, 99999)
-            self.id = int(f"{timestamp}{random_number}")
+            self.id = next_job_id()
         super(Job, self).save(*args, **kwargs)
 
     def __str__(self):
@@ -106,8 +135,14 @@ class Dispute(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # The resolver queue: open (or resolved) disputes, oldest first
+            models.Index(fields=["resolved", "created_at", "id"], name="dispute_resolved_created_idx"),
+        ]
+
     def __str__(self):
-        return f"Dispute for Job #{self.job.id}"
+        return f"Dispute for Job #{self.job_id}"
 
 
 class PlatformSettings(models.Model):
@@ -119,9 +154,9 @@ class PlatformSettings(models.Model):
 
     @staticmethod
     def get_platform_fee():
-        fee_setting = PlatformSettings.objects.filter(
-            key="platform_fee").first()
-        return float(fee_setting.value) if fee_setting else 2.0
+        # Served from the cached snapshot, see platform_settings.py
+        from .platform_settings import get_platform_fee
+        return get_platform_fee()
 
 
 class LastIndexCrawl(models.Model):
@@ -134,6 +169,43 @@ class LastIndexCrawl(models.Model):
         return f"{self.key}: {self.value}"
 
 
+class ProcessedEvent(models.Model):
+    """
+    A contract event the crawler has handled, so replays skip it and recent
+    blocks can be rolled back after a reorg.
+    """
+    key = models.CharField(max_length=255, default="crawl_onchain")
+    block = models.BigIntegerField()
+    transaction_hash = models.CharField(max_length=66)
+    log_index = models.IntegerField()
+    # ``block`` and ``log_index`` as one sortable number
+    position = models.BigIntegerField()
+    event_name = models.CharField(max_length=50)
+    job = models.ForeignKey(
+        Job, on_delete=models.CASCADE, related_name="processed_events", null=True, blank=True)
+    applied = models.BooleanField(default=False)
+    # The event's arguments, to apply it once its job and wallet are known
+    args = models.JSONField(default=dict)
+    # Job fields the event overwrote, with their previous values
+    previous = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["block", "transaction_hash", "log_index"],
+                                    name="processed_event_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["key", "-block"], name="processed_event_block_idx"),
+            models.Index(fields=["job", "-position"], name="processed_event_job_idx"),
+            models.Index(fields=["key", "position"], condition=models.Q(applied=False),
+                         name="processed_event_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_name} at {self.block}:{self.log_index}"
+
+
 class JobPick(models.Model):
     job = models.ForeignKey(
         Job, on_delete=models.CASCADE, related_name="picks")
@@ -141,6 +213,29 @@ class JobPick(models.Model):
         WebThreeUser, on_delete=models.CASCADE, related_name="picked_jobs")
     # Timestamp for when the job was picked
     picked_at = models.DateTimeField(auto_now_add=True)
+    # The job's created_at, so a freelancer's picks can be paged in the
+    # order of their jobs without joining and sorting all of them
+    job_created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            # Also serves the "did this freelancer pick the job" lookups
+            models.UniqueConstraint(fields=["job", "freelancer"],
+                                    name="job_pick_unique"),
+        ]
+        indexes = [
+            # Applicants of a job, newest first, keyset paginated
+            models.Index(fields=["job", "-picked_at", "-id"],
+                         name="job_pick_job_picked_idx"),
+            # Jobs a freelancer picked, newest job first, keyset paginated
+            models.Index(fields=["freelancer", "-job_created_at", "-job"],
+                         name="job_pick_freelancer_job_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.job_created_at is None:
+            self.job_created_at = self.job.created_at
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Freelancer {self.freelancer.username} picked Job #{self.job.id}"
@@ -156,5 +251,66 @@ class ChatMessage(models.Model):
     content = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Ids follow insertion (timestamp) order and double as the
+            # since_id/before_id cursor of the chat endpoint
+            models.Index(fields=["job", "id"], name="chat_job_id_idx"),
+            models.Index(fields=["job", "sender", "receiver", "id"],
+                         name="chat_conversation_idx"),
+        ]
+
     def __str__(self):
         return f"Message from {self.sender.username} to {self.receiver.username} for Job #{self.job.id}"
+
+
+class StoredFile(models.Model):
+    """
+    One row per distinct uploaded content, used to deduplicate uploads.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file_name = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    content_type = models.CharField(max_length=255, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.sha256})"
+
+
+class UploadSession(models.Model):
+    """
+    A resumable upload whose chunks are appended to a partial file.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=255, blank=True, null=True)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Upload {self.id}: {self.received}/{self.size}"
+
+
+class FreelancerStats(models.Model):
+    """
+    Completed-job totals per freelancer, kept current by database triggers
+    on the job table (migration 0010). ``manage.py rebuild_leaderboard``
+    recomputes them from scratch.
+    """
+    freelancer = models.OneToOneField(
+        WebThreeUser, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    completed_jobs_count = models.IntegerField(default=0)
+    total_earned = models.DecimalField(max_digits=40, decimal_places=0, default=0)
+    last_completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-completed_jobs_count", "freelancer"],
+                         name="stats_completed_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.freelancer_id}: {self.completed_jobs_count} completed jobs"
@@ -0,0 +1,109 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import Q
+from ninja.errors import HttpError
+
+NEXT = "next"
+PREV = "prev"
+
+
+def encode_cursor(timestamp, pk, direction):
+    raw = json.dumps([timestamp.isoformat(), pk, direction])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, pk, direction = json.loads(
+            base64.urlsafe_b64decode(padded.encode()))
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return datetime.fromisoformat(timestamp), int(pk), direction
+    except (ValueError, TypeError):
+        raise HttpError(400, "Invalid cursor")
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    if not limit:
+        return settings.API_PAGE_SIZE
+    return max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+
+
+def page_query(queryset, cursor, limit, field="created_at", oldest_first=False, pk="id"):
+    """
+    Returns ``queryset`` filtered past the cursor, ordered and sliced to
+    ``limit + 1`` rows, and the direction walked. ``limit`` must be clamped.
+    ``pk`` names the field the cursor's id is compared with.
+    """
+    direction = NEXT
+    if cursor:
+        timestamp, cursor_pk, direction = decode_cursor(cursor)
+    # Walking backwards through a list reads it in the opposite order, the
+    # page is reversed afterwards
+    descending = (direction == NEXT) != oldest_first
+    if cursor:
+        lookup = "lt" if descending else "gt"
+        queryset = queryset.filter(
+            Q(**{f"{field}__{lookup}": timestamp}) | Q(**{field: timestamp, f"{pk}__{lookup}": cursor_pk}))
+
+    if descending:
+        return queryset.order_by(f"-{field}", f"-{pk}")[:limit + 1], direction
+    return queryset.order_by(field, pk)[:limit + 1], direction
+
+
+def _cursor_fields(row, field):
+    # Rows are model instances or, for ``.values()`` querysets, dicts
+    if isinstance(row, dict):
+        return row[field], row["id"]
+    return getattr(row, field), row.id
+
+
+def _page_rows(rows, response, cursor, limit, direction, field):
+    if direction == NEXT:
+        has_next = len(rows) > limit
+        has_prev = cursor is not None
+        rows = rows[:limit]
+    else:
+        has_prev = len(rows) > limit
+        has_next = True
+        rows = rows[:limit][::-1]
+
+    if rows and has_next:
+        response["X-Next-Cursor"] = encode_cursor(*_cursor_fields(rows[-1], field), NEXT)
+    if rows and has_prev:
+        response["X-Prev-Cursor"] = encode_cursor(*_cursor_fields(rows[0], field), PREV)
+    return rows
+
+
+def paginate_keyset(queryset, response, cursor: Optional[str] = None, limit: Optional[int] = None,
+                    field: str = "created_at", oldest_first: bool = False):
+    """
+    Returns one page of ``queryset`` ordered by ``(-created_at, -id)``, or
+    by another timestamp ``field`` in place of ``created_at``, oldest first
+    with ``oldest_first``.
+
+    Rows are located by comparing against the cursor's ``(created_at, id)``
+    pair instead of an OFFSET, so deep pages cost the same as the first one
+    and rows inserted meanwhile never shift the page boundaries. Opaque
+    cursors for the neighbouring pages are set on the ``X-Next-Cursor`` and
+    ``X-Prev-Cursor`` response headers.
+    """
+    limit = clamp_page_size(limit)
+    page, direction = page_query(queryset, cursor, limit, field, oldest_first)
+    return _page_rows(list(page), response, cursor, limit, direction, field)
+
+
+async def apaginate_keyset(queryset, response, cursor: Optional[str] = None, limit: Optional[int] = None,
+                           field: str = "created_at", oldest_first: bool = False):
+    """
+    Async variant of ``paginate_keyset`` for async views.
+    """
+    limit = clamp_page_size(limit)
+    page, direction = page_query(queryset, cursor, limit, field, oldest_first)
+    rows = [row async for row in page]
+    return _page_rows(rows, response, cursor, limit, direction, field)
@@ -0,0 +1,115 @@
+from django.db import connection
+from django.db.models import (
+    Case, CharField, Exists, F, Func, IntegerField, OuterRef, Q, Subquery, Value, When,
+)
+from django.utils import timezone
+
+from .models import Job, JobPick
+from .pagination import clamp_page_size, page_query
+from .response_cache import invalidate_model
+
+PICKED = "picked"
+ALREADY_PICKED = "already_picked"
+ASSIGNED = "assigned"
+
+# Looks the job up, inserts the pick unless the user is the assigned
+# freelancer, and reports which of these happened, in one round-trip
+PICK_JOB_SQL = """
+WITH job AS (
+    SELECT id, title, freelancer_id, created_at FROM freelancer_platform_app_job
+    WHERE id = %(job_id)s
+), pick AS (
+    INSERT INTO freelancer_platform_app_jobpick (job_id, freelancer_id, picked_at, job_created_at)
+    SELECT id, %(user_id)s, %(now)s, created_at FROM job
+    WHERE freelancer_id IS DISTINCT FROM %(user_id)s
+    ON CONFLICT (job_id, freelancer_id) DO NOTHING
+    RETURNING id
+)
+SELECT title, freelancer_id, EXISTS (SELECT 1 FROM pick) FROM job
+"""
+
+INSERT_PICK_SQL = """
+INSERT INTO freelancer_platform_app_jobpick (job_id, freelancer_id, picked_at, job_created_at)
+VALUES (%s, %s, %s, %s)
+ON CONFLICT (job_id, freelancer_id) DO NOTHING
+"""
+
+
+def pick_job(job_id, user_id):
+    """
+    Records that ``user_id`` picked the job and returns ``(title, outcome)``,
+    the outcome being ``PICKED``, ``ALREADY_PICKED`` or ``ASSIGNED`` (the
+    user is the job's freelancer already). Raises ``Job.DoesNotExist``.
+
+    Concurrent picks by the same user are settled by the unique constraint
+    on ``(job, freelancer)``: exactly one of them reports ``PICKED``.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(PICK_JOB_SQL, {"job_id": job_id, "user_id": user_id, "now": timezone.now()})
+            row = cursor.fetchone()
+        if row is None:
+            raise Job.DoesNotExist(f"Job {job_id} does not exist")
+        title, freelancer_id, inserted = row
+        if freelancer_id == user_id:
+            return title, ASSIGNED
+    else:
+        # SQLite cannot insert from a WITH clause, look the job up first
+        job = Job.objects.only("title", "freelancer_id", "created_at").get(id=job_id)
+        if job.freelancer_id == user_id:
+            return job.title, ASSIGNED
+        with connection.cursor() as cursor:
+            cursor.execute(INSERT_PICK_SQL, [
+                job_id, user_id, connection.ops.adapt_datetimefield_value(timezone.now()),
+                connection.ops.adapt_datetimefield_value(job.created_at)])
+            inserted = cursor.rowcount
+        title = job.title
+
+    if not inserted:
+        return title, ALREADY_PICKED
+    # Inserted without post_save, and cached job responses carry picks_count
+    invalidate_model(JobPick)
+    return title, PICKED
+
+
+def with_picks_count(jobs):
+    """
+    Annotates ``picks_count`` on ``jobs``. The count is a correlated
+    subquery answered from the ``(job, freelancer)`` unique index, so a
+    page of jobs still takes a single query.
+    """
+    picks = JobPick.objects.filter(job=OuterRef("pk")).order_by().annotate(
+        count=Func(F("id"), function="COUNT")).values("count")
+    return jobs.annotate(picks_count=Subquery(picks, output_field=IntegerField()))
+
+
+def freelancer_jobs(user_id, cursor=None, limit=None):
+    """
+    Jobs ``user_id`` is assigned to or picked, for keyset pagination by
+    ``(-created_at, -id)`` with the same ``cursor`` and ``limit``. Each job
+    has a ``relation`` of ``ASSIGNED`` or ``PICKED``.
+
+    Filtering the whole table by "assigned or picked" walks the newest jobs
+    until a page is found, which for a user with few jobs is all of them.
+    Instead the page is taken from the user's assigned jobs (through
+    ``job_freelancer_created_idx``) and from their picks (through
+    ``job_pick_freelancer_job_idx``, which carries each job's
+    ``created_at``) separately, and the query keeps the newest of both, so
+    a page costs the same at any depth and table size.
+    """
+    if connection.features.supports_slicing_ordering_in_compound:
+        limit = clamp_page_size(limit)
+        assigned, _ = page_query(Job.objects.filter(freelancer_id=user_id), cursor, limit)
+        picked, _ = page_query(JobPick.objects.filter(freelancer_id=user_id), cursor, limit,
+                               field="job_created_at", pk="job_id")
+        jobs = Job.objects.filter(id__in=assigned.values("id").union(picked.values("job_id")))
+    else:
+        # SQLite cannot slice the parts of a UNION
+        jobs = Job.objects.filter(
+            Q(freelancer_id=user_id)
+            | Exists(JobPick.objects.filter(job=OuterRef("pk"), freelancer_id=user_id)))
+    return jobs.annotate(relation=Case(
+        When(freelancer_id=user_id, then=Value(ASSIGNED)),
+        default=Value(PICKED),
+        output_field=CharField(),
+    ))
@@ -0,0 +1,187 @@
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+from types import MappingProxyType
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import PlatformSettings
+
+DEFAULT_PLATFORM_FEE = 2.0
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+class SettingsSnapshot:
+    """
+    Read-only copy of every ``PlatformSettings`` row, with typed accessors.
+    Snapshots are shared between threads and never modified; a change
+    replaces the whole snapshot.
+
+    Values that are missing or do not convert return ``default``, so a bad
+    edit in the admin never breaks the code reading it.
+    """
+
+    __slots__ = ("values", "version", "platform_fee")
+
+    def __init__(self, values, version):
+        self.values = MappingProxyType(dict(values))
+        self.version = version
+        # Read on every priced request, convert it once
+        self.platform_fee = self.get_float("platform_fee", DEFAULT_PLATFORM_FEE)
+
+    def get_str(self, key, default=None):
+        return self.values.get(key, default)
+
+    def _convert(self, key, default, convert):
+        value = self.values.get(key)
+        if value is None:
+            return default
+        try:
+            return convert(value.strip())
+        except (ValueError, InvalidOperation):
+            return default
+
+    def get_int(self, key, default=None):
+        return self._convert(key, default, int)
+
+    def get_float(self, key, default=None):
+        return self._convert(key, default, float)
+
+    def get_decimal(self, key, default=None):
+        return self._convert(key, default, Decimal)
+
+    def get_bool(self, key, default=None):
+        value = self.values.get(key, "").strip().lower()
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        return default
+
+
+class SettingsNotifier:
+    """
+    Tells every process that ``PlatformSettings`` changed.
+
+    Subclass this to reach other processes, e.g. over Redis pub/sub, and
+    point ``settings.PLATFORM_SETTINGS_NOTIFIER`` at it.
+    """
+
+    def publish(self):
+        raise NotImplementedError
+
+    def subscribe(self, callback):
+        """
+        Calls ``callback()`` on every change published by any process.
+        """
+        raise NotImplementedError
+
+
+class LocalSettingsNotifier(SettingsNotifier):
+    """
+    In-process notifier; other processes pick changes up once their
+    snapshot is ``PLATFORM_SETTINGS_TTL`` seconds old.
+    """
+
+    def __init__(self):
+        self._callbacks = []
+
+    def publish(self):
+        for callback in list(self._callbacks):
+            callback()
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+
+
+class SettingsStore:
+    """
+    Holds the current ``SettingsSnapshot`` of this process.
+
+    The snapshot is loaded on first use and again after a change
+    notification or ``ttl`` seconds; every other read is an attribute
+    lookup. Each invalidation bumps ``version``, and a load that raced
+    with one is served but not kept.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.version = 0
+        self._snapshot = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def _current(self):
+        snapshot = self._snapshot
+        if snapshot is not None and self._expires > time.monotonic():
+            return snapshot
+        return None
+
+    def _store(self, values, version):
+        snapshot = SettingsSnapshot(values, version)
+        with self._lock:
+            if version == self.version:
+                self._snapshot = snapshot
+                self._expires = time.monotonic() + self.ttl
+        return snapshot
+
+    def get(self):
+        snapshot = self._current()
+        if snapshot is None:
+            version = self.version
+            snapshot = self._store(
+                PlatformSettings.objects.values_list("key", "value"), version)
+        return snapshot
+
+    async def aget(self):
+        snapshot = self._current()
+        if snapshot is None:
+            snapshot = await sync_to_async(self.get)()
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._snapshot = None
+
+
+settings_store = SettingsStore(ttl=settings.PLATFORM_SETTINGS_TTL)
+
+_notifier = None
+
+
+def get_notifier():
+    global _notifier
+    if _notifier is None:
+        _notifier = import_string(settings.PLATFORM_SETTINGS_NOTIFIER)()
+        _notifier.subscribe(settings_store.invalidate)
+    return _notifier
+
+
+def get_settings():
+    return settings_store.get()
+
+
+async def aget_settings():
+    return await settings_store.aget()
+
+
+def get_platform_fee():
+    """
+    The platform fee in percent, from this process's snapshot.
+    """
+    return settings_store.get().platform_fee
+
+
+@receiver(post_save, sender=PlatformSettings)
+@receiver(post_delete, sender=PlatformSettings)
+def publish_settings_change(sender, **kwargs):
+    # Until the commit other connections would load the old values again
+    transaction.on_commit(get_notifier().publish)
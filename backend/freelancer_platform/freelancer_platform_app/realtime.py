@@ -0,0 +1,270 @@
+import asyncio
+import contextlib
+import json
+import logging
+import re
+import select
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import parse_qs
+
+import psycopg2
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.module_loading import import_string
+from ninja.errors import HttpError
+
+from .auth import decode_jwt_token
+from .chat import has_chat_access, in_conversation, job_channel
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class Broker:
+    """
+    Fan-out of chat messages to subscribed sockets.
+
+    ``publish`` is called from views, ``subscribe`` from the socket's event
+    loop. ``settings.CHAT_BROKER`` names the class used.
+    """
+
+    def publish(self, channel, message):
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        """
+        Async context manager yielding an ``asyncio.Queue`` of messages.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Releases the broker's connections, e.g. at the end of a test.
+        """
+
+
+class LocalBroker(Broker):
+    """
+    In-process broker; only reaches sockets served by the same process.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # The subscriber's event loop has already been closed
+                pass
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, channel):
+        queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers[channel].add(subscriber)
+        try:
+            yield queue
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscriber)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Fans out to the sockets of every process over PostgreSQL LISTEN/NOTIFY.
+
+    Messages are sent with NOTIFY on one PostgreSQL channel; each process
+    keeps a thread LISTENing on it that hands them to its local subscribers.
+    Messages over the NOTIFY payload limit are not pushed, clients still
+    get them from ``GET /jobs/{job_id}/chat``.
+    """
+
+    notify_channel = "chat_broker"
+    # PostgreSQL refuses payloads of 8000 bytes or more
+    max_payload = 7999
+    poll_timeout = 5
+    reconnect_delay = 1
+
+    def __init__(self):
+        super().__init__()
+        self._publisher = None
+        self._publish_lock = threading.Lock()
+        self._listener = None
+        self._listener_lock = threading.Lock()
+        self._listening = threading.Event()
+        self._connection = None
+        self._closed = False
+
+    def _connect(self):
+        raw = psycopg2.connect(**connections[DEFAULT_DB_ALIAS].get_connection_params())
+        raw.autocommit = True
+        return raw
+
+    def publish(self, channel, message):
+        payload = json.dumps({"channel": channel, "message": message})
+        if len(payload.encode()) > self.max_payload:
+            logger.warning("Not pushing a %s message of %s bytes", channel, len(payload))
+            return
+        with self._publish_lock:
+            # Retried once on a fresh connection if the database went away
+            for attempt in range(2):
+                try:
+                    if self._publisher is None or self._publisher.closed:
+                        self._publisher = self._connect()
+                    with self._publisher.cursor() as cursor:
+                        cursor.execute("SELECT pg_notify(%s, %s)", [self.notify_channel, payload])
+                    return
+                except psycopg2.OperationalError:
+                    self._publisher = None
+                    if attempt:
+                        raise
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, channel):
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="chat-broker-listener", daemon=True)
+                self._listener.start()
+        async with super().subscribe(channel) as queue:
+            # Messages sent once the socket is accepted must reach it
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._listening.wait, self.poll_timeout)
+            yield queue
+
+    def _listen(self):
+        while not self._closed:
+            try:
+                raw = self._connection = self._connect()
+                try:
+                    with raw.cursor() as cursor:
+                        cursor.execute(f"LISTEN {self.notify_channel}")
+                    self._listening.set()
+                    while True:
+                        select.select([raw], [], [], self.poll_timeout)
+                        raw.poll()
+                        while raw.notifies:
+                            self._dispatch(raw.notifies.pop(0).payload)
+                finally:
+                    self._listening.clear()
+                    raw.close()
+            except psycopg2.Error:
+                if self._closed:
+                    return
+                logger.exception("Chat broker lost its connection, reconnecting")
+                time.sleep(self.reconnect_delay)
+
+    def close(self):
+        self._closed = True
+        with self._publish_lock:
+            if self._publisher is not None:
+                self._publisher.close()
+                self._publisher = None
+        if self._connection is not None:
+            # Wakes the listener up, which then stops
+            self._connection.close()
+        if self._listener is not None:
+            self._listener.join(self.poll_timeout)
+
+    def _dispatch(self, payload):
+        notification = json.loads(payload)
+        super().publish(notification["channel"], notification["message"])
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        broker_class = settings.CHAT_BROKER
+        if broker_class is None:
+            vendor = connections[DEFAULT_DB_ALIAS].vendor
+            broker_class = f"{__name__}.{'PostgresBroker' if vendor == 'postgresql' else 'LocalBroker'}"
+        _broker = import_string(broker_class)()
+    return _broker
+
+
+CHAT_PATH = re.compile(r"^/ws/jobs/(?P<job_id>\d+)/chat/?$")
+
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+CLOSE_NOT_FOUND = 4404
+
+
+def _check_access(job_id, user_id):
+    job = Job.objects.filter(id=job_id).first()
+    if job is None:
+        return CLOSE_NOT_FOUND
+    if not has_chat_access(job, user_id):
+        return CLOSE_FORBIDDEN
+    return None
+
+
+async def chat_socket(scope, receive, send):
+    """
+    ASGI WebSocket endpoint pushing new messages of a job's chat.
+
+    Connect to ``/ws/jobs/<job_id>/chat?token=<jwt>``, optionally with
+    ``user_A``/``user_B`` wallet addresses to follow a single conversation,
+    the same filters as ``GET /jobs/{job_id}/chat``. Each message is sent as
+    a JSON text frame; frames sent by the client are ignored.
+    """
+    match = CHAT_PATH.match(scope["path"])
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+    if match is None:
+        await send({"type": "websocket.close", "code": CLOSE_NOT_FOUND})
+        return
+
+    job_id = int(match.group("job_id"))
+    params = {key: values[0] for key, values in parse_qs(
+        scope.get("query_string", b"").decode()).items()}
+    try:
+        claims = decode_jwt_token(params.get("token", ""))
+    except HttpError:
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+
+    close_code = await sync_to_async(_check_access)(job_id, claims["user_id"])
+    if close_code is not None:
+        await send({"type": "websocket.close", "code": close_code})
+        return
+
+    user_A, user_B = params.get("user_A"), params.get("user_B")
+    async with get_broker().subscribe(job_channel(job_id)) as queue:
+        await send({"type": "websocket.accept"})
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+        try:
+            while True:
+                pushed = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {pushed, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if disconnected in done:
+                    pushed.cancel()
+                    return
+                payload = pushed.result()
+                if user_A and user_B and not in_conversation(payload, user_A, user_B):
+                    continue
+                await send({"type": "websocket.send", "text": json.dumps(payload)})
+        finally:
+            disconnected.cancel()
+
+
+async def _wait_for_disconnect(receive):
+    while True:
+        message = await receive()
+        if message["type"] == "websocket.disconnect":
+            return
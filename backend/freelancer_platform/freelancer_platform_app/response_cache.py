@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+from ninja.errors import ConfigError
+from ninja.utils import contribute_operation_callback
+
+
+class ResponseCacheBackend:
+    """
+    Storage of rendered responses. Subclass this to share them between
+    processes and point ``settings.RESPONSE_CACHE_BACKEND`` at it.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        """
+        Stores ``value`` for ``ttl`` seconds, or forever when ``ttl`` is None.
+        """
+        raise NotImplementedError
+
+    async def aget(self, key):
+        return await sync_to_async(self.get)(key)
+
+    async def aset(self, key, value, ttl):
+        await sync_to_async(self.set)(key, value, ttl)
+
+
+class LocalResponseCache(ResponseCacheBackend):
+    """
+    In-process LRU store; every process renders its own copy.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize or settings.RESPONSE_CACHE_SIZE
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    # Nothing blocks, no need for a thread
+    async def aget(self, key):
+        return self.get(key)
+
+    async def aset(self, key, value, ttl):
+        self.set(key, value, ttl)
+
+
+class DjangoResponseCache(ResponseCacheBackend):
+    """
+    Stores responses in Django's default cache, e.g. Redis when
+    ``REDIS_URL`` is set, so all processes share them.
+    """
+
+    def get(self, key):
+        return cache.get(f"response:{key}")
+
+    def set(self, key, value, ttl):
+        cache.set(f"response:{key}", value, ttl)
+
+    async def aget(self, key):
+        return await cache.aget(f"response:{key}")
+
+    async def aset(self, key, value, ttl):
+        await cache.aset(f"response:{key}", value, ttl)
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = import_string(settings.RESPONSE_CACHE_BACKEND)()
+    return _backend
+
+
+def generation_key(model):
+    return f"generation:{model._meta.label_lower}"
+
+
+def invalidate_model(sender, **kwargs):
+    # Entries embed the generation of every model they depend on, so a new
+    # generation makes them unreachable; they expire on their own
+    get_backend().set(generation_key(sender), uuid.uuid4().hex, None)
+
+
+def request_key(request):
+    query = urlencode(sorted(
+        (name, value) for name, values in request.GET.lists() for value in values))
+    return f"{request.path}?{query}"
+
+
+# Renders in progress per event loop, so concurrent misses on one key wait
+# for a single computation instead of all hitting the database
+_inflight = {}
+
+
+def cache_response(ttl, models=()):
+    """
+    Caches the rendered JSON of a public GET operation for ``ttl`` seconds.
+
+    Entries are keyed on the path and the sorted query parameters, and are
+    dropped when any of ``models`` is saved or deleted. Only 200 responses
+    are stored. Goes between ``@api.get`` and the function::
+
+        @api.get("/job-types", response=list[JobTypeSchema])
+        @cache_response(300, models=[JobType])
+        async def list_job_types(request):
+            ...
+
+    Hits are served before Ninja authenticates the request, so operations
+    with ``auth`` are refused with ``ConfigError``. Should one get ``auth``
+    later from its router or API, it is never served from the cache.
+    """
+    for model in models:
+        post_save.connect(invalidate_model, sender=model, weak=False,
+                          dispatch_uid=f"response_cache:{model._meta.label_lower}:save")
+        post_delete.connect(invalidate_model, sender=model, weak=False,
+                            dispatch_uid=f"response_cache:{model._meta.label_lower}:delete")
+
+    def decorator(operation):
+        if operation.auth_callbacks:
+            raise ConfigError(
+                f"cache_response would serve {operation.path} without authentication")
+        run = operation.run
+
+        @wraps(run)
+        async def cached_run(request, **kwargs):
+            if (request.method != "GET" or not settings.RESPONSE_CACHE_ENABLED
+                    or operation.auth_callbacks):
+                return await run(request, **kwargs)
+
+            backend = get_backend()
+            generations = [await backend.aget(generation_key(model)) for model in models]
+            key = ":".join([request_key(request), *(g or "0" for g in generations)])
+
+            cached = await backend.aget(key)
+            if cached is None:
+                loop = asyncio.get_running_loop()
+                future = _inflight.get((loop, key))
+                if future is not None:
+                    cached = await asyncio.shield(future)
+                else:
+                    future = loop.create_future()
+                    _inflight[(loop, key)] = future
+                    try:
+                        response = await run(request, **kwargs)
+                        if response.status_code == 200 and not response.streaming:
+                            cached = (response.content, list(response.items()))
+                            await backend.aset(key, cached, ttl)
+                    finally:
+                        future.set_result(cached)
+                        del _inflight[(loop, key)]
+                    if cached is None:
+                        return response
+                if cached is None:
+                    # The shared render failed or was not cacheable, do our own
+                    return await run(request, **kwargs)
+
+            content, headers = cached
+            response = HttpResponse(content)
+            for name, value in headers:
+                response[name] = value
+            return response
+
+        operation.run = cached_run
+
+    def contribute(view_func):
+        contribute_operation_callback(view_func, decorator)
+        return view_func
+
+    return contribute
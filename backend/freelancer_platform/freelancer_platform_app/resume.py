@@ -0,0 +1,111 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import FreelancerStats, Job
+from .pagination import apaginate_keyset
+
+# Public resumes are shared links, so rendered pages are cached under keys
+# that embed everything the page depends on. Stale entries are never read
+# again and simply expire.
+
+
+def generation_key(user_id):
+    return f"resume-generation:{user_id}"
+
+
+def bump_generation(user_id):
+    cache.set(generation_key(user_id), uuid.uuid4().hex, None)
+
+
+def get_stats(user):
+    try:
+        return user.stats
+    except FreelancerStats.DoesNotExist:
+        return FreelancerStats(freelancer=user)
+
+
+def resume_version(user, stats, generation, cursor, limit):
+    """
+    Fingerprint of one resume page. Profile edits move ``user.updated_at``
+    and completed job transitions, which the database triggers record in
+    ``FreelancerStats``, move the stats, whichever process made them.
+    Job edits that leave the stats alone bump the cached generation.
+    """
+    raw = ":".join(str(part) for part in (
+        user.id, user.updated_at.timestamp(), stats.completed_jobs_count,
+        stats.total_earned, stats.last_completed_at, generation, cursor, limit))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def serialize_project(project):
+    return {
+        "id": project.id,
+        "title": project.title,
+        "amount": float(project.amount),
+        "description": project.description,
+        "completed_at": project.updated_at.isoformat(),
+    }
+
+
+def completed_projects_query(user):
+    return Job.objects.filter(freelancer=user, status="COMPLETED")
+
+
+async def build_resume(user, stats, cursor, limit):
+    """
+    Returns the resume body and the pagination headers of its
+    ``completed_projects`` page.
+    """
+    headers = {}
+    projects = await apaginate_keyset(completed_projects_query(user), headers, cursor, limit)
+    body = {
+        "id": user.id,
+        "username": user.username,
+        "name": user.name,
+        "email": user.email,
+        "bio": user.bio,
+        "image": user.image,
+        "wallet_address": user.wallet_address,
+        "date_joined": user.date_joined.isoformat(),
+        "social_links": {
+            "facebook": user.facebook,
+            "twitter": user.twitter,
+            "linkedin": user.linkedin,
+            "github": user.github,
+            "instagram": user.instagram,
+        },
+        "completed_projects": [serialize_project(p) for p in projects],
+        "completed_projects_count": stats.completed_jobs_count,
+        "total_income": float(stats.total_earned),
+    }
+    return body, headers
+
+
+async def aresume_version(user, cursor, limit):
+    generation = await cache.aget(generation_key(user.id))
+    return resume_version(user, get_stats(user), generation, cursor, limit)
+
+
+async def aget_resume(user, version, cursor, limit):
+    """
+    Returns the body and headers of one resume page, rendering it only when
+    no process rendered the same version before.
+    """
+    key = f"resume:{version}"
+    cached = await cache.aget(key)
+    if cached is None:
+        cached = await build_resume(user, get_stats(user), cursor, limit)
+        await cache.aset(key, cached, settings.RESUME_CACHE_TTL)
+    return cached
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_resume(sender, instance, **kwargs):
+    if instance.freelancer_id is not None:
+        bump_generation(instance.freelancer_id)
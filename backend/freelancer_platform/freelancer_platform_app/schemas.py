@@ -2,6 +2,7 @@ from typing import Optional
 from ninja import Schema
 from decimal import Decimal
 import datetime
+import uuid
 from typing import List
 
 class UserInfoSchema(Schema):
@@ -25,6 +26,9 @@ class UserInfoProfileSchema(Schema):
     bio: Optional[str]
     image: Optional[str]
 
+class JobPickerSchema(UserInfoProfileSchema):
+    picked_at: datetime.datetime
+
 class UserUpdateSchema(Schema):
     name: Optional[str] = None
     bio: Optional[str] = None
@@ -38,6 +42,13 @@ class UserUpdateSchema(Schema):
 
 class LoginSchema(Schema):
     wallet_address: str
+    # From GET /login/nonce, and the wallet's signature of its message
+    nonce: Optional[str] = None
+    signature: Optional[str] = None
+
+class LoginNonceSchema(Schema):
+    nonce: str
+    message: str
 
 class LoginResponseSchema(Schema):
     token: str
@@ -76,6 +87,12 @@ class JobSchema(Schema):
     transaction_create : Optional[str] = None
     transaction_accept_job : Optional[str] = None
     transaction_complete_job : Optional[str]= None
+    # Set on job lists, see picks.with_picks_count
+    picks_count: Optional[int] = None
+
+class FreelancerJobSchema(JobSchema):
+    # "assigned" or "picked", see picks.freelancer_jobs
+    relation: str
     
 class CreateJobSchema(Schema):
     title: str
@@ -85,6 +102,19 @@ class CreateJobSchema(Schema):
     job_type: int
     image: Optional[str] = None
 
+class BulkCreateJobSchema(Schema):
+    jobs: List[CreateJobSchema]
+
+class BulkCreateJobResultSchema(Schema):
+    index: int
+    job: Optional[JobSchema] = None
+    error: Optional[str] = None
+
+class BulkCreateJobResponseSchema(Schema):
+    created: int
+    failed: int
+    results: List[BulkCreateJobResultSchema]
+
 class TopFreelancerSchema(Schema):
     id: int
     username: Optional[str]
@@ -98,6 +128,11 @@ class ChatMessagePayloadSchema(Schema):
     content: str
 
 
+class JobPickStatusSchema(Schema):
+    job_id: int
+    picked: bool
+
+
 class CompletedProjectSchema(Schema):
     id: int
     title: str
@@ -116,4 +151,45 @@ class PublicUserResumeSchema(Schema):
     date_joined: str
     social_links: dict
     completed_projects: List[CompletedProjectSchema]
-    total_income: float
\ No newline at end of file
+    completed_projects_count: int
+    total_income: float
+
+
+class UploadSessionCreateSchema(Schema):
+    file_name: str
+    size: int
+    content_type: str
+
+
+class UploadSessionSchema(Schema):
+    id: uuid.UUID
+    size: int
+    received: int
+    chunk_size: int
+    # Unfinished uploads are rejected from then on
+    expires_at: datetime.datetime
+    file_name: Optional[str] = None
+    file_url: Optional[str] = None
+
+
+class DisputeSchema(Schema):
+    id: int
+    job: JobSchema
+    initiator: WebThreeUserSimpleSchema
+    resolved: bool
+    resolved_in_favor_of_freelancer: Optional[bool] = None
+    resolution_date: Optional[datetime.datetime] = None
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+
+
+class ResolveDisputeSchema(Schema):
+    in_favor_of_freelancer: bool
+
+
+class DisputeStatsSchema(Schema):
+    open_count: int
+    resolved_count: int
+    resolved_for_freelancer: int
+    resolved_for_client: int
+    oldest_open_at: Optional[datetime.datetime] = None
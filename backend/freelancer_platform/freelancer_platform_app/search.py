@@ -0,0 +1,77 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q
+
+SEARCH_CONFIG = "simple"
+
+# Mirrors the A/B/C weights set by the ``job_search_vector_update`` trigger
+# (migration 0006); used for ranking when PostgreSQL is not available
+SEARCH_FIELDS = {"title": 3, "info": 2, "description": 1}
+
+
+def search_terms(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def _uses_postgres():
+    return connection.vendor == "postgresql"
+
+
+def _prefix_query(terms):
+    # Every term must match, the last one as a prefix for typeahead
+    raw = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+    return SearchQuery(raw, config=SEARCH_CONFIG, search_type="raw")
+
+
+def filter_jobs(queryset, text):
+    """
+    Restricts ``queryset`` to jobs matching every term of ``text``.
+
+    On PostgreSQL this is answered by the GIN index on ``Job.search_vector``;
+    other databases fall back to ``icontains`` lookups.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+
+    if _uses_postgres():
+        return queryset.filter(search_vector=_prefix_query(terms))
+
+    filters = Q()
+    for term in terms:
+        term_filter = Q()
+        for field in SEARCH_FIELDS:
+            term_filter |= Q(**{f"{field}__icontains": term})
+        filters &= term_filter
+    return queryset.filter(filters)
+
+
+def _python_rank(job, terms):
+    rank = 0
+    for field, weight in SEARCH_FIELDS.items():
+        value = (getattr(job, field) or "").lower()
+        rank += weight * sum(value.count(term) for term in terms)
+    return rank
+
+
+def rank_jobs(queryset, text, limit):
+    """
+    Returns at most ``limit`` jobs matching ``text``, best matches first.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+
+    queryset = filter_jobs(queryset, text)
+    if _uses_postgres():
+        queryset = queryset.annotate(
+            rank=SearchRank(F("search_vector"), _prefix_query(terms))
+        ).order_by("-rank", "-created_at", "-id")
+        return list(queryset[:limit])
+
+    jobs = list(queryset)
+    jobs.sort(key=lambda job: (_python_rank(job, terms), job.created_at, job.id),
+              reverse=True)
+    return jobs[:limit]
@@ -1,3 +1,1635 @@
-from django.test import TestCase
+import asyncio
+import copy
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+from urllib.parse import urlencode
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from ninja import NinjaAPI, Router
+from ninja.errors import ConfigError, HttpError
+from ninja.responses import NinjaJSONEncoder
+from ninja.testing import TestAsyncClient
+from PIL import Image
+
+from .api import client_jobs_query, freelancer_jobs_query, jobs_query, newest_jobs_query
+from .disputes import dispute_queue, open_dispute
+from .ids import (
+    EPOCH, HOST_BITS, MARKER, MAX_SEQUENCE, MAX_SLOT, SEQUENCE_BITS, SLOT_BITS,
+    IdSpaceExhausted, SnowflakeGenerator, claim_slot,
+)
+from .auth import UserCache, generate_jwt_token, jwt_auth, user_cache
+from .chain import CrawlPositionMoved, StaticEventSource, apply_window, ingest, rollback
+from .management.commands.benchmark_api import ENDPOINTS
+from .leaderboard import leaderboard_cache, rebuild_freelancer_stats, top_freelancers_query
+from .metrics import assert_query_budget
+from .models import (
+    ChatMessage, Dispute, FreelancerStats, Job, JobPick, JobType, LastIndexCrawl, PlatformSettings,
+    ProcessedEvent, StoredFile, UploadSession, WebThreeUser,
+)
+from .pagination import NEXT, clamp_page_size, encode_cursor, page_query
+from .picks import ALREADY_PICKED, ASSIGNED, PICKED, pick_job, with_picks_count
+from .platform_settings import (
+    DEFAULT_PLATFORM_FEE, SettingsSnapshot, SettingsStore, aget_settings, get_platform_fee,
+    get_settings, settings_store,
+)
+from . import realtime
+from .realtime import PostgresBroker, chat_socket
+from .response_cache import cache_response
+from .resume import completed_projects_query, resume_version
+from .schemas import FreelancerJobSchema, JobSchema
+from .serializers import freelancer_job_serializer, job_serializer
+from .uploads import complete_session, content_hash, session_path, store_file
+
+
+def auth_header(user, wallet_verified=False):
+    return {"HTTP_AUTHORIZATION": f"Bearer {generate_jwt_token(user, wallet_verified)}"}
+
+
+@skipUnless(connection.vendor == "postgresql", "Query plans are only checked on PostgreSQL")
+class QueryPlanTests(TestCase):
+    """
+    The querysets the list endpoints run must be answered from an index.
+    Test tables are tiny and the planner would rather scan them, so
+    sequential scans are disabled to check that a usable index exists.
+    """
+
+    def assertIndexScan(self, queryset, model=Job, ordered=False):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                if ordered:
+                    # Rows must come out of the index in page order
+                    cursor.execute("SET LOCAL enable_bitmapscan = off")
+                    cursor.execute("SET LOCAL enable_sort = off")
+            plan = queryset.explain()
+        self.assertNotIn(f"Seq Scan on {model._meta.db_table}", plan, plan)
+        return plan
+
+    def job_page(self, jobs):
+        # What apaginate_jobs runs for the first page
+        return page_query(with_picks_count(jobs), None, clamp_page_size(None))[0]
+
+    def test_jobs(self):
+        self.assertIndexScan(self.job_page(jobs_query()))
+
+    def test_jobs_by_status(self):
+        self.assertIndexScan(self.job_page(jobs_query(status="PUSHED")))
+
+    def test_jobs_by_job_type(self):
+        self.assertIndexScan(self.job_page(jobs_query(job_type_id=1)))
+
+    def test_jobs_search(self):
+        self.assertIndexScan(self.job_page(jobs_query(search="solidity audit")))
+
+    def test_jobs_by_client(self):
+        self.assertIndexScan(self.job_page(client_jobs_query(1)))
+
+    def test_jobs_by_freelancer(self):
+        self.assertIndexScan(self.job_page(freelancer_jobs_query(1)))
+
+    def test_jobs_by_freelancer_next_page(self):
+        cursor = encode_cursor(timezone.now(), 1, NEXT)
+        jobs = freelancer_jobs_query(1, cursor)
+        self.assertIndexScan(page_query(with_picks_count(jobs), cursor, clamp_page_size(None))[0])
+
+    def test_jobs_by_freelancer_picks(self):
+        # The picked jobs are paged from the picks, not sorted after a join
+        plan = self.assertIndexScan(self.job_page(freelancer_jobs_query(1)), JobPick, ordered=True)
+        self.assertRegex(plan, r"Limit .*\n *->  Index (Only )?Scan using job_pick_freelancer_job_idx")
+
+    def test_newest_jobs(self):
+        self.assertIndexScan(newest_jobs_query())
+
+    def test_top_freelancers(self):
+        self.assertIndexScan(top_freelancers_query(), FreelancerStats)
+
+    def test_resume_completed_projects(self):
+        projects = completed_projects_query(WebThreeUser(id=1))
+        self.assertIndexScan(page_query(projects, None, clamp_page_size(None))[0])
+
+    def test_dispute_queue(self):
+        queue = page_query(dispute_queue(), None, clamp_page_size(None), oldest_first=True)[0]
+        self.assertIndexScan(queue, Dispute)
+
+
+class SerializerParityTests(TestCase):
+    """
+    ``ValuesSerializer`` must render exactly what Ninja renders from the
+    schema for every job list, whatever is missing from the job.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = WebThreeUser.objects.create(
+            username="client", wallet_address="0xclient", name="Client")
+        cls.freelancer = WebThreeUser.objects.create(
+            username="freelancer", wallet_address="0xfreelancer", image=None)
+        picker = WebThreeUser.objects.create(username="picker", wallet_address="0xpicker")
+        job_type = JobType.objects.create(name="Development")
+
+        cls.assigned = Job.objects.create(
+            title="Assigned", description="Fully populated", info="info",
+            client=cls.client_user, freelancer=cls.freelancer, job_type=job_type,
+            amount=Decimal("123456789012345678901234567890"), status="ACCEPTED",
+            transaction_create="0xcreate", transaction_accept_job="0xaccept")
+        cls.open_job = Job.objects.create(
+            title="Open", description="No freelancer, job type or image", image=None,
+            client=cls.client_user, amount=Decimal("0"), status="PUSHED")
+        cls.picked = Job.objects.create(
+            title="Picked", description="Picked without a job type",
+            client=cls.client_user, amount=Decimal("1000000000000000"), status="PUSHED")
+        for job in (cls.picked, cls.open_job):
+            JobPick.objects.create(job=job, freelancer=cls.freelancer)
+        JobPick.objects.create(job=cls.picked, freelancer=picker)
+
+    def assertSameOutput(self, jobs, schema=JobSchema, serializer=job_serializer):
+        expected = json.dumps(
+            [schema.from_orm(job).model_dump() for job in jobs], cls=NinjaJSONEncoder)
+        self.assertEqual(serializer.render(list(serializer.values(jobs))), expected)
+
+    def page(self, jobs):
+        return with_picks_count(jobs).order_by("-created_at", "-id")
+
+    def test_jobs(self):
+        self.assertSameOutput(self.page(jobs_query()))
+
+    def test_jobs_filtered(self):
+        self.assertSameOutput(self.page(jobs_query(status="PUSHED", min_amount=0)))
+
+    def test_jobs_by_client(self):
+        self.assertSameOutput(self.page(client_jobs_query(self.client_user.id)))
+
+    def test_jobs_by_freelancer(self):
+        jobs = self.page(freelancer_jobs_query(self.freelancer.id))
+        self.assertEqual(len(jobs), 3)
+        self.assertSameOutput(jobs, FreelancerJobSchema, freelancer_job_serializer)
+
+    def test_newest_jobs(self):
+        self.assertSameOutput(newest_jobs_query())
+
+    def test_endpoints(self):
+        requests = [
+            ("/api/jobs", {}),
+            ("/api/jobs?status=PUSHED", {}),
+            ("/api/jobs/newest", {}),
+            ("/api/jobs/by-client", auth_header(self.client_user)),
+            ("/api/jobs/by-freelancer", auth_header(self.freelancer)),
+        ]
+        for path, headers in requests:
+            with self.subTest(path=path):
+                with override_settings(API_FAST_SERIALIZER=False, RESPONSE_CACHE_ENABLED=False):
+                    expected = self.client.get(path, **headers)
+                with override_settings(API_FAST_SERIALIZER=True, RESPONSE_CACHE_ENABLED=False):
+                    actual = self.client.get(path, **headers)
+                self.assertEqual(expected.status_code, 200)
+                self.assertEqual(actual.content, expected.content)
+
+
+RESOLVER_WALLET = "0xresolver"
+
+
+def use_own_chat_broker(test):
+    # Sending chat messages opens broker connections, close them with the test
+    broker = mock.patch.object(realtime, "_broker", None)
+    broker.start()
+    test.addCleanup(broker.stop)
+    test.addCleanup(lambda: realtime.get_broker().close())
+
+
+def create_budget_fixture():
+    client = WebThreeUser.objects.create(username="client", wallet_address="0xclient")
+    freelancer = WebThreeUser.objects.create(username="freelancer", wallet_address="0xfreelancer")
+    picker = WebThreeUser.objects.create(username="picker", wallet_address="0xpicker")
+    resolver = WebThreeUser.objects.create(username="resolver", wallet_address=RESOLVER_WALLET)
+    job_type = JobType.objects.create(name="Development")
+    completed = Job.objects.create(
+        title="Solidity audit", description="Audit the escrow contract", client=client,
+        freelancer=freelancer, job_type=job_type, amount=100, status="COMPLETED")
+    accepted = Job.objects.create(
+        title="Frontend work", description="Build the job board", client=client,
+        freelancer=freelancer, job_type=job_type, amount=50, status="ACCEPTED")
+    pushed = Job.objects.create(
+        title="Indexer", description="Crawl contract events", client=client,
+        job_type=job_type, amount=10, status="PUSHED")
+    for job in (accepted, pushed):
+        JobPick.objects.create(job=job, freelancer=freelancer)
+    JobPick.objects.create(job=pushed, freelancer=picker)
+    for content in ("Hello", "Hi", "When can you start?"):
+        ChatMessage.objects.create(job=pushed, sender=client, receiver=picker, content=content)
+    return client, freelancer, picker, resolver, completed, accepted, pushed
+
+
+@override_settings(DISPUTE_RESOLVERS=[RESOLVER_WALLET], RESPONSE_CACHE_ENABLED=False)
+class QueryBudgetTests(TestCase):
+    """
+    Every endpoint declaring a ``@query_budget`` keeps to it, caches cold.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        (cls.client_user, cls.freelancer, cls.picker, cls.resolver,
+         cls.completed, cls.accepted, cls.pushed) = create_budget_fixture()
+        cls.dispute = open_dispute(cls.accepted.id, cls.client_user.id)
+
+    def setUp(self):
+        user_cache.clear()
+        leaderboard_cache.clear()
+        use_own_chat_broker(self)
+
+    def assertWithinBudget(self, response, status=200):
+        self.assertEqual(response.status_code, status, response.content)
+        assert_query_budget(response)
+
+    def test_user_info(self):
+        self.assertWithinBudget(self.client.get("/api/user/info", **auth_header(self.freelancer)))
+
+    def test_job_types(self):
+        self.assertWithinBudget(self.client.get("/api/job-types"))
+
+    def test_jobs(self):
+        for path in ["/api/jobs", "/api/jobs?status=PUSHED&min_amount=5", "/api/jobs/newest",
+                     "/api/jobs/search?q=audit", "/api/top-freelancers",
+                     f"/api/jobs/{self.pushed.id}"]:
+            with self.subTest(path=path):
+                self.assertWithinBudget(self.client.get(path))
+
+    def test_jobs_next_page(self):
+        first = self.client.get("/api/jobs?limit=1")
+        self.assertWithinBudget(self.client.get(
+            "/api/jobs", {"limit": 1, "cursor": first["X-Next-Cursor"]}))
+
+    def test_user_jobs(self):
+        self.assertWithinBudget(self.client.get("/api/jobs/by-client", **auth_header(self.client_user)))
+        self.assertWithinBudget(self.client.get("/api/jobs/by-freelancer", **auth_header(self.freelancer)))
+
+    def test_pick_status(self):
+        self.assertWithinBudget(self.client.get(
+            "/api/jobs/pick-status", {"job_ids": [self.pushed.id, self.completed.id]},
+            **auth_header(self.freelancer)))
+
+    def test_chat(self):
+        path = f"/api/jobs/{self.pushed.id}/chat"
+        conversation = {"user_A": self.client_user.wallet_address,
+                        "user_B": self.picker.wallet_address}
+        first = ChatMessage.objects.filter(job=self.pushed).order_by("id").first()
+        for params in [{}, conversation, dict(conversation, since_id=first.id),
+                       dict(conversation, before_id=first.id + 1)]:
+            with self.subTest(params=params):
+                self.assertWithinBudget(self.client.get(path, params, **auth_header(self.picker)))
+
+    def test_picks(self):
+        self.assertWithinBudget(self.client.get(
+            f"/api/jobs/{self.pushed.id}/picks", **auth_header(self.client_user)))
+
+    def test_pick(self):
+        path = f"/api/jobs/{self.pushed.id}/pick"
+        user = WebThreeUser.objects.create(username="new", wallet_address="0xnew")
+        self.assertWithinBudget(self.client.post(path, **auth_header(user)))
+        user_cache.clear()
+        self.assertWithinBudget(self.client.post(path, **auth_header(user)), status=409)
+
+    def test_disputes(self):
+        for path in ["/api/disputes", "/api/disputes?resolved=true", "/api/disputes/stats"]:
+            with self.subTest(path=path):
+                self.assertWithinBudget(self.client.get(path, **auth_header(self.resolver, wallet_verified=True)))
+
+    def test_resume(self):
+        self.assertWithinBudget(self.client.get(f"/api/users/{self.freelancer.wallet_address}/resume"))
+
+
+@override_settings(DISPUTE_RESOLVERS=[RESOLVER_WALLET], RESPONSE_CACHE_ENABLED=False)
+class TransactionQueryBudgetTests(TransactionTestCase):
+    """
+    Endpoints writing in a transaction, outside the savepoints a
+    ``TestCase`` would add to their count.
+    """
+
+    def setUp(self):
+        (self.client_user, self.freelancer, self.picker, self.resolver,
+         self.completed, self.accepted, self.pushed) = create_budget_fixture()
+        user_cache.clear()
+
+    def assertWithinBudget(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        metrics = response.request_metrics
+        # SQLite starts the transaction with a BEGIN statement of its own
+        assert_query_budget(response, metrics.budget + (connection.vendor == "sqlite"))
+
+    def test_open_and_resolve_dispute(self):
+        self.assertWithinBudget(self.client.post(
+            f"/api/jobs/{self.accepted.id}/dispute", **auth_header(self.freelancer)))
+        dispute = Dispute.objects.get(job=self.accepted)
+        self.assertWithinBudget(self.client.post(
+            f"/api/disputes/{dispute.id}/resolve", {"in_favor_of_freelancer": True},
+            content_type="application/json", **auth_header(self.resolver, wallet_verified=True)))
+
+
+@override_settings(DISPUTE_RESOLVERS=[RESOLVER_WALLET])
+class DisputeApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        (cls.client_user, cls.freelancer, cls.picker, cls.resolver,
+         cls.completed, cls.accepted, cls.pushed) = create_budget_fixture()
+
+    def setUp(self):
+        user_cache.clear()
+
+    def resolver_header(self):
+        return auth_header(self.resolver, wallet_verified=True)
+
+    def open(self, job, user):
+        return self.client.post(f"/api/jobs/{job.id}/dispute", **auth_header(user))
+
+    def resolve(self, dispute_id, headers, in_favor_of_freelancer=True):
+        return self.client.post(
+            f"/api/disputes/{dispute_id}/resolve", {"in_favor_of_freelancer": in_favor_of_freelancer},
+            content_type="application/json", **headers)
+
+    def test_open(self):
+        response = self.open(self.accepted, self.freelancer)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["initiator"]["wallet_address"], self.freelancer.wallet_address)
+        self.accepted.refresh_from_db()
+        self.assertEqual(self.accepted.status, "DISPUTED")
+        # Already disputed
+        self.assertEqual(self.open(self.accepted, self.client_user).status_code, 400)
+
+    def test_open_refused(self):
+        self.assertEqual(self.open(self.accepted, self.picker).status_code, 403)
+        self.assertEqual(self.open(self.completed, self.client_user).status_code, 400)
+        self.assertEqual(self.client.post("/api/jobs/1/dispute", **auth_header(self.client_user))
+                         .status_code, 404)
+        self.assertEqual(self.client.post(f"/api/jobs/{self.accepted.id}/dispute").status_code, 401)
+
+    def test_list_and_resolve(self):
+        dispute = open_dispute(self.accepted.id, self.client_user.id)
+        response = self.client.get("/api/disputes", **self.resolver_header())
+        self.assertEqual([d["id"] for d in response.json()], [dispute.id])
+
+        response = self.resolve(dispute.id, self.resolver_header())
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertTrue(response.json()["resolved_in_favor_of_freelancer"])
+        self.accepted.refresh_from_db()
+        self.assertEqual(self.accepted.status, "RESOLVED")
+        self.assertEqual(self.resolve(dispute.id, self.resolver_header()).status_code, 400)
+        self.assertEqual(self.client.get("/api/disputes", **self.resolver_header()).json(), [])
+        response = self.client.get("/api/disputes?resolved=true", **self.resolver_header())
+        self.assertEqual([d["id"] for d in response.json()], [dispute.id])
+        self.assertEqual(self.resolve(dispute.id + 1, self.resolver_header()).status_code, 404)
+
+    def test_stats(self):
+        open_dispute(self.accepted.id, self.client_user.id)
+        response = self.client.get("/api/disputes/stats", **self.resolver_header())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["open_count"], 1)
+        self.assertEqual(response.json()["resolved_count"], 0)
+
+    def test_resolver_routes_refused(self):
+        dispute = open_dispute(self.accepted.id, self.client_user.id)
+        for headers, status in [
+            ({}, 401),
+            (auth_header(self.picker, wallet_verified=True), 403),
+            # A bare /login for the resolver's wallet proves nothing
+            (auth_header(self.resolver), 403),
+        ]:
+            with self.subTest(headers=headers):
+                self.assertEqual(self.client.get("/api/disputes", **headers).status_code, status)
+                self.assertEqual(self.client.get("/api/disputes/stats", **headers).status_code, status)
+                self.assertEqual(self.resolve(dispute.id, headers).status_code, status)
+        dispute.refresh_from_db()
+        self.assertFalse(dispute.resolved)
+
+    def test_stats_are_never_served_without_auth(self):
+        open_dispute(self.accepted.id, self.client_user.id)
+        with override_settings(RESPONSE_CACHE_ENABLED=True):
+            response = self.client.get("/api/disputes/stats", **self.resolver_header())
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self.client.get("/api/disputes/stats").status_code, 401)
+            self.assertEqual(self.client.get(
+                "/api/disputes/stats", **auth_header(self.picker)).status_code, 403)
+
+
+class WalletLoginTests(TestCase):
+    def setUp(self):
+        self.account = Account.create()
+        self.wallet = self.account.address
+
+    def challenge(self, wallet=None):
+        response = self.client.get("/api/login/nonce", {"wallet_address": wallet or self.wallet})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def sign(self, message, account=None):
+        signed = (account or self.account).sign_message(encode_defunct(text=message))
+        return "0x" + signed.signature.hex().removeprefix("0x")
+
+    def login(self, **payload):
+        return self.client.post("/api/login", dict({"wallet_address": self.wallet}, **payload),
+                                content_type="application/json")
+
+    def test_signed_login_resolves_disputes(self):
+        challenge = self.challenge()
+        response = self.login(nonce=challenge["nonce"], signature=self.sign(challenge["message"]))
+        self.assertEqual(response.status_code, 200, response.content)
+        token = response.json()["token"]
+        with override_settings(DISPUTE_RESOLVERS=[self.wallet.lower()]):
+            response = self.client.get("/api/disputes/stats", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 200)
+
+    def test_nonce_is_single_use(self):
+        challenge = self.challenge()
+        payload = {"nonce": challenge["nonce"], "signature": self.sign(challenge["message"])}
+        self.assertEqual(self.login(**payload).status_code, 200)
+        self.assertEqual(self.login(**payload).status_code, 401)
+
+    def test_invalid_signatures(self):
+        challenge = self.challenge()
+        other = Account.create()
+        other_challenge = self.challenge(other.address)
+        for nonce, signature in [
+            # Someone else's wallet signed
+            (challenge["nonce"], self.sign(challenge["message"], other)),
+            # A nonce issued to another wallet
+            (other_challenge["nonce"], self.sign(other_challenge["message"])),
+            (challenge["nonce"] + "x", self.sign(challenge["message"])),
+            (challenge["nonce"], "0x1234"),
+        ]:
+            with self.subTest(nonce=nonce, signature=signature):
+                self.assertEqual(self.login(nonce=nonce, signature=signature).status_code, 401)
+
+    def test_expired_nonce(self):
+        challenge = self.challenge()
+        with override_settings(LOGIN_NONCE_TTL=-1):
+            response = self.login(
+                nonce=challenge["nonce"], signature=self.sign(challenge["message"]))
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheAuthTests(TestCase):
+    def test_authenticated_operation_is_refused(self):
+        router = Router()
+        with self.assertRaises(ConfigError):
+            @router.get("/private", auth=jwt_auth)
+            @cache_response(60)
+            async def private(request):
+                return {}
+
+    async def test_inherited_auth_is_never_cached(self):
+        # A router's auth only reaches its operations once it is mounted
+        router = Router(auth=jwt_auth)
+        user = await WebThreeUser.objects.acreate(username="cached", wallet_address="0xcached")
+
+        @router.get("/private")
+        @cache_response(60)
+        async def private(request):
+            return {"user": request.auth.id}
+
+        api = NinjaAPI(urls_namespace="response_cache_auth")
+        api.add_router("/", router)
+        client = TestAsyncClient(api)
+        response = await client.get("/private", headers={
+            "Authorization": auth_header(user)["HTTP_AUTHORIZATION"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((await client.get("/private")).status_code, 401)
+
+
+class FreelancerJobsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        client = WebThreeUser.objects.create(username="client", wallet_address="0xclient")
+        cls.freelancer = WebThreeUser.objects.create(
+            username="freelancer", wallet_address="0xfreelancer")
+        other = WebThreeUser.objects.create(username="other", wallet_address="0xother")
+        start = timezone.now() - timedelta(days=1)
+        # Newest last: assigned, picked, picked then assigned, picked by
+        # someone else only, picked, assigned, picked
+        relations = ["assigned", "picked", "both", None, "picked", "assigned", "picked"]
+        cls.expected = []
+        for minutes, relation in enumerate(relations):
+            job = Job.objects.create(
+                title=f"Job {minutes}", description="Work", client=client, amount=1,
+                freelancer=cls.freelancer if relation in ("assigned", "both") else None)
+            Job.objects.filter(id=job.id).update(created_at=start + timedelta(minutes=minutes))
+            job.refresh_from_db()
+            if relation in ("picked", "both"):
+                JobPick.objects.create(job=job, freelancer=cls.freelancer)
+            JobPick.objects.create(job=job, freelancer=other)
+            if relation is not None:
+                cls.expected.append((job.id, "assigned" if relation == "both" else relation))
+        cls.expected.reverse()
+
+    def setUp(self):
+        user_cache.clear()
+
+    def page(self, cursor=None):
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = self.client.get("/api/jobs/by-freelancer", params, **auth_header(self.freelancer))
+        self.assertEqual(response.status_code, 200, response.content)
+        rows = [(job["id"], job["relation"]) for job in response.json()]
+        return rows, response.headers.get("X-Next-Cursor"), response.headers.get("X-Prev-Cursor")
+
+    def test_pages(self):
+        pages = []
+        cursor = None
+        while True:
+            rows, cursor, _ = self.page(cursor)
+            pages.append(rows)
+            if cursor is None:
+                break
+        self.assertEqual([len(rows) for rows in pages], [2, 2, 2])
+        self.assertEqual([row for rows in pages for row in rows], self.expected)
+
+        # And back from the last page
+        rows, _, prev = self.page(self.page(self.page()[1])[1])
+        self.assertEqual(rows, pages[2])
+        rows, _, prev = self.page(prev)
+        self.assertEqual(rows, pages[1])
+        self.assertEqual(self.page(prev)[0], pages[0])
+
+
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = WebThreeUser.objects.create(username="client", wallet_address="0xclient")
+        cls.freelancers = [
+            WebThreeUser.objects.create(username=f"freelancer{i}", wallet_address=f"0xf{i}")
+            for i in range(8)
+        ]
+
+    def setUp(self):
+        leaderboard_cache.clear()
+
+    def complete(self, freelancer, amount=10):
+        return Job.objects.create(
+            title="Job", description="Work", client=self.client_user, freelancer=freelancer,
+            amount=amount, status="COMPLETED")
+
+    def stats(self, freelancer):
+        return FreelancerStats.objects.filter(freelancer=freelancer).values_list(
+            "completed_jobs_count", "total_earned", "last_completed_at").first()
+
+    def test_triggers(self):
+        freelancer, other = self.freelancers[:2]
+        first = self.complete(freelancer, 10)
+        second = self.complete(freelancer, 5)
+        self.assertEqual(self.stats(freelancer), (2, 15, second.updated_at))
+
+        # Back out of COMPLETED: the earlier completion is the last one again
+        second.status = "ACCEPTED"
+        second.save()
+        self.assertEqual(self.stats(freelancer), (1, 10, first.updated_at))
+
+        first.amount = 20
+        first.save()
+        self.assertEqual(self.stats(freelancer), (1, 20, first.updated_at))
+
+        # Reassigned
+        Job.objects.filter(id=first.id).update(freelancer=other)
+        self.assertEqual(self.stats(freelancer), (0, 0, None))
+        self.assertEqual(self.stats(other), (1, 20, first.updated_at))
+
+        first.delete()
+        self.assertEqual(self.stats(other), (0, 0, None))
+
+    def test_rebuild(self):
+        jobs = [self.complete(self.freelancers[0]), self.complete(self.freelancers[1], 7)]
+        expected = {f.id: self.stats(f) for f in self.freelancers[:2]}
+        FreelancerStats.objects.all().update(completed_jobs_count=99, last_completed_at=None)
+        FreelancerStats.objects.create(freelancer=self.freelancers[2], completed_jobs_count=3)
+
+        self.assertEqual(rebuild_freelancer_stats(), 2)
+        self.assertEqual(
+            {s.freelancer_id: (s.completed_jobs_count, s.total_earned, s.last_completed_at)
+             for s in FreelancerStats.objects.all()}, expected)
+        self.assertEqual(expected[self.freelancers[1].id], (1, 7, jobs[1].updated_at))
+
+    def test_top_freelancers(self):
+        counts = [1, 3, 0, 2, 3, 1, 1, 1]
+        for freelancer, count in zip(self.freelancers, counts):
+            for _ in range(count):
+                self.complete(freelancer)
+        response = self.client.get("/api/top-freelancers")
+        self.assertEqual(response.status_code, 200)
+        f = self.freelancers
+        # Most completed jobs first, ties by id, nobody without one
+        self.assertEqual(
+            [(row["id"], row["completed_jobs_count"]) for row in response.json()],
+            [(f[1].id, 3), (f[4].id, 3), (f[3].id, 2), (f[0].id, 1), (f[5].id, 1), (f[6].id, 1)])
+
+
+class ResumeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = WebThreeUser.objects.create(username="client", wallet_address="0xclient")
+        cls.freelancer = WebThreeUser.objects.create(
+            username="freelancer", wallet_address="0xfreelancer", name="Ada")
+        cls.job = Job.objects.create(
+            title="Audit", description="Audit the escrow", client=cls.client_user,
+            freelancer=cls.freelancer, amount=10, status="COMPLETED")
+        cls.path = f"/api/users/{cls.freelancer.wallet_address}/resume"
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(self.path, **headers)
+
+    def test_version_fingerprint(self):
+        user = WebThreeUser.objects.select_related("stats").get(id=self.freelancer.id)
+        stats = user.stats
+        parts = (user, stats, "generation", None, 10)
+        version = resume_version(*parts)
+        self.assertEqual(resume_version(*parts), version)
+        self.assertNotEqual(resume_version(user, stats, "other", None, 10), version)
+        self.assertNotEqual(resume_version(user, stats, "generation", "cursor", 10), version)
+        self.assertNotEqual(resume_version(user, stats, "generation", None, 20), version)
+        for field, value in [("completed_jobs_count", 2), ("total_earned", 11),
+                             ("last_completed_at", timezone.now())]:
+            with self.subTest(field=field):
+                changed = copy.copy(stats)
+                setattr(changed, field, value)
+                self.assertNotEqual(resume_version(user, changed, "generation", None, 10), version)
+        edited = copy.copy(user)
+        edited.updated_at += timedelta(seconds=1)
+        self.assertNotEqual(resume_version(edited, stats, "generation", None, 10), version)
+
+    def test_not_modified(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        etag = response["ETag"]
+
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.request_metrics.queries, 1)
+        self.assertEqual(self.get('"stale"').status_code, 200)
+
+    def test_rendered_once(self):
+        self.get()
+        # Served from the cache: only the user and stats are read
+        response = self.get()
+        self.assertEqual(response.request_metrics.queries, 1)
+        self.assertEqual(response.json()["completed_projects"][0]["title"], "Audit")
+
+    def test_invalidated_by_profile_change(self):
+        etag = self.get()["ETag"]
+        user = WebThreeUser.objects.get(id=self.freelancer.id)
+        user.name = "Ada L."
+        user.save()
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["name"], "Ada L.")
+
+    def test_invalidated_by_stats_change(self):
+        etag = self.get()["ETag"]
+        # As the chain worker does: no post_save, only the stats trigger
+        Job.objects.filter(id=self.job.id).update(status="RESOLVED")
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["completed_projects_count"], 0)
+        self.assertEqual(response.json()["completed_projects"], [])
+
+    def test_invalidated_by_job_edit(self):
+        etag = self.get()["ETag"]
+        job = Job.objects.get(id=self.job.id)
+        job.title = "Escrow audit"
+        job.save()
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["completed_projects"][0]["title"], "Escrow audit")
+
+
+class UserCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = WebThreeUser.objects.create(username="cached", wallet_address="0xcached")
+        cls.other = WebThreeUser.objects.create(username="other", wallet_address="0xother")
+
+    def setUp(self):
+        user_cache.clear()
+        self.now = 1000.0
+        clock = mock.patch("freelancer_platform_app.auth.time.monotonic", lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def test_ttl(self):
+        cache = UserCache(maxsize=10, ttl=60)
+        with self.assertNumQueries(1):
+            self.assertEqual(cache.get(self.user.id), self.user)
+            self.assertEqual(cache.get(self.user.id), self.user)
+        self.now += 61
+        with self.assertNumQueries(1):
+            cache.get(self.user.id)
+        self.assertEqual(cache.stats(), {"size": 1, "hits": 1, "misses": 2, "hit_rate": 1 / 3})
+
+    def test_least_recently_used_is_evicted(self):
+        cache = UserCache(maxsize=1, ttl=60)
+        cache.get(self.user.id)
+        cache.get(self.other.id)
+        with self.assertNumQueries(1):
+            cache.get(self.user.id)
+
+    def test_copies_are_handed_out(self):
+        user_cache.get(self.user.id).name = "Changed"
+        self.assertEqual(user_cache.get(self.user.id).name, self.user.name)
+
+    def test_invalidated_on_save_and_delete(self):
+        user_cache.get(self.user.id)
+        user = WebThreeUser.objects.get(id=self.user.id)
+        user.name = "Renamed"
+        user.save()
+        self.assertEqual(user_cache.get(self.user.id).name, "Renamed")
+        user.delete()
+        self.assertIsNone(user_cache.get(self.user.id))
+
+    def test_claims_auth_rejects_inactive_and_deleted_users(self):
+        headers = auth_header(self.user)
+        self.assertEqual(self.client.get("/api/jobs/by-client", **headers).status_code, 200)
+        user = WebThreeUser.objects.get(id=self.user.id)
+        user.is_active = False
+        user.save()
+        self.assertEqual(self.client.get("/api/jobs/by-client", **headers).status_code, 401)
+        user.delete()
+        self.assertEqual(self.client.get("/api/jobs/by-client", **headers).status_code, 401)
+
+
+class SocketSession:
+    """
+    Drives ``chat_socket`` the way an ASGI server would.
+    """
+
+    def __init__(self, path, **params):
+        self.incoming = asyncio.Queue()
+        self.outgoing = asyncio.Queue()
+        scope = {"type": "websocket", "path": path,
+                 "query_string": urlencode(params).encode()}
+        self.task = asyncio.ensure_future(chat_socket(scope, self.incoming.get, self.outgoing.put))
+
+    async def connect(self):
+        await self.incoming.put({"type": "websocket.connect"})
+        return await self.receive()
+
+    async def receive(self):
+        return await asyncio.wait_for(self.outgoing.get(), 5)
+
+    async def close(self):
+        await self.incoming.put({"type": "websocket.disconnect"})
+        await asyncio.wait_for(self.task, 5)
+
+
+class ChatSocketTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        (cls.client_user, cls.freelancer, cls.picker, cls.outsider,
+         _, _, cls.job) = create_budget_fixture()
+
+    def setUp(self):
+        user_cache.clear()
+        use_own_chat_broker(self)
+
+    def open(self, user=None, job_id=None, **params):
+        if user is not None:
+            params["token"] = generate_jwt_token(user)
+        return SocketSession(f"/ws/jobs/{job_id or self.job.id}/chat", **params)
+
+    async def send_message(self, sender, receiver, content):
+        response = await self.async_client.post(
+            f"/api/jobs/{self.job.id}/chat",
+            {"receiver_address": receiver.wallet_address, "content": content},
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {generate_jwt_token(sender)}"})
+        self.assertEqual(response.status_code, 200, response.content)
+
+    async def test_refused(self):
+        for session, code in [
+            (self.open(), 4401),
+            (self.open(token="not-a-token"), 4401),
+            (self.open(self.outsider), 4403),
+            (self.open(self.client_user, job_id=1), 4404),
+            (SocketSession("/ws/jobs/chat", token=generate_jwt_token(self.client_user)), 4404),
+        ]:
+            with self.subTest(code=code):
+                self.assertEqual(await session.connect(), {"type": "websocket.close", "code": code})
+                await asyncio.wait_for(session.task, 5)
+
+    async def test_client_and_pickers_are_accepted(self):
+        for user in (self.client_user, self.picker, self.freelancer):
+            with self.subTest(user=user.username):
+                session = self.open(user)
+                self.assertEqual(await session.connect(), {"type": "websocket.accept"})
+                await session.close()
+
+    async def test_sent_messages_are_pushed(self):
+        session = self.open(self.picker)
+        self.assertEqual(await session.connect(), {"type": "websocket.accept"})
+        await self.send_message(self.client_user, self.picker, "Are you free?")
+        frame = await session.receive()
+        self.assertEqual(frame["type"], "websocket.send")
+        pushed = json.loads(frame["text"])
+        self.assertEqual((pushed["sender_address"], pushed["content"]),
+                         (self.client_user.wallet_address, "Are you free?"))
+        await session.close()
+
+    async def test_conversation_filter(self):
+        session = self.open(self.client_user, user_A=self.client_user.wallet_address,
+                            user_B=self.freelancer.wallet_address)
+        self.assertEqual(await session.connect(), {"type": "websocket.accept"})
+        await self.send_message(self.client_user, self.picker, "Not for the freelancer")
+        await self.send_message(self.client_user, self.freelancer, "For the freelancer")
+        self.assertEqual(json.loads((await session.receive())["text"])["content"],
+                         "For the freelancer")
+        await session.close()
+
+
+@skipUnless(connection.vendor == "postgresql", "LISTEN/NOTIFY needs PostgreSQL")
+class PostgresBrokerTests(SimpleTestCase):
+    databases = {"default"}
+
+    async def test_messages_reach_other_processes(self):
+        # Two brokers stand for two worker processes
+        publisher, subscriber = PostgresBroker(), PostgresBroker()
+        self.addCleanup(publisher.close)
+        self.addCleanup(subscriber.close)
+        async with subscriber.subscribe("chat.job.1") as queue:
+            await sync_to_async(publisher.publish)("chat.job.2", {"content": "elsewhere"})
+            await sync_to_async(publisher.publish)("chat.job.1", {"content": "x" * 8000})
+            await sync_to_async(publisher.publish)("chat.job.1", {"content": "hello"})
+            self.assertEqual(await asyncio.wait_for(queue.get(), 5), {"content": "hello"})
+            self.assertTrue(queue.empty())
+
+
+class MetricsViewTests(SimpleTestCase):
+    def test_refused_without_a_configured_token(self):
+        with override_settings(METRICS_TOKEN=""):
+            self.assertEqual(self.client.get("/metrics").status_code, 403)
+            self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer ").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="scrape-me")
+    def test_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.assertEqual(
+            self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-me")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"# TYPE", response.content)
+
+
+class JobPickTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = WebThreeUser.objects.create(username="client", wallet_address="0xclient")
+        cls.freelancer = WebThreeUser.objects.create(username="freelancer", wallet_address="0xfreelancer")
+        cls.picker = WebThreeUser.objects.create(username="picker", wallet_address="0xpicker")
+        job_type = JobType.objects.create(name="Development")
+        cls.job, cls.other_job = [
+            Job.objects.create(title=title, description="Work", amount=1, job_type=job_type,
+                               client=cls.client_user, freelancer=cls.freelancer)
+            for title in ("Job", "Other job")
+        ]
+
+    def setUp(self):
+        user_cache.clear()
+        cache.clear()
+
+    def test_unique_constraint(self):
+        JobPick.objects.create(job=self.job, freelancer=self.picker)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            JobPick.objects.create(job=self.job, freelancer=self.picker)
+
+    def test_pick_job(self):
+        # The SQLite statements also run on PostgreSQL
+        for vendor in sorted({connection.vendor, "sqlite"}):
+            with self.subTest(vendor=vendor), transaction.atomic():
+                with mock.patch.object(connection, "vendor", vendor):
+                    self.assertEqual(pick_job(self.job.id, self.picker.id), ("Job", PICKED))
+                    self.assertEqual(pick_job(self.job.id, self.picker.id), ("Job", ALREADY_PICKED))
+                    self.assertEqual(pick_job(self.job.id, self.freelancer.id), ("Job", ASSIGNED))
+                    with self.assertRaises(Job.DoesNotExist):
+                        pick_job(self.job.id + 1000, self.picker.id)
+                pick = JobPick.objects.get(job=self.job)
+                self.assertEqual(pick.freelancer_id, self.picker.id)
+                self.assertEqual(pick.job_created_at, self.job.created_at)
+                transaction.set_rollback(True)
+
+    def test_pick_endpoint(self):
+        path = f"/api/jobs/{self.job.id}/pick"
+        self.assertEqual(self.client.post(path, **auth_header(self.picker)).status_code, 200)
+        response = self.client.post(path, **auth_header(self.picker))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["detail"], "You have already picked this job")
+        self.assertEqual(self.client.post(path, **auth_header(self.freelancer)).status_code, 400)
+        self.assertEqual(self.client.post(
+            f"/api/jobs/{self.job.id + 1000}/pick", **auth_header(self.picker)).status_code, 404)
+        self.assertEqual(JobPick.objects.filter(job=self.job).count(), 1)
+
+    def test_picks_count(self):
+        path = f"/api/jobs/{self.job.id}"
+        self.assertEqual(self.client.get(path).json()["picks_count"], 0)
+        # The cached response is dropped by the pick
+        self.client.post(f"{path}/pick", **auth_header(self.picker))
+        self.assertEqual(self.client.get(path).json()["picks_count"], 1)
+        JobPick.objects.create(job=self.job, freelancer=self.client_user)
+        jobs = with_picks_count(Job.objects.all()).order_by("id")
+        self.assertEqual([job.picks_count for job in jobs], [2, 0])
+
+    def test_pick_status(self):
+        JobPick.objects.create(job=self.other_job, freelancer=self.picker)
+        JobPick.objects.create(job=self.job, freelancer=self.client_user)
+        job_ids = [self.other_job.id, self.job.id + 1000, self.job.id]
+        response = self.client.get("/api/jobs/pick-status", {"job_ids": job_ids},
+                                   **auth_header(self.picker))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [
+            {"job_id": self.other_job.id, "picked": True},
+            {"job_id": self.job.id + 1000, "picked": False},
+            {"job_id": self.job.id, "picked": False},
+        ])
+
+    @override_settings(API_MAX_PAGE_SIZE=2)
+    def test_pick_status_limit(self):
+        response = self.client.get("/api/jobs/pick-status", {"job_ids": [1, 2, 3]},
+                                   **auth_header(self.picker))
+        self.assertEqual(response.status_code, 400)
+
+
+class SettingsSnapshotTests(SimpleTestCase):
+    snapshot = SettingsSnapshot({
+        "count": " 12 ", "ratio": "0.25", "price": "1.10", "enabled": "Yes", "disabled": "off",
+        "name": "Freelancer", "broken": "twelve", "platform_fee": "3.5",
+    }, version=1)
+
+    def test_typed_accessors(self):
+        self.assertEqual(self.snapshot.get_int("count"), 12)
+        self.assertEqual(self.snapshot.get_float("ratio"), 0.25)
+        self.assertEqual(self.snapshot.get_decimal("price"), Decimal("1.10"))
+        self.assertIs(self.snapshot.get_bool("enabled"), True)
+        self.assertIs(self.snapshot.get_bool("disabled"), False)
+        self.assertEqual(self.snapshot.get_str("name"), "Freelancer")
+        self.assertEqual(self.snapshot.platform_fee, 3.5)
+
+    def test_missing_or_invalid_values_return_default(self):
+        for get in (self.snapshot.get_int, self.snapshot.get_float, self.snapshot.get_decimal,
+                    self.snapshot.get_bool):
+            with self.subTest(get=get.__name__):
+                self.assertEqual(get("missing", "default"), "default")
+                self.assertEqual(get("broken", "default"), "default")
+        self.assertIsNone(self.snapshot.get_str("missing"))
+        self.assertEqual(SettingsSnapshot({}, 0).platform_fee, DEFAULT_PLATFORM_FEE)
+
+    def test_read_only(self):
+        with self.assertRaises(TypeError):
+            self.snapshot.values["count"] = "13"
+
+
+class SettingsStoreTests(TestCase):
+    def setUp(self):
+        settings_store.invalidate()
+        self.addCleanup(settings_store.invalidate)
+
+    def test_snapshot_is_cached(self):
+        PlatformSettings.objects.create(key="platform_fee", value="4")
+        settings_store.invalidate()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_platform_fee(), 4.0)
+            self.assertIs(get_settings(), get_settings())
+
+    def test_expires_after_ttl(self):
+        store = SettingsStore(ttl=60)
+        first = store.get()
+        self.assertIs(store.get(), first)
+        with mock.patch("freelancer_platform_app.platform_settings.time.monotonic",
+                        return_value=time.monotonic() + 61):
+            self.assertIsNot(store.get(), first)
+
+    def test_refreshed_after_commit(self):
+        self.assertEqual(get_platform_fee(), DEFAULT_PLATFORM_FEE)
+        with self.captureOnCommitCallbacks() as callbacks:
+            setting = PlatformSettings.objects.create(key="platform_fee", value="5")
+        # Not before the commit, other connections cannot see the row yet
+        self.assertEqual(get_platform_fee(), DEFAULT_PLATFORM_FEE)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_platform_fee(), 5.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            setting.delete()
+        self.assertEqual(get_platform_fee(), DEFAULT_PLATFORM_FEE)
+
+    def test_load_racing_a_change_is_not_kept(self):
+        store = SettingsStore(ttl=60)
+        rows = [("key", "old")]
+
+        def load(*fields):
+            # A change is published while the rows are read
+            store.invalidate()
+            return rows
+
+        with mock.patch.object(PlatformSettings.objects, "values_list", side_effect=load):
+            self.assertEqual(store.get().get_str("key"), "old")
+        PlatformSettings.objects.create(key="key", value="new")
+        self.assertEqual(store.get().get_str("key"), "new")
+        self.assertIs(store.get(), store.get())
+
+    async def test_aget(self):
+        await PlatformSettings.objects.acreate(key="platform_fee", value="6")
+        settings_store.invalidate()
+        self.assertEqual((await aget_settings()).platform_fee, 6.0)
+        self.assertIs(await aget_settings(), get_settings())
+
+
+class BulkCreateJobsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = WebThreeUser.objects.create(username="client", wallet_address="0xclient")
+        cls.job_type = JobType.objects.create(name="Development")
+
+    def setUp(self):
+        user_cache.clear()
+
+    def item(self, index, **fields):
+        return dict({"title": f"Job {index}", "description": "Work", "amount": 1,
+                     "job_type": self.job_type.id}, **fields)
+
+    def post(self, items):
+        return self.client.post("/api/jobs/bulk", {"jobs": items}, content_type="application/json",
+                                **auth_header(self.user))
+
+    def test_size_limits(self):
+        self.assertEqual(self.post([]).status_code, 400)
+        with override_settings(JOB_BULK_MAX_SIZE=2):
+            self.assertEqual(self.post([self.item(i) for i in range(3)]).status_code, 400)
+            self.assertEqual(self.post([self.item(i) for i in range(2)]).status_code, 200)
+        self.assertEqual(Job.objects.count(), 2)
+
+    @override_settings(JOB_BULK_BATCH_SIZE=2)
+    def test_inserted_in_batches(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post([self.item(i) for i in range(5)])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["created"], 5)
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "freelancer_platform_app_job"')]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(sorted(Job.objects.values_list("title", flat=True)),
+                         [f"Job {i}" for i in range(5)])
+
+    def test_unknown_job_type_is_reported(self):
+        response = self.post([self.item(0), self.item(1, job_type=self.job_type.id + 1), self.item(2)])
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual((body["created"], body["failed"]), (2, 1))
+        self.assertEqual([(r["index"], r["error"]) for r in body["results"]],
+                         [(0, None), (1, "Invalid job type provided"), (2, None)])
+        self.assertEqual(body["results"][2]["job"]["title"], "Job 2")
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_invalid_item_rejects_the_batch(self):
+        items = [self.item(0), {"title": "No amount", "description": "Work",
+                                "job_type": self.job_type.id}]
+        self.assertEqual(self.post(items).status_code, 422)
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOB_BULK_BATCH_SIZE=2)
+    def test_all_or_nothing(self):
+        # The third job reuses the first one's id, its batch fails
+        ids = iter([MARKER + 1, MARKER + 2, MARKER + 1])
+        with mock.patch("freelancer_platform_app.api.next_job_id", lambda: next(ids)):
+            with self.assertRaises(IntegrityError):
+                self.post([self.item(i) for i in range(3)])
+        self.assertFalse(Job.objects.exists())
+
+    def test_requires_authentication(self):
+        response = self.client.post("/api/jobs/bulk", {"jobs": [self.item(0)]},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 401)
+
+
+class ChatHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        (cls.client_user, _, cls.picker, _, _, _, cls.pushed) = create_budget_fixture()
+        cls.path = f"/api/jobs/{cls.pushed.id}/chat"
+        cls.ids = list(ChatMessage.objects.filter(job=cls.pushed).order_by("id")
+                       .values_list("id", flat=True))
+
+    def fetch(self, **params):
+        response = self.client.get(self.path, params, **auth_header(self.picker))
+        self.assertEqual(response.status_code, 200, response.content)
+        return [message["id"] for message in response.json()]
+
+    def test_latest(self):
+        self.assertEqual(self.fetch(), self.ids)
+        self.assertEqual(self.fetch(limit=2), self.ids[1:])
+
+    def test_since_id(self):
+        self.assertEqual(self.fetch(since_id=self.ids[0]), self.ids[1:])
+        self.assertEqual(self.fetch(since_id=self.ids[-1]), [])
+
+    def test_before_id(self):
+        self.assertEqual(self.fetch(before_id=self.ids[-1]), self.ids[:-1])
+        self.assertEqual(self.fetch(before_id=self.ids[-1], limit=1), self.ids[1:2])
+
+    def test_since_and_before_id(self):
+        response = self.client.get(
+            self.path, {"since_id": self.ids[0], "before_id": self.ids[-1]},
+            **auth_header(self.picker))
+        self.assertEqual(response.status_code, 400)
+
+
+def chain_event(name, block, transaction_hash, job, wallet):
+    arg = "client" if name == "JobCreated" else "freelancer"
+    return {"eventName": name, "blockNumber": block, "transactionHash": transaction_hash,
+            "args": {"jobId": str(job.id), arg: wallet.wallet_address}}
+
+
+class ChainIngestTests(TestCase):
+    key = "test_crawl"
+
+    def setUp(self):
+        self.client_user = WebThreeUser.objects.create(username="client", wallet_address="0xclient")
+        self.freelancer = WebThreeUser.objects.create(
+            username="freelancer", wallet_address="0xfreelancer")
+        self.job = Job.objects.create(
+            title="Indexer", description="Crawl contract events", client=self.client_user,
+            amount=10)
+        self.crawl = LastIndexCrawl.objects.create(key=self.key, start_at="1")
+        self.source = StaticEventSource([
+            chain_event("JobCreated", 10, "0xa", self.job, self.client_user),
+            chain_event("JobAccepted", 1500, "0xb", self.job, self.freelancer),
+        ])
+
+    def assertJob(self, status, transaction_create, transaction_accept_job, freelancer):
+        self.job.refresh_from_db()
+        self.assertEqual(
+            (self.job.status, self.job.transaction_create, self.job.transaction_accept_job,
+             self.job.freelancer),
+            (status, transaction_create, transaction_accept_job, freelancer))
+
+    def test_ingest(self):
+        self.assertEqual(ingest(self.source, self.key, window=1000), (2, 2, 1500))
+        self.assertJob("ACCEPTED", "0xa", "0xb", self.freelancer)
+        self.crawl.refresh_from_db()
+        self.assertEqual(self.crawl.value, "1500")
+        # Nothing left to crawl
+        self.assertEqual(ingest(self.source, self.key, window=1000), (0, 0, 1500))
+
+    def test_ingest_stops_when_position_moves(self):
+        key = self.key
+
+        class RollingBackSource(StaticEventSource):
+            def events(self, from_block, to_block):
+                if from_block > 1:
+                    # A rollback committed while the first window was applied
+                    LastIndexCrawl.objects.filter(key=key).update(value="5")
+                return super().events(from_block, to_block)
+
+        source = RollingBackSource([
+            chain_event("JobCreated", 10, "0xa", self.job, self.client_user),
+            chain_event("JobAccepted", 1500, "0xb", self.job, self.freelancer),
+        ])
+        with self.assertRaises(CrawlPositionMoved):
+            ingest(source, self.key, window=1000)
+        self.crawl.refresh_from_db()
+        self.assertEqual(self.crawl.value, "5")
+
+    def test_replayed_window_is_skipped(self):
+        self.assertEqual(apply_window(self.source, self.key, 1, 2000), (2, 1))
+        self.assertEqual(apply_window(self.source, self.key, 1, 2000), (2, 0))
+        self.assertEqual(ProcessedEvent.objects.filter(applied=True).count(), 2)
+        self.assertJob("ACCEPTED", "0xa", "0xb", self.freelancer)
+
+    def test_windows_applied_out_of_order(self):
+        self.assertEqual(apply_window(self.source, self.key, 1001, 2000), (1, 1))
+        self.assertEqual(apply_window(self.source, self.key, 1, 1000), (1, 1))
+        # The earlier JobCreated records its transaction but keeps the status
+        self.assertJob("ACCEPTED", "0xa", "0xb", self.freelancer)
+
+    def test_unknown_wallet_is_retried(self):
+        newcomer = WebThreeUser(username="newcomer", wallet_address="0xnewcomer")
+        source = StaticEventSource([
+            chain_event("JobCreated", 10, "0xa", self.job, self.client_user),
+            chain_event("JobAccepted", 20, "0xb", self.job, newcomer),
+        ])
+        self.assertEqual(ingest(source, self.key, window=1000), (2, 1, 20))
+        self.assertFalse(ProcessedEvent.objects.get(transaction_hash="0xb").applied)
+        self.assertJob("PUSHED", "0xa", None, None)
+
+        # Still unknown: nothing to do
+        self.assertEqual(ingest(source, self.key, window=1000), (0, 0, 20))
+        newcomer.save()
+        self.assertEqual(ingest(source, self.key, window=1000), (0, 1, 20))
+        self.assertJob("ACCEPTED", "0xa", "0xb", newcomer)
+        record = ProcessedEvent.objects.get(transaction_hash="0xb")
+        self.assertTrue(record.applied)
+        self.assertEqual(record.job_id, self.job.id)
+        # Applied retries are rolled back like any other event
+        self.assertEqual(rollback(self.key, 10), (1, 10))
+        self.assertJob("PUSHED", "0xa", None, None)
+
+    def test_unknown_job_is_retried(self):
+        later = Job(id=self.job.id + 1000, title="Audit", description="Audit the escrow",
+                    client=self.client_user, amount=5)
+        source = StaticEventSource([chain_event("JobCreated", 10, "0xc", later, self.client_user)])
+        self.assertEqual(ingest(source, self.key, window=1000), (1, 0, 10))
+        record = ProcessedEvent.objects.get()
+        self.assertEqual((record.applied, record.job), (False, None))
+
+        later.save()
+        self.assertEqual(ingest(source, self.key, window=1000), (0, 1, 10))
+        later.refresh_from_db()
+        self.assertEqual((later.status, later.transaction_create), ("PUSHED", "0xc"))
+        record.refresh_from_db()
+        self.assertEqual((record.applied, record.job_id), (True, later.id))
+
+    def test_rollback(self):
+        original = (self.job.status, self.job.transaction_create,
+                    self.job.transaction_accept_job, None)
+        ingest(self.source, self.key, window=1000)
+        self.assertEqual(rollback(self.key, 1000), (1, 500))
+        self.assertJob("PUSHED", "0xa", original[2], None)
+        self.assertEqual(rollback(self.key, 500), (1, 0))
+        self.assertJob(*original)
+        self.crawl.refresh_from_db()
+        self.assertEqual(self.crawl.value, "0")
+
+        self.assertEqual(ingest(self.source, self.key, window=1000), (2, 2, 1500))
+        self.assertJob("ACCEPTED", "0xa", "0xb", self.freelancer)
+
+    def test_rollback_after_windows_applied_out_of_order(self):
+        transaction_accept_job = self.job.transaction_accept_job
+        # As parallel workers may: the later window commits first
+        apply_window(self.source, self.key, 1001, 2000)
+        apply_window(self.source, self.key, 1, 1000)
+        self.assertJob("ACCEPTED", "0xa", "0xb", self.freelancer)
+        LastIndexCrawl.objects.filter(id=self.crawl.id).update(value="2000")
+
+        self.assertEqual(rollback(self.key, 1000), (1, 1000))
+        self.assertJob("PUSHED", "0xa", transaction_accept_job, None)
+        self.assertEqual(ingest(self.source, self.key, window=1000), (1, 1, 1500))
+        self.assertJob("ACCEPTED", "0xa", "0xb", self.freelancer)
+
+
+class BenchmarkCommandTests(TransactionTestCase):
+    """
+    ``benchmark_api`` runs every endpoint it knows against a small seeded
+    dataset without server errors. Its requests run on worker threads,
+    which only see committed data.
+    """
+
+    def setUp(self):
+        use_own_chat_broker(self)
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media = media.name
+        call_command("seed_benchmark_data", users=20, jobs=100, picks=200, messages=300,
+                     stdout=io.StringIO())
+
+    def test_all_endpoints(self):
+        output = os.path.join(self.media, "results.json")
+        stdout = io.StringIO()
+        with override_settings(MEDIA_ROOT=self.media,
+                               UPLOAD_SESSION_DIR=os.path.join(self.media, ".partial")):
+            call_command("benchmark_api", mix="all", requests=200, warmup=0, concurrency=1,
+                         output=output, stdout=stdout)
+            call_command("benchmark_api", mix="browse", requests=20, warmup=0, concurrency=1,
+                         compare=output, stdout=stdout)
+
+        with open(output) as f:
+            report = json.load(f)
+        self.assertEqual(report["overall"]["requests"], 200)
+        self.assertEqual(report["overall"]["errors"], 0, report["overall"]["statuses"])
+        self.assertEqual(set(report["endpoints"]), set(ENDPOINTS))
+        self.assertIsNotNone(report["overall"]["queries_per_request"])
+        self.assertIn("Compared with", stdout.getvalue())
+
+
+class StoreFileTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_root = override_settings(MEDIA_ROOT=media.name)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+    def store(self, content=b"resume"):
+        file = ContentFile(content)
+        return store_file(file, "resume.txt", content_hash(file), len(content), "text/plain")
+
+    def test_identical_content_is_stored_once(self):
+        file_name = self.store()
+        self.assertEqual(self.store(), file_name)
+        self.assertNotEqual(self.store(b"other"), file_name)
+        self.assertEqual(StoredFile.objects.count(), 2)
+
+    def test_missing_file_is_stored_again(self):
+        file_name = self.store()
+        default_storage.delete(file_name)
+
+        stored_again = self.store()
+        self.assertNotEqual(stored_again, file_name)
+        with default_storage.open(stored_again) as f:
+            self.assertEqual(f.read(), b"resume")
+        self.assertEqual(StoredFile.objects.get().file_name, stored_again)
+        self.assertEqual(self.store(), stored_again)
+
+
+class ReadFileTests(TestCase):
+    content = b"resume"
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_root = override_settings(MEDIA_ROOT=media.name, FILE_SERVE_X_ACCEL=False)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+        self.file_name = default_storage.save("resume.txt", ContentFile(self.content))
+        self.path = f"/api/read-file/{self.file_name}"
+
+    async def get(self, **headers):
+        response = await self.async_client.get(self.path, headers=headers)
+        body = b""
+        if response.streaming:
+            body = b"".join([chunk async for chunk in response.streaming_content])
+        return response, body
+
+    async def test_full_file(self):
+        response, body = await self.get()
+        self.assertEqual((response.status_code, body), (200, self.content))
+        self.assertEqual(response["Content-Length"], str(len(self.content)))
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+    async def test_conditional(self):
+        response, _ = await self.get()
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+
+        response, body = await self.get(**{"If-None-Match": etag})
+        self.assertEqual((response.status_code, body), (304, b""))
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual((await self.get(**{"If-None-Match": '"other"'}))[0].status_code, 200)
+
+        self.assertEqual((await self.get(**{"If-Modified-Since": last_modified}))[0].status_code, 304)
+        earlier = http_date(parse_http_date(last_modified) - 60)
+        self.assertEqual((await self.get(**{"If-Modified-Since": earlier}))[0].status_code, 200)
+
+    async def test_single_range(self):
+        for header, content_range, expected in [
+            ("bytes=1-3", "bytes 1-3/6", b"esu"),
+            ("bytes=4-", "bytes 4-5/6", b"me"),
+            ("bytes=-2", "bytes 4-5/6", b"me"),
+            ("bytes=2-100", "bytes 2-5/6", b"sume"),
+        ]:
+            with self.subTest(header=header):
+                response, body = await self.get(Range=header)
+                self.assertEqual((response.status_code, body), (206, expected))
+                self.assertEqual(response["Content-Range"], content_range)
+                self.assertEqual(response["Content-Length"], str(len(expected)))
+
+    async def test_ignored_ranges(self):
+        for headers in [{"Range": "bytes=0-1,3-4"}, {"Range": "lines=1-2"},
+                        {"Range": "bytes=1-3", "If-Range": '"stale"'}]:
+            with self.subTest(headers=headers):
+                response, body = await self.get(**headers)
+                self.assertEqual((response.status_code, body), (200, self.content))
+
+    async def test_range_not_satisfiable(self):
+        response, _ = await self.get(Range="bytes=6-10")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */6")
+
+    async def test_missing_file(self):
+        response = await self.async_client.get("/api/read-file/missing.txt")
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(FILE_SERVE_X_ACCEL=True, FILE_X_ACCEL_PREFIX="/protected-media/")
+    async def test_x_accel_redirect(self):
+        response = await self.async_client.get(self.path, headers={"Range": "bytes=1-3"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.file_name}")
+        self.assertEqual(response.content, b"")
+        self.assertIn("ETag", response)
+        self.assertNotIn("Content-Range", response)
+
+
+class UploadSessionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = WebThreeUser.objects.create(username="uploader", wallet_address="0xuploader")
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.session_dir = os.path.join(media.name, ".partial")
+        media_root = override_settings(MEDIA_ROOT=media.name, UPLOAD_SESSION_DIR=self.session_dir)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+    def start(self, **headers):
+        return self.client.post(
+            "/api/uploads", {"file_name": "notes.txt", "size": 5, "content_type": "text/plain"},
+            content_type="application/json", **headers)
+
+    def expire(self, upload_id):
+        UploadSession.objects.filter(id=upload_id).update(
+            created_at=timezone.now() - timedelta(seconds=settings.UPLOAD_SESSION_TTL + 1))
+
+    def test_start_requires_authentication(self):
+        self.assertEqual(self.start().status_code, 401)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_upload(self):
+        upload_id = self.start(**auth_header(self.user)).json()["id"]
+        response = self.client.put(f"/api/uploads/{upload_id}?offset=0", b"notes",
+                                   content_type="application/octet-stream")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIsNotNone(response.json()["file_name"])
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_chunk_overwrites_uncommitted_bytes(self):
+        upload_id = self.start(**auth_header(self.user)).json()["id"]
+        # A chunk written before its transaction rolled back
+        with open(session_path(upload_id), "wb") as part:
+            part.write(b"lost chunk")
+        response = self.client.put(f"/api/uploads/{upload_id}?offset=0", b"notes",
+                                   content_type="application/octet-stream")
+        self.assertEqual(response.status_code, 200, response.content)
+        with default_storage.open(response.json()["file_name"]) as stored:
+            self.assertEqual(stored.read(), b"notes")
+
+    def test_corrupt_upload_is_not_stored(self):
+        upload_id = self.start(**auth_header(self.user)).json()["id"]
+        UploadSession.objects.filter(id=upload_id).update(received=5)
+        with self.assertRaises(HttpError) as raised:
+            complete_session(UploadSession.objects.get(id=upload_id))
+        self.assertEqual(raised.exception.status_code, 409)
+        self.assertFalse(StoredFile.objects.exists())
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.path.exists(session_path(upload_id)))
+
+    def test_expired_upload_is_rejected(self):
+        upload_id = self.start(**auth_header(self.user)).json()["id"]
+        self.expire(upload_id)
+        self.assertEqual(self.client.get(f"/api/uploads/{upload_id}").status_code, 410)
+        response = self.client.put(f"/api/uploads/{upload_id}?offset=0", b"notes",
+                                   content_type="application/octet-stream")
+        self.assertEqual(response.status_code, 410)
+
+    def test_clear_upload_sessions(self):
+        expired = self.start(**auth_header(self.user)).json()["id"]
+        live = self.start(**auth_header(self.user)).json()["id"]
+        self.expire(expired)
+        orphan = os.path.join(self.session_dir, "orphan.part")
+        open(orphan, "wb").close()
+        old = time.time() - settings.UPLOAD_SESSION_TTL - 1
+        os.utime(orphan, (old, old))
+
+        call_command("clear_upload_sessions", stdout=io.StringIO())
+
+        self.assertEqual(list(UploadSession.objects.values_list("id", flat=True)), [uuid.UUID(live)])
+        self.assertFalse(os.path.exists(session_path(expired)))
+        self.assertTrue(os.path.exists(session_path(live)))
+        self.assertFalse(os.path.exists(orphan))
+
+
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_root = override_settings(MEDIA_ROOT=media.name)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+        image = io.BytesIO()
+        Image.new("RGB", (400, 300), "red").save(image, "PNG")
+        self.file_name = default_storage.save("photo.png", ContentFile(image.getvalue()))
+
+    def test_variant(self):
+        response = self.client.get(f"/api/read-file/{self.file_name}?size=150")
+        self.assertEqual(response.status_code, 200)
+        with Image.open(io.BytesIO(b"".join(response))) as variant:
+            self.assertEqual((variant.format, variant.size), ("WEBP", (150, 113)))
+
+    def test_decompression_bomb(self):
+        # Over twice the limit Pillow refuses to decode the image at all
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 400 * 300 // 3):
+            response = self.client.get(f"/api/read-file/{self.file_name}?size=150")
+        self.assertEqual(response.status_code, 400)
+
+
+# Largest integer JavaScript numbers represent exactly
+MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+
+def generate_ids(lock_dir, count):
+    # Runs in a worker process with a generator (and slot) of its own
+    generator = SnowflakeGenerator(1, lock_dir)
+    return [generator.next_id() for _ in range(count)]
+
+
+class JobIdTests(SimpleTestCase):
+    def setUp(self):
+        lock_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(lock_dir.cleanup)
+        self.lock_dir = lock_dir.name
+
+    def assertValidIds(self, ids):
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertTrue(all(MARKER < job_id <= MAX_SAFE_INTEGER for job_id in ids))
+
+    def split(self, job_id):
+        # (seconds since EPOCH, sequence)
+        return (job_id ^ MARKER) >> (HOST_BITS + SLOT_BITS + SEQUENCE_BITS), job_id & MAX_SEQUENCE
+
+    def test_threads(self):
+        generator = SnowflakeGenerator(1, self.lock_dir)
+        results = [[] for _ in range(8)]
+
+        def run(ids):
+            for _ in range(2000):
+                ids.append(generator.next_id())
+
+        workers = [threading.Thread(target=run, args=(ids,)) for ids in results]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        for ids in results:
+            self.assertEqual(ids, sorted(ids))
+        self.assertValidIds([job_id for ids in results for job_id in ids])
+
+    def test_processes(self):
+        with multiprocessing.get_context("fork").Pool(4) as pool:
+            results = pool.starmap(generate_ids, [(self.lock_dir, 2000)] * 4)
+        for ids in results:
+            self.assertEqual(ids, sorted(ids))
+        self.assertValidIds([job_id for ids in results for job_id in ids])
+
+    def test_sequence_overflow_moves_to_next_second(self):
+        generator = SnowflakeGenerator(1, self.lock_dir)
+        with mock.patch("freelancer_platform_app.ids.time.time", return_value=EPOCH + 1000.5):
+            ids = [generator.next_id() for _ in range(MAX_SEQUENCE + 3)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertValidIds(ids)
+        self.assertEqual(self.split(ids[MAX_SEQUENCE]), (1000, MAX_SEQUENCE))
+        self.assertEqual(self.split(ids[MAX_SEQUENCE + 1]), (1001, 0))
+
+    def test_clock_regression_never_repeats(self):
+        generator = SnowflakeGenerator(1, self.lock_dir)
+        clock = [EPOCH + 1000, EPOCH + 995, EPOCH + 995, EPOCH + 1001]
+        with mock.patch("freelancer_platform_app.ids.time.time", side_effect=clock):
+            ids = [generator.next_id() for _ in clock]
+        self.assertEqual(ids, sorted(ids))
+        self.assertValidIds(ids)
+        # Stays in the last second seen until the clock passes it
+        self.assertEqual([self.split(job_id) for job_id in ids],
+                         [(1000, 0), (1000, 1), (1000, 2), (1001, 0)])
+
+    def test_slot_taken_over_within_a_second(self):
+        first = SnowflakeGenerator(1, self.lock_dir)
+        with mock.patch("freelancer_platform_app.ids.time.time", return_value=EPOCH + 1000):
+            before = [first.next_id() for _ in range(MAX_SEQUENCE + 2)]
+            first.reset()
+            # Claims the slot the first generator released
+            after = SnowflakeGenerator(1, self.lock_dir).next_id()
+        self.assertGreater(after, max(before))
+        self.assertEqual(self.split(after), (1002, 0))
+
+    def test_invalid_host(self):
+        with self.assertRaises(ValueError):
+            SnowflakeGenerator(16, self.lock_dir)
+
+    def test_slots_exhausted(self):
+        files = [claim_slot(self.lock_dir)[1] for _ in range(MAX_SLOT + 1)]
+        try:
+            with self.assertRaises(IdSpaceExhausted):
+                claim_slot(self.lock_dir)
+        finally:
+            for file in files:
+                file.close()
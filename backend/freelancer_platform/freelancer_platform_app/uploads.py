@@ -0,0 +1,212 @@
+import hashlib
+import os
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from ninja.errors import HttpError
+
+from .models import StoredFile, UploadSession
+
+CHUNK_SIZE = 64 * 1024
+
+# Allowance for multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+READ_FILE_ROOT = "/api/read-file"
+
+
+def file_url(file_name):
+    return f"{READ_FILE_ROOT}/{file_name}"
+
+
+def check_content_type(content_type):
+    if content_type not in settings.UPLOAD_ALLOWED_CONTENT_TYPES:
+        raise HttpError(415, f"Unsupported file type: {content_type}")
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams uploads to a temporary file while computing their SHA-256.
+
+    Oversized requests are rejected from ``Content-Length`` before the body
+    is parsed, and files with a disallowed content type as soon as their
+    part header is seen. The digest is available as ``file.sha256``.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if content_length > settings.UPLOAD_MAX_SIZE + MULTIPART_OVERHEAD:
+            raise HttpError(413, "File too large")
+
+    def new_file(self, field_name, file_name, content_type, *args, **kwargs):
+        check_content_type(content_type)
+        super().new_file(field_name, file_name, content_type, *args, **kwargs)
+        self.sha256 = hashlib.sha256()
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.UPLOAD_MAX_SIZE:
+            raise HttpError(413, "File too large")
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.sha256.hexdigest()
+        return file
+
+
+def content_hash(file):
+    digest = getattr(file, "sha256", None)
+    if digest is None:
+        # Not received through HashingUploadHandler
+        sha256 = hashlib.sha256()
+        for chunk in file.chunks(CHUNK_SIZE):
+            sha256.update(chunk)
+        file.seek(0)
+        digest = sha256.hexdigest()
+    return digest
+
+
+def store_file(file, original_name, sha256, size, content_type):
+    """
+    Saves ``file`` under a new random name unless identical content was
+    uploaded before, in which case the existing name is returned. A row
+    whose file is gone from storage gets the new copy instead.
+    """
+    existing = StoredFile.objects.filter(sha256=sha256).first()
+    if existing is not None and default_storage.exists(existing.file_name):
+        return existing.file_name
+
+    file_extension = os.path.splitext(original_name)[1]
+    file_name = default_storage.save(f"{uuid.uuid4().hex}{file_extension}", file)
+    if existing is not None:
+        StoredFile.objects.filter(id=existing.id).update(
+            file_name=file_name, size=size, content_type=content_type)
+        return file_name
+    try:
+        with transaction.atomic():
+            StoredFile.objects.create(
+                sha256=sha256, file_name=file_name, size=size, content_type=content_type)
+    except IntegrityError:
+        # An identical upload finished first, keep its copy
+        default_storage.delete(file_name)
+        return StoredFile.objects.get(sha256=sha256).file_name
+    return file_name
+
+
+def session_path(session_id):
+    return os.path.join(settings.UPLOAD_SESSION_DIR, f"{session_id}.part")
+
+
+def session_expires_at(session):
+    return session.created_at + timedelta(seconds=settings.UPLOAD_SESSION_TTL)
+
+
+def check_session(session):
+    if session is None:
+        raise HttpError(404, "Upload not found")
+    if session_expires_at(session) <= timezone.now():
+        raise HttpError(410, "Upload expired, start a new one")
+
+
+def create_session(file_name, size, content_type):
+    check_content_type(content_type)
+    if size <= 0 or size > settings.UPLOAD_RESUMABLE_MAX_SIZE:
+        raise HttpError(413, "File too large")
+    session = UploadSession.objects.create(
+        file_name=file_name, size=size, content_type=content_type)
+    os.makedirs(settings.UPLOAD_SESSION_DIR, exist_ok=True)
+    open(session_path(session.id), "wb").close()
+    return session
+
+
+def append_chunk(session_id, offset, data):
+    """
+    Appends ``data`` at ``offset``. Returns the session and, once the last
+    byte has arrived and the file was stored, its stored name.
+    """
+    if len(data) > settings.UPLOAD_CHUNK_MAX_SIZE:
+        raise HttpError(413, "Chunk too large")
+
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().filter(id=session_id).first()
+        check_session(session)
+        if offset != session.received:
+            raise HttpError(409, f"Expected offset {session.received}")
+        if offset + len(data) > session.size:
+            raise HttpError(400, "Chunk exceeds the declared file size")
+
+        # Written at the offset rather than appended: bytes left behind by a
+        # write whose transaction did not commit are overwritten
+        with open(session_path(session.id), "r+b") as part:
+            part.seek(offset)
+            part.write(data)
+            part.truncate()
+        session.received += len(data)
+        session.save(update_fields=["received", "updated_at"])
+
+    if session.received < session.size:
+        return session, None
+    return session, complete_session(session)
+
+
+def complete_session(session):
+    path = session_path(session.id)
+    if os.path.getsize(path) != session.size:
+        os.remove(path)
+        UploadSession.objects.filter(id=session.id).delete()
+        raise HttpError(409, "Upload is corrupt, start a new one")
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as part:
+        for chunk in iter(lambda: part.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+        part.seek(0)
+        file_name = store_file(
+            File(part), session.file_name, sha256.hexdigest(), session.size, session.content_type)
+    os.remove(path)
+    UploadSession.objects.filter(id=session.id).delete()
+    return file_name
+
+
+def clear_expired_sessions():
+    """
+    Deletes expired upload sessions with their partial files, and partial
+    files older than the TTL that no session owns. Returns how many of
+    each were deleted.
+    """
+    expired_before = timezone.now() - timedelta(seconds=settings.UPLOAD_SESSION_TTL)
+    sessions = 0
+    expired = UploadSession.objects.filter(created_at__lt=expired_before)
+    for session_id in list(expired.values_list("id", flat=True)):
+        with transaction.atomic():
+            # Skipped if a chunk is being appended right now
+            if not UploadSession.objects.select_for_update(skip_locked=True)\
+                    .filter(id=session_id).exists():
+                continue
+            UploadSession.objects.filter(id=session_id).delete()
+            try:
+                os.remove(session_path(session_id))
+            except FileNotFoundError:
+                pass
+        sessions += 1
+
+    orphans = 0
+    if os.path.isdir(settings.UPLOAD_SESSION_DIR):
+        live = {str(session_id) for session_id in UploadSession.objects.values_list("id", flat=True)}
+        cutoff = time.time() - settings.UPLOAD_SESSION_TTL
+        for entry in os.scandir(settings.UPLOAD_SESSION_DIR):
+            session_id, extension = os.path.splitext(entry.name)
+            if extension != ".part" or session_id in live:
+                continue
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                orphans += 1
+    return sessions, orphans
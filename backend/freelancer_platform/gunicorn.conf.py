@@ -0,0 +1,22 @@
+# Production ASGI server config:
+#   gunicorn freelancer_platform.asgi:application -c gunicorn.conf.py
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Chat messages reach the WebSockets of every worker through PostgreSQL
+# (see CHAT_BROKER). Set WEB_CONCURRENCY=1 with the in-process LocalBroker.
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = "-"
+errorlog = "-"
@@ -16,6 +16,9 @@ interface ChatProps {
   onSendMessage: (message: string) => void;
   isLoading?: boolean;
   className?: string;
+  onLoadOlder?: () => void;
+  hasOlder?: boolean;
+  isLoadingOlder?: boolean;
 }
 
 const Chat: React.FC<ChatProps> = ({
@@ -24,6 +27,9 @@ const Chat: React.FC<ChatProps> = ({
   onSendMessage,
   isLoading = false,
   className = "",
+  onLoadOlder,
+  hasOlder = false,
+  isLoadingOlder = false,
 }) => {
   const [newMessage, setNewMessage] = useState("");
   const messagesEndRef = useRef<HTMLDivElement>(null);
@@ -33,9 +39,11 @@ const Chat: React.FC<ChatProps> = ({
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
   };
 
+  // Only new messages scroll, not older ones loaded above
+  const lastMessageId = messages[messages.length - 1]?.id;
   useEffect(() => {
     scrollToBottom();
-  }, [messages]);
+  }, [lastMessageId]);
 
   const handleSend = () => {
     if (!newMessage.trim()) return;
@@ -66,6 +74,17 @@ const Chat: React.FC<ChatProps> = ({
           backgroundSize: "24px 24px",
         }}
       >
+        {onLoadOlder && hasOlder && (
+          <div className="flex justify-center">
+            <button
+              className="text-sm text-blue-500 hover:underline disabled:text-gray-400"
+              onClick={onLoadOlder}
+              disabled={isLoadingOlder}
+            >
+              {isLoadingOlder ? "Loading..." : "Load older messages"}
+            </button>
+          </div>
+        )}
         {messages.length === 0 ? (
           <div className="flex items-center justify-center h-full text-gray-500">
             No messages yet. Start the conversation!
@@ -7,7 +7,8 @@ import { useConnectModal } from "@rainbow-me/rainbowkit";
 import { useEffect, useState } from "react";
 import { AiOutlineClose, AiOutlineMenu } from "react-icons/ai";
 import { Link, useNavigate } from "react-router-dom";
-import { useAccount, useDisconnect } from "wagmi";
+import { useAccount, useDisconnect, useSignMessage } from "wagmi";
+import { imageVariant } from "@/utils/string";
 
 const NavigationBar = () => {
   const navigate = useNavigate();
@@ -20,8 +21,9 @@ const NavigationBar = () => {
   const { isConnected, address } = useAccount();
   const { openConnectModal } = useConnectModal();
   const { disconnect } = useDisconnect();
+  const { signMessageAsync } = useSignMessage();
 
-  const userImage = user?.image || "https://placehold.co/50x50";
+  const userImage = imageVariant(user?.image, 150) || "https://placehold.co/50x50";
   const walletAddress = getWalletAddress();
   const handleUserIconClick = () => navigate(UrlMapping.user_info);
 
@@ -44,7 +46,10 @@ const NavigationBar = () => {
   useEffect(() => {
     if (isConnected && address) {
       loginMutate(
-        { wallet_address: address },
+        {
+          wallet_address: address,
+          signMessage: (message) => signMessageAsync({ message }),
+        },
         {
           onSuccess: async (data) => {
             try {
@@ -63,7 +68,7 @@ const NavigationBar = () => {
     } else {
       logout();
     }
-  }, [isConnected, address, loginMutate, logout, login]);
+  }, [isConnected, address, loginMutate, logout, login, signMessageAsync]);
 
   return (
     <header
@@ -0,0 +1,92 @@
+import { fetchChatMessages, IChatMessage } from "@/services/apis/core";
+import { useCallback, useEffect, useRef, useState } from "react";
+
+const PAGE_SIZE = 50;
+const POLL_INTERVAL = 1000;
+
+interface UseChatMessagesReturn {
+  messages: IChatMessage[];
+  // Fetches the messages sent since the last one shown, e.g. after sending
+  refresh: () => Promise<void>;
+  loadOlder: () => Promise<void>;
+  hasOlder: boolean;
+  isLoadingOlder: boolean;
+}
+
+// The conversation between userA and userB on a job: the latest page first,
+// then polled with since_id for new messages, and extended with before_id
+// when the user asks for older ones
+export function useChatMessages(
+  jobId: number,
+  userA?: string,
+  userB?: string
+): UseChatMessagesReturn {
+  const [messages, setMessages] = useState<IChatMessage[]>([]);
+  const [hasOlder, setHasOlder] = useState<boolean>(false);
+  const [isLoadingOlder, setIsLoadingOlder] = useState<boolean>(false);
+  // Read by the poller without restarting it on every new message
+  const messagesRef = useRef<IChatMessage[]>([]);
+  const conversationRef = useRef<string>("");
+  const enabled = Boolean(userA && userB);
+  const conversation = `${jobId}:${userA}:${userB}`;
+
+  const update = (next: IChatMessage[]) => {
+    messagesRef.current = next;
+    setMessages(next);
+  };
+
+  const refresh = useCallback(async () => {
+    if (!enabled) return;
+    const current = messagesRef.current;
+    const last = current[current.length - 1];
+    const fetched = await fetchChatMessages(jobId, userA, userB, {
+      sinceId: last?.id,
+      limit: PAGE_SIZE,
+    });
+    // The conversation changed while the request was in flight
+    if (conversationRef.current !== conversation) return;
+    if (last === undefined) {
+      setHasOlder(fetched.length === PAGE_SIZE);
+      update(fetched);
+    } else {
+      // Overlapping polls can return the same messages twice
+      const latest = messagesRef.current[messagesRef.current.length - 1];
+      const newer = fetched.filter((message) => message.id > latest.id);
+      if (newer.length > 0) {
+        update([...messagesRef.current, ...newer]);
+      }
+    }
+  }, [enabled, conversation, jobId, userA, userB]);
+
+  const loadOlder = useCallback(async () => {
+    const first = messagesRef.current[0];
+    if (!enabled || first === undefined) return;
+    setIsLoadingOlder(true);
+    try {
+      const fetched = await fetchChatMessages(jobId, userA, userB, {
+        beforeId: first.id,
+        limit: PAGE_SIZE,
+      });
+      if (conversationRef.current !== conversation) return;
+      setHasOlder(fetched.length === PAGE_SIZE);
+      update([...fetched, ...messagesRef.current]);
+    } finally {
+      setIsLoadingOlder(false);
+    }
+  }, [enabled, conversation, jobId, userA, userB]);
+
+  useEffect(() => {
+    conversationRef.current = conversation;
+    update([]);
+    setHasOlder(false);
+    if (!enabled) return;
+
+    refresh().catch(() => undefined);
+    const intervalId = setInterval(() => {
+      refresh().catch(() => undefined);
+    }, POLL_INTERVAL);
+    return () => clearInterval(intervalId);
+  }, [enabled, conversation, refresh]);
+
+  return { messages, refresh, loadOlder, hasOlder, isLoadingOlder };
+}
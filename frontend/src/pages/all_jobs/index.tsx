@@ -10,8 +10,8 @@ import React, { useState } from "react";
 import { useNavigate } from "react-router-dom";
 
 interface FilterValues {
-  page?: number;
-  page_size?: number;
+  limit?: number;
+  cursor?: string;
   job_type_id?: number;
   min_amount?: number;
   max_amount?: number;
@@ -25,8 +25,8 @@ const AllJobsPage: React.FC = () => {
   const { data: jobTypes, isLoading: isJobTypesLoading } = useJobTypes();
 
   const [filterValues, setFilterValues] = useState<FilterValues>({
-    page: 1,
-    page_size: 10,
+    limit: 10,
+    cursor: undefined,
     job_type_id: undefined,
     min_amount: undefined,
     max_amount: undefined,
@@ -35,12 +35,17 @@ const AllJobsPage: React.FC = () => {
   });
 
   const {
-    data: jobs,
+    data: page,
     isLoading,
     error,
   } = useJobs({
     variables: filterValues,
   });
+  const jobs = page?.items;
+
+  const goToPage = (cursor?: string) => {
+    setFilterValues((prev) => ({ ...prev, cursor }));
+  };
 
   const handleFilterChange = (
     field: keyof FilterValues,
@@ -57,7 +62,7 @@ const AllJobsPage: React.FC = () => {
     setFilterValues((prev) => ({
       ...prev,
       [field]: parsedValue,
-      page: 1,
+      cursor: undefined,
     }));
   };
 
@@ -233,6 +238,25 @@ const AllJobsPage: React.FC = () => {
               )}
             </ul>
           )}
+
+          {!isLoading && page && (page.prevCursor || page.nextCursor) && (
+            <div className="mt-8 flex justify-between">
+              <button
+                onClick={() => goToPage(page.prevCursor)}
+                disabled={!page.prevCursor}
+                className="bg-white border border-blue-600 text-blue-600 py-2 px-6 rounded-md font-medium hover:bg-blue-50 transition duration-300 disabled:opacity-50 disabled:cursor-not-allowed"
+              >
+                Previous
+              </button>
+              <button
+                onClick={() => goToPage(page.nextCursor)}
+                disabled={!page.nextCursor}
+                className="bg-white border border-blue-600 text-blue-600 py-2 px-6 rounded-md font-medium hover:bg-blue-50 transition duration-300 disabled:opacity-50 disabled:cursor-not-allowed"
+              >
+                Next
+              </button>
+            </div>
+          )}
         </section>
       </main>
 
@@ -8,6 +8,7 @@ import { formatDistanceToNow } from "date-fns";
 import { formatEther } from "ethers";
 import React from "react";
 import { useNavigate } from "react-router-dom";
+import { imageVariant } from "@/utils/string";
 
 const HomePage: React.FC = () => {
   const { openConnectModal } = useConnectModal();
@@ -130,7 +131,7 @@ const HomePage: React.FC = () => {
                 >
                   {/* Job image */}
                   <img
-                    src={job.image || "https://placehold.co/600x400"}
+                    src={imageVariant(job.image, 600) || "https://placehold.co/600x400"}
                     alt={job.title}
                     className="w-full h-48 object-cover"
                   />
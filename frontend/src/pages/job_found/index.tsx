@@ -1,8 +1,8 @@
 import Chat from "@/components/Chat/Chat";
 import Footer from "@/components/Footer";
 import NavigationBar from "@/components/NavBar";
+import { useChatMessages } from "@/hooks/useChatMessages";
 import {
-  useFetchChatMessages,
   useJobDetails,
   useSendChatMessage,
 } from "@/services/apis/core";
@@ -13,6 +13,7 @@ import { formatEther } from "ethers";
 import React from "react";
 import { useParams } from "react-router-dom";
 import TransactionSequence from "../job_details/components/TransactionSequence";
+import { imageVariant } from "@/utils/string";
 
 const JobFoundPage: React.FC = () => {
   const { id } = useParams<{ id: string }>();
@@ -27,14 +28,13 @@ const JobFoundPage: React.FC = () => {
   const { getWalletAddress } = useAuthStore();
   const walletAddress = getWalletAddress();
 
-  const { data: chatMessages, refetch: refetchChatMessages } =
-    useFetchChatMessages({
-      variables: {
-        jobId: Number(id),
-        userA: job?.client?.wallet_address || "",
-        userB: walletAddress,
-      },
-    });
+  const {
+    messages: chatMessages,
+    refresh: refreshChatMessages,
+    loadOlder: loadOlderChatMessages,
+    hasOlder: hasOlderChatMessages,
+    isLoadingOlder: isLoadingOlderChatMessages,
+  } = useChatMessages(Number(id), job?.client?.wallet_address, walletAddress);
 
   const { mutate: sendMessage, isPending: isSendingMessage } =
     useSendChatMessage();
@@ -50,7 +50,7 @@ const JobFoundPage: React.FC = () => {
       },
       {
         onSuccess: () => {
-          refetchChatMessages();
+          refreshChatMessages();
         },
         onError: () => {
           alert("Failed to send message.");
@@ -96,7 +96,7 @@ const JobFoundPage: React.FC = () => {
             {formatDistanceToNow(new Date(job.created_at), { addSuffix: true })}
           </p>
           <img
-            src={job.image || "https://placehold.co/150x150"}
+            src={imageVariant(job.image, 600) || "https://placehold.co/600x400"}
             alt={job.title}
             className="w-full rounded-lg object-cover shadow-lg mb-6"
           />
@@ -148,9 +148,12 @@ const JobFoundPage: React.FC = () => {
         <div className="w-1/2 bg-white rounded-xl p-8 shadow-md flex flex-col">
           <div className="w-full sticky top-36 self-start">
             <Chat
-              messages={chatMessages || []}
+              messages={chatMessages}
               currentUserAddress={walletAddress}
               onSendMessage={handleSendMessage}
+              onLoadOlder={loadOlderChatMessages}
+              hasOlder={hasOlderChatMessages}
+              isLoadingOlder={isLoadingOlderChatMessages}
               isLoading={isSendingMessage}
               className="flex-grow"
             />
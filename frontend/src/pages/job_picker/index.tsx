@@ -3,11 +3,11 @@ import Chat from "@/components/Chat/Chat";
 import Footer from "@/components/Footer";
 import NavigationBar from "@/components/NavBar";
 import { useAcceptJob } from "@/hooks/useAcceptJob";
+import { useChatMessages } from "@/hooks/useChatMessages";
 import { useCompleteJob } from "@/hooks/useCompleteJob";
 import {
   IUserInfoProfileSchema,
   JobStatus,
-  useFetchChatMessages,
   useJobDetails,
   useJobPickers,
   useSendChatMessage,
@@ -39,14 +39,13 @@ const JobPickersPage: React.FC = () => {
   const { getWalletAddress } = useAuthStore();
   const walletAddress = getWalletAddress();
 
-  const { data: chatMessages, refetch: refetchChatMessages } =
-    useFetchChatMessages({
-      variables: {
-        jobId,
-        userA: selectedPicker?.wallet_address,
-        userB: walletAddress,
-      },
-    });
+  const {
+    messages: chatMessages,
+    refresh: refreshChatMessages,
+    loadOlder: loadOlderChatMessages,
+    hasOlder: hasOlderChatMessages,
+    isLoadingOlder: isLoadingOlderChatMessages,
+  } = useChatMessages(jobId, selectedPicker?.wallet_address, walletAddress);
 
   const { mutate: sendMessage, isPending: isSendingMessage } =
     useSendChatMessage();
@@ -68,7 +67,7 @@ const JobPickersPage: React.FC = () => {
       },
       {
         onSuccess: () => {
-          refetchChatMessages();
+          refreshChatMessages();
         },
         onError: () => alert("Failed to send message."),
       }
@@ -229,9 +228,12 @@ const JobPickersPage: React.FC = () => {
 
               {/* Chat Section */}
               <Chat
-                messages={chatMessages || []}
+                messages={chatMessages}
                 currentUserAddress={walletAddress}
                 onSendMessage={handleSendMessage}
+                onLoadOlder={loadOlderChatMessages}
+                hasOlder={hasOlderChatMessages}
+                isLoadingOlder={isLoadingOlderChatMessages}
                 isLoading={isSendingMessage}
                 className="flex-grow"
               />
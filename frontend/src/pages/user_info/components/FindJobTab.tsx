@@ -6,6 +6,7 @@ import { formatDistanceToNow } from "date-fns";
 import { formatEther } from "ethers";
 import React, { useState } from "react";
 import { useNavigate } from "react-router-dom";
+import { imageVariant } from "@/utils/string";
 
 const FindJobTab: React.FC = () => {
   const {
@@ -56,7 +57,7 @@ const FindJobTab: React.FC = () => {
             >
               <div className="flex items-center space-x-6">
                 <img
-                  src={job.image || "https://via.placeholder.com/150"}
+                  src={imageVariant(job.image, 150) || "https://via.placeholder.com/150"}
                   alt={job.title}
                   className="w-24 h-24 object-cover rounded-lg"
                 />
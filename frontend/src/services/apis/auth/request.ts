@@ -1,12 +1,30 @@
 import keyValue from "@/commons/key-value";
 import api from "@/services/apis/api";
-import { IAuthLogin, IResponseAuthLogin, IResponseUploadFile } from "./types";
+import {
+  IAuthLogin,
+  IResponseAuthLogin,
+  IResponseLoginNonce,
+  IResponseUploadFile,
+} from "./types";
 
 export const authLogin = async (
   body: IAuthLogin
 ): Promise<IResponseAuthLogin> => {
+  if (!body.signMessage) {
+    const response = await api.post("/login", {
+      wallet_address: body.wallet_address,
+    });
+    return response.data;
+  }
+  const { data: challenge } = await api.get<IResponseLoginNonce>(
+    "/login/nonce",
+    { params: { wallet_address: body.wallet_address } }
+  );
+  const signature = await body.signMessage(challenge.message);
   const response = await api.post("/login", {
     wallet_address: body.wallet_address,
+    nonce: challenge.nonce,
+    signature,
   });
   return response.data;
 };
@@ -1,5 +1,12 @@
 export interface IAuthLogin {
   wallet_address: string;
+  // Proves the wallet to the server, which dispute resolvers need
+  signMessage?: (message: string) => Promise<string>;
+}
+
+export interface IResponseLoginNonce {
+  nonce: string;
+  message: string;
 }
 
 export interface IResponseAuthLogin {
@@ -1,7 +1,8 @@
 import { createMutation, createQuery } from "react-query-kit";
 import {
   createJob,
-  fetchChatMessages,
+  getDisputes,
+  getDisputeStats,
   getJobById,
   getJobPickers,
   getJobs,
@@ -9,22 +10,29 @@ import {
   getJobsByFreelancer,
   getJobTypes,
   getNewestJobs,
+  getPickStatus,
   getTopFreelancers,
   getUserInfo,
   getUserResume,
+  openDispute,
   pickJob,
+  resolveDispute,
   sendChatMessage,
   updateUser,
 } from "./request";
 import {
-  IChatMessage,
   ICreateJobPayload,
+  IDispute,
+  IDisputeStats,
+  IFreelancerJob,
   IGetJobsOptions,
   IJob,
+  IJobPicker,
+  IJobPickStatus,
   IJobType,
+  IPage,
   ITopFreelancer,
   IUserInfo,
-  IUserInfoProfileSchema,
   IUserResume,
   IUserUpdatePayload,
 } from "./types";
@@ -44,7 +52,7 @@ export const useJobTypes = createQuery<IJobType[]>({
   refetchInterval: 1000 * 3,
 });
 
-export const useJobs = createQuery<IJob[], IGetJobsOptions>({
+export const useJobs = createQuery<IPage<IJob>, IGetJobsOptions>({
   queryKey: ["useJobs"],
   fetcher: (options) => getJobs(options),
   refetchInterval: 1000 * 3,
@@ -56,7 +64,7 @@ export const useJobsByClient = createQuery<IJob[]>({
   refetchInterval: 1000 * 3,
 });
 
-export const useJobsByFreelancer = createQuery<IJob[]>({
+export const useJobsByFreelancer = createQuery<IFreelancerJob[]>({
   queryKey: ["useJobsByFreelancer"],
   fetcher: () => getJobsByFreelancer(),
   refetchInterval: 1000 * 3,
@@ -85,7 +93,7 @@ export const useJobDetails = createQuery<IJob, { id: number }>({
 });
 
 export const useJobPickers = createQuery<
-  IUserInfoProfileSchema[],
+  IJobPicker[],
   { jobId: number }
 >({
   queryKey: ["jobPickers"],
@@ -93,17 +101,16 @@ export const useJobPickers = createQuery<
   refetchInterval: 1000 * 3,
 });
 
-export const usePickJob = createMutation<string, { jobId: number }>({
-  mutationFn: ({ jobId }) => pickJob(jobId),
+export const usePickStatus = createQuery<
+  IJobPickStatus[],
+  { jobIds: number[] }
+>({
+  queryKey: ["pickStatus"],
+  fetcher: ({ jobIds }) => getPickStatus(jobIds),
 });
 
-export const useFetchChatMessages = createQuery<
-  IChatMessage[],
-  { jobId: number; userA?: string; userB?: string }
->({
-  queryKey: ["chatMessages"],
-  fetcher: ({ jobId, userA, userB }) => fetchChatMessages(jobId, userA, userB),
-  refetchInterval: 1000,
+export const usePickJob = createMutation<string, { jobId: number }>({
+  mutationFn: ({ jobId }) => pickJob(jobId),
 });
 
 export const useSendChatMessage = createMutation<
@@ -121,3 +128,25 @@ export const useUserResume = createQuery<
   queryKey: ["useUserResume"],
   fetcher: ({ walletAddress }) => getUserResume(walletAddress),
 });
+
+export const useOpenDispute = createMutation<IDispute, { jobId: number }>({
+  mutationFn: ({ jobId }) => openDispute(jobId),
+});
+
+export const useDisputes = createQuery<IDispute[], { resolved?: boolean }>({
+  queryKey: ["useDisputes"],
+  fetcher: ({ resolved }) => getDisputes(resolved),
+});
+
+export const useDisputeStats = createQuery<IDisputeStats>({
+  queryKey: ["useDisputeStats"],
+  fetcher: () => getDisputeStats(),
+});
+
+export const useResolveDispute = createMutation<
+  IDispute,
+  { disputeId: number; inFavorOfFreelancer: boolean }
+>({
+  mutationFn: ({ disputeId, inFavorOfFreelancer }) =>
+    resolveDispute(disputeId, inFavorOfFreelancer),
+});
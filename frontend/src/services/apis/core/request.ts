@@ -1,13 +1,19 @@
 import api from "../api";
 import {
   IChatMessage,
+  IChatMessagesOptions,
   ICreateJobPayload,
+  IDispute,
+  IDisputeStats,
+  IFreelancerJob,
   IGetJobsOptions,
   IJob,
+  IJobPicker,
+  IJobPickStatus,
   IJobType,
+  IPage,
   ITopFreelancer,
   IUserInfo,
-  IUserInfoProfileSchema,
   IUserResume,
   IUserUpdatePayload,
 } from "./types";
@@ -31,17 +37,17 @@ export const getJobTypes = async (): Promise<IJobType[]> => {
   return response.data;
 };
 
-// Fetch the last created job
+// Fetch a page of jobs, newest first
 export const getJobs = async (
   options: IGetJobsOptions = {}
-): Promise<IJob[]> => {
+): Promise<IPage<IJob>> => {
   const params = new URLSearchParams();
 
-  if (options.page !== undefined) {
-    params.set("page", String(options.page));
+  if (options.limit !== undefined) {
+    params.set("limit", String(options.limit));
   }
-  if (options.page_size !== undefined) {
-    params.set("page_size", String(options.page_size));
+  if (options.cursor) {
+    params.set("cursor", options.cursor);
   }
   if (options.job_type_id !== undefined) {
     params.set("job_type_id", String(options.job_type_id));
@@ -63,7 +69,11 @@ export const getJobs = async (
   const url = queryString ? `/jobs?${queryString}` : "/jobs";
 
   const response = await api.get<IJob[]>(url);
-  return response.data;
+  return {
+    items: response.data,
+    nextCursor: response.headers["x-next-cursor"],
+    prevCursor: response.headers["x-prev-cursor"],
+  };
 };
 
 // Fetch jobs by client (authenticated user as the client)
@@ -73,8 +83,8 @@ export const getJobsByClient = async (): Promise<IJob[]> => {
 };
 
 // Fetch jobs by freelancer (authenticated user as the freelancer)
-export const getJobsByFreelancer = async (): Promise<IJob[]> => {
-  const response = await api.get<IJob[]>("/jobs/by-freelancer");
+export const getJobsByFreelancer = async (): Promise<IFreelancerJob[]> => {
+  const response = await api.get<IFreelancerJob[]>("/jobs/by-freelancer");
   return response.data;
 };
 
@@ -96,8 +106,8 @@ export const getNewestJobs = async (): Promise<IJob[]> => {
 
 export const getJobPickers = async (
   jobId: number
-): Promise<IUserInfoProfileSchema[]> => {
-  const response = await api.get<IUserInfoProfileSchema[]>(
+): Promise<IJobPicker[]> => {
+  const response = await api.get<IJobPicker[]>(
     `/jobs/${jobId}/picks`
   );
   return response.data;
@@ -107,15 +117,30 @@ export const pickJob = async (jobId: number): Promise<string> => {
   const response = await api.post<string>(`/jobs/${jobId}/pick`);
   return response.data;
 };
+
+// Whether the current user picked each job, one request for a whole list
+export const getPickStatus = async (
+  jobIds: number[]
+): Promise<IJobPickStatus[]> => {
+  const params = new URLSearchParams();
+  jobIds.forEach((jobId) => params.append("job_ids", String(jobId)));
+  const response = await api.get<IJobPickStatus[]>(
+    `/jobs/pick-status?${params.toString()}`
+  );
+  return response.data;
+};
 export const getJobById = async (id: number): Promise<IJob> => {
   const response = await api.get<IJob>(`/jobs/${id}`);
   return response.data;
 };
 
+// The latest messages, the ones after sinceId (polling) or the ones before
+// beforeId (older history), oldest first
 export const fetchChatMessages = async (
   jobId: number,
   userA?: string,
-  userB?: string
+  userB?: string,
+  options: IChatMessagesOptions = {}
 ): Promise<IChatMessage[]> => {
   const params: Record<string, string> = {};
 
@@ -125,6 +150,15 @@ export const fetchChatMessages = async (
   if (userB) {
     params.user_B = userB;
   }
+  if (options.sinceId !== undefined) {
+    params.since_id = String(options.sinceId);
+  }
+  if (options.beforeId !== undefined) {
+    params.before_id = String(options.beforeId);
+  }
+  if (options.limit !== undefined) {
+    params.limit = String(options.limit);
+  }
 
   const queryString = new URLSearchParams(params).toString();
   const url = `/jobs/${jobId}/chat${queryString ? `?${queryString}` : ""}`;
@@ -151,3 +185,30 @@ export const getUserResume = async (
   const response = await api.get<IUserResume>(`/users/${walletAddress}/resume`);
   return response.data;
 };
+
+// Disputes: opened by the job's client or freelancer, listed and resolved by
+// the contract owner
+export const openDispute = async (jobId: number): Promise<IDispute> => {
+  const response = await api.post<IDispute>(`/jobs/${jobId}/dispute`);
+  return response.data;
+};
+
+export const getDisputes = async (resolved = false): Promise<IDispute[]> => {
+  const response = await api.get<IDispute[]>(`/disputes?resolved=${resolved}`);
+  return response.data;
+};
+
+export const getDisputeStats = async (): Promise<IDisputeStats> => {
+  const response = await api.get<IDisputeStats>("/disputes/stats");
+  return response.data;
+};
+
+export const resolveDispute = async (
+  disputeId: number,
+  inFavorOfFreelancer: boolean
+): Promise<IDispute> => {
+  const response = await api.post<IDispute>(`/disputes/${disputeId}/resolve`, {
+    in_favor_of_freelancer: inFavorOfFreelancer,
+  });
+  return response.data;
+};
@@ -51,6 +51,15 @@ export interface IUserInfoProfileSchema {
   twitter?: string;
 }
 
+export interface IJobPicker extends IUserInfoProfileSchema {
+  picked_at: string;
+}
+
+export interface IJobPickStatus {
+  job_id: number;
+  picked: boolean;
+}
+
 export interface IJob {
   id: number;
   title: string;
@@ -67,6 +76,30 @@ export interface IJob {
   transaction_create?: string | null;
   transaction_accept_job?: string | null;
   transaction_complete_job?: string | null;
+  picks_count?: number | null;
+}
+
+export interface IFreelancerJob extends IJob {
+  relation: "assigned" | "picked";
+}
+
+export interface IDispute {
+  id: number;
+  job: IJob;
+  initiator: IUserInfo;
+  resolved: boolean;
+  resolved_in_favor_of_freelancer?: boolean | null;
+  resolution_date?: string | null;
+  created_at: string;
+  updated_at: string;
+}
+
+export interface IDisputeStats {
+  open_count: number;
+  resolved_count: number;
+  resolved_for_freelancer: number;
+  resolved_for_client: number;
+  oldest_open_at?: string | null;
 }
 
 export interface ICreateJobPayload {
@@ -96,9 +129,16 @@ export interface IChatMessage {
   timestamp: string;
 }
 
+export interface IChatMessagesOptions {
+  sinceId?: number;
+  beforeId?: number;
+  limit?: number;
+}
+
 export interface IGetJobsOptions {
-  page?: number;
-  page_size?: number;
+  limit?: number;
+  // From the X-Next-Cursor / X-Prev-Cursor headers of an earlier page
+  cursor?: string;
   job_type_id?: number;
   min_amount?: number;
   max_amount?: number;
@@ -106,6 +146,13 @@ export interface IGetJobsOptions {
   status?: string;
 }
 
+// One page of a keyset paginated list
+export interface IPage<T> {
+  items: T[];
+  nextCursor?: string;
+  prevCursor?: string;
+}
+
 export interface ICompletedProject {
   id: number;
   title: string;
@@ -133,5 +180,6 @@ export interface IUserResume {
   date_joined: string; // ISO 8601 string for date
   social_links: ISocialLinks;
   completed_projects: ICompletedProject[];
+  completed_projects_count: number;
   total_income: string;
 }
@@ -7,3 +7,9 @@ export const formatUsername = (username: string) => {
   }
   return username;
 };
+
+// Uploaded images can be fetched as a resized WebP variant (150 or 600 px)
+export const imageVariant = (url: string | undefined, size: 150 | 600) => {
+  if (!url?.startsWith("/api/read-file/")) return url;
+  return `${url}?size=${size}`;
+};